@@ -0,0 +1,138 @@
+"""
+Benchmark: fetch_ad_performance per-ad loop vs. ONE account-level insights query
+
+Runs both modes against a recorded-response stand-in (no Meta API needed) and
+prints Graph round-trips and wall time for 10 / 100 / 1000 ads.
+
+Usage:
+    python benchmark_ad_insights.py [latency_ms]
+"""
+import copy
+import math
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient
+
+# Recorded Graph API row (ad level, anonymized) - all values are strings like the real API
+RECORDED_INSIGHT = {
+    'account_id': '1234567890', 'account_name': 'CarCenter Landshut', 'account_currency': 'EUR',
+    'ad_id': '0', 'ad_name': 'Ad', 'adset_id': '2384', 'adset_name': 'Retargeting 30T',
+    'campaign_id': '2383', 'campaign_name': 'Herbst Leads',
+    'date_start': '2024-10-01', 'date_stop': '2024-10-30',
+    'spend': '412.37', 'impressions': '48211', 'reach': '20544', 'frequency': '2.346768',
+    'clicks': '911', 'ctr': '1.889610', 'unique_ctr': '3.012345', 'cpc': '0.452656',
+    'cpm': '8.553442', 'cpp': '20.072527', 'inline_link_clicks': '655',
+    'inline_link_click_ctr': '1.358611', 'unique_clicks': '619', 'inline_post_engagement': '1432',
+    'actions': [
+        {'action_type': 'lead', 'value': '37'},
+        {'action_type': 'link_click', 'value': '655'},
+        {'action_type': 'video_view', 'value': '9123'},
+        {'action_type': 'post_engagement', 'value': '1432'},
+    ],
+    'cost_per_action_type': [
+        {'action_type': 'lead', 'value': '11.145135'},
+        {'action_type': 'link_click', 'value': '0.629573'},
+    ],
+    'video_play_actions': [{'action_type': 'video_view', 'value': '11870'}],
+    'video_thruplay_watched_actions': [{'action_type': 'video_view', 'value': '3217'}],
+    'video_p25_watched_actions': [{'action_type': 'video_view', 'value': '6120'}],
+    'video_p100_watched_actions': [{'action_type': 'video_view', 'value': '1502'}],
+    'quality_ranking': 'above_average', 'engagement_rate_ranking': 'average',
+    'conversion_rate_ranking': 'average', 'objective': 'OUTCOME_LEADS',
+    'optimization_goal': 'LEAD_GENERATION', 'buying_type': 'AUCTION',
+}
+
+SDK_DEFAULT_PAGE_SIZE = 25
+
+
+class RoundTripCounter:
+    """Counts simulated Graph requests and sleeps for the configured latency"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.count = 0
+
+    def hit(self):
+        self.count += 1
+        time.sleep(self.latency_s)
+
+
+class FakeCursor:
+    """Lazily paginated result, one round-trip per page (like facebook_business.api.Cursor)"""
+
+    def __init__(self, rows, page_size, counter):
+        self.rows = rows
+        self.page_size = page_size
+        self.counter = counter
+
+    def __iter__(self):
+        pages = max(1, math.ceil(len(self.rows) / self.page_size))
+        for page in range(pages):
+            self.counter.hit()
+            for row in self.rows[page * self.page_size:(page + 1) * self.page_size]:
+                yield row
+
+
+class FakeAd(dict):
+    def __init__(self, ad_id, counter):
+        super().__init__(id=ad_id, name=f'Ad {ad_id}')
+        self.counter = counter
+
+    def get_insights(self, fields=None, params=None):
+        return FakeCursor([make_insight(self['id'])], SDK_DEFAULT_PAGE_SIZE, self.counter)
+
+
+class FakeAccount:
+    def __init__(self, n_ads, counter):
+        self.counter = counter
+        self.ads = [FakeAd(str(i), counter) for i in range(n_ads)]
+
+    def get_ads(self, fields=None, params=None):
+        return FakeCursor(self.ads, SDK_DEFAULT_PAGE_SIZE, self.counter)
+
+    def get_insights(self, fields=None, params=None):
+        page_size = (params or {}).get('limit', SDK_DEFAULT_PAGE_SIZE)
+        return FakeCursor([make_insight(ad['id']) for ad in self.ads], page_size, self.counter)
+
+
+def make_insight(ad_id):
+    insight = copy.deepcopy(RECORDED_INSIGHT)
+    insight['ad_id'] = ad_id
+    insight['ad_name'] = f'Ad {ad_id}'
+    return insight
+
+
+def run(n_ads, mode, latency_s):
+    counter = RoundTripCounter(latency_s)
+    client = MetaAdsClient(access_token='benchmark', account_id='act_benchmark')
+    client.account = FakeAccount(n_ads, counter)
+    client._save_to_cache = lambda *args, **kwargs: None
+
+    start = time.perf_counter()
+    df = client.fetch_ad_performance(start_date='2024-10-01', end_date='2024-10-30', force_refresh=True, mode=mode)
+    elapsed = time.perf_counter() - start
+
+    assert len(df) == n_ads, f"expected {n_ads} rows, got {len(df)}"
+    assert int(df['leads_extracted'].sum()) == 37 * n_ads
+    return counter.count, elapsed
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    latency_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+
+    print("=" * 80)
+    print(f"⏱️  AD INSIGHTS BENCHMARK (simulated latency: {latency_ms:.0f} ms per round-trip)")
+    print("=" * 80)
+    print(f"{'Ads':>6} | {'Mode':>8} | {'Round-trips':>11} | {'Wall time':>10}")
+    print("-" * 48)
+
+    for n_ads in [10, 100, 1000]:
+        for mode in ['per_ad', 'account']:
+            trips, elapsed = run(n_ads, mode, latency_ms / 1000)
+            print(f"{n_ads:>6} | {mode:>8} | {trips:>11} | {elapsed:>9.2f}s")
@@ -0,0 +1,75 @@
+"""
+Benchmark: per-object insights with 'sdk' transport vs. Graph Batch API ('batch')
+
+Counts HTTP calls and wall time against the local fake Graph server for the
+campaign loop of fetch_campaign_data and one breakdown pass of
+fetch_comprehensive_insights.
+
+Usage:
+    python benchmark_batch_transport.py [latency_ms]
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient
+from fake_graph_server import FakeGraphServer
+
+
+def make_client(server, transport):
+    client = MetaAdsClient(access_token='benchmark', account_id=server.account_id, graph_url=server.url, transport=transport)
+    client._load_from_cache = lambda *args, **kwargs: None
+    client._save_to_cache = lambda *args, **kwargs: None
+    return client
+
+
+def run_campaigns(n_objects, transport, latency_s):
+    server = FakeGraphServer(n_ads=n_objects, n_campaigns=n_objects, latency=latency_s).start()
+    try:
+        client = make_client(server, transport)
+        start = time.perf_counter()
+        df = client.fetch_campaign_data(days=30)
+        elapsed = time.perf_counter() - start
+        assert len(df) == n_objects, f"expected {n_objects} campaigns, got {len(df)}"
+        return len(server.requests), elapsed
+    finally:
+        server.stop()
+
+
+def run_breakdown_pass(n_objects, transport, latency_s):
+    server = FakeGraphServer(n_ads=n_objects, latency=latency_s).start()
+    try:
+        client = make_client(server, transport)
+        start = time.perf_counter()
+        rows = client._fetch_breakdown_pass(
+            'ad', {'since': '2024-10-01', 'until': '2024-10-07'}, ['age', 'gender'], ['spend', 'impressions', 'actions']
+        )
+        elapsed = time.perf_counter() - start
+        assert len(rows) == n_objects * 12, f"expected {n_objects * 12} rows, got {len(rows)}"
+        return len(server.requests), elapsed
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    import warnings
+    logging.disable(logging.INFO)
+    warnings.simplefilter('ignore')  # SDK field warnings for campaign fields
+
+    latency_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+
+    print("=" * 80)
+    print(f"⏱️  BATCH TRANSPORT BENCHMARK (simulated latency: {latency_ms:.0f} ms per HTTP call)")
+    print("=" * 80)
+
+    for title, run in [("Campaign loop (fetch_campaign_data)", run_campaigns),
+                       ("Age x Gender pass (fetch_comprehensive_insights)", run_breakdown_pass)]:
+        print(f"\n📊 {title}")
+        print(f"{'Objects':>8} | {'Transport':>9} | {'HTTP calls':>10} | {'Wall time':>10}")
+        print("-" * 48)
+        for n_objects in [10, 100, 500]:
+            for transport in ['sdk', 'batch']:
+                calls, elapsed = run(n_objects, transport, latency_ms / 1000)
+                print(f"{n_objects:>8} | {transport:>9} | {calls:>10} | {elapsed:>9.2f}s")
@@ -0,0 +1,61 @@
+"""
+Benchmark: JSON vs. Parquet cache backend
+
+Saves and loads synthetic ad-level frames (all insight fields, nested action
+lists) with both backends and prints file size, save and load time.
+
+Usage:
+    python benchmark_cache_formats.py
+"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+from src.meta_ads_client import MetaAdsClient
+from src.cache_backends import JsonCacheBackend, ParquetCacheBackend
+from benchmark_ad_insights import make_insight
+
+REPEATS = 3
+
+
+def make_ad_frame(n_ads: int) -> pd.DataFrame:
+    """Ad frame in the shape fetch_ad_performance caches"""
+    return MetaAdsClient._build_ad_frame([make_insight(str(i)) for i in range(n_ads)])
+
+
+def best_of(func) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    print("=" * 80)
+    print("⏱️  CACHE FORMAT BENCHMARK (best of 3)")
+    print("=" * 80)
+    print(f"{'Ads':>6} | {'Format':>8} | {'File size':>10} | {'Save':>9} | {'Load':>9}")
+    print("-" * 56)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_ads in [100, 500, 2000]:
+            df = make_ad_frame(n_ads)
+
+            for backend in [JsonCacheBackend(), ParquetCacheBackend()]:
+                path = os.path.join(tmp, f"ads_{n_ads}{backend.extension}")
+
+                save_s = best_of(lambda: backend.save(path, df, datetime.now()))
+                load_s = best_of(lambda: backend.load(path))
+
+                _, loaded = backend.load(path)
+                assert loaded['actions'].tolist() == df['actions'].tolist(), "nested actions changed on round-trip"
+
+                size_kb = os.path.getsize(path) / 1024
+                name = backend.extension.lstrip('.')
+                print(f"{n_ads:>6} | {name:>8} | {size_kb:>8.0f}KB | {save_s * 1000:>7.1f}ms | {load_s * 1000:>7.1f}ms")
@@ -0,0 +1,131 @@
+"""
+Benchmark: DataProcessor.calculate_metrics row-wise apply vs. vectorized
+
+Builds synthetic ad frames in the shapes the dashboard passes in (Meta strings,
+[{"value": ...}] lists, None, plain numbers), checks both implementations give
+identical results and prints wall time for 10k / 100k / 1M rows.
+
+Usage:
+    python benchmark_calculate_metrics.py [max_rows]
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor, extract_numeric_value
+
+
+def legacy_calculate_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Previous row-wise implementation (reference for results and timing)"""
+    df = df.copy()
+
+    numeric_columns = ['spend', 'leads', 'video_plays_3s', 'impressions', 'thru_plays', 'clicks', 'frequency']
+    for col in numeric_columns:
+        if col in df.columns:
+            df[col] = df[col].apply(extract_numeric_value)
+
+    if 'cpl' not in df.columns and 'spend' in df.columns and 'leads' in df.columns:
+        df['cpl'] = df.apply(
+            lambda row: round(row['spend'] / row['leads'], 2) if row['leads'] > 0 else 0,
+            axis=1
+        )
+
+    if 'hook_rate' not in df.columns and 'video_plays_3s' in df.columns and 'impressions' in df.columns:
+        df['hook_rate'] = df.apply(
+            lambda row: round((row['video_plays_3s'] / row['impressions'] * 100), 2) if row['impressions'] > 0 else 0,
+            axis=1
+        )
+
+    if 'hold_rate' not in df.columns and 'thru_plays' in df.columns and 'video_plays_3s' in df.columns:
+        df['hold_rate'] = df.apply(
+            lambda row: round((row['thru_plays'] / row['video_plays_3s'] * 100), 2) if row['video_plays_3s'] > 0 else 0,
+            axis=1
+        )
+
+    if 'clicks' in df.columns and 'impressions' in df.columns and 'ctr' not in df.columns:
+        df['ctr'] = df.apply(
+            lambda row: round((row['clicks'] / row['impressions'] * 100), 2) if row['impressions'] > 0 else 0,
+            axis=1
+        )
+
+    return df
+
+
+def make_frame(n_rows: int, mixed: bool, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic ad rows
+
+    mixed=False: Meta strings and numbers only
+    mixed=True: plus [{"value": ...}] lists, None, NaN and invalid strings
+    """
+    rng = np.random.default_rng(seed)
+    impressions = rng.integers(0, 50000, n_rows)
+    plays = (impressions * rng.random(n_rows) * 0.4).astype(int)
+
+    columns = {
+        'ad_id': [str(i) for i in range(n_rows)],
+        'spend': [f"{v:.2f}" for v in rng.lognormal(3, 1.5, n_rows)],
+        'impressions': impressions.astype(str).tolist(),
+        'clicks': (impressions * rng.random(n_rows) * 0.03).astype(int),
+        'leads': rng.integers(0, 40, n_rows).tolist(),
+        'video_plays_3s': plays.tolist(),
+        'thru_plays': (plays * rng.random(n_rows) * 0.5).astype(int).astype(str).tolist(),
+        'frequency': rng.random(n_rows) * 6,
+    }
+
+    if not mixed:
+        return pd.DataFrame(columns)
+
+    # Gaps and odd values as they occur in cached/merged frames
+    columns['thru_plays'] = [[{'action_type': 'video_view', 'value': v}] for v in columns['thru_plays']]
+    gaps = rng.choice(n_rows, size=max(4, n_rows // 100), replace=False)
+    for i in gaps[0::4]:
+        columns['spend'][i] = None
+    for i in gaps[1::4]:
+        columns['leads'][i] = 'n/a'
+    for i in gaps[2::4]:
+        columns['impressions'][i] = []
+    for i in gaps[3::4]:
+        columns['video_plays_3s'][i] = np.nan
+    return pd.DataFrame(columns)
+
+
+def best_of(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+if __name__ == '__main__':
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("=" * 80)
+    print("⏱️  CALCULATE_METRICS BENCHMARK (row-wise apply vs. vectorized)")
+    print("=" * 80)
+    print(f"{'Rows':>9} | {'Frame':>7} | {'Row-wise':>10} | {'Vectorized':>10} | {'Speedup':>8} | Identical")
+    print("-" * 70)
+
+    for n_rows in [10_000, 100_000, 1_000_000]:
+        if n_rows > max_rows:
+            break
+        repeats = 3 if n_rows <= 100_000 else 1
+
+        for mixed in [False, True]:
+            df = make_frame(n_rows, mixed)
+
+            legacy = legacy_calculate_metrics(df)
+            vectorized = DataProcessor.calculate_metrics(df)
+            identical = legacy.equals(vectorized) and (legacy.dtypes == vectorized.dtypes).all()
+
+            legacy_s = best_of(lambda: legacy_calculate_metrics(df), repeats)
+            vectorized_s = best_of(lambda: DataProcessor.calculate_metrics(df), repeats)
+            print(
+                f"{n_rows:>9,} | {'mixed' if mixed else 'strings':>7} | {legacy_s:>9.3f}s | {vectorized_s:>9.3f}s | "
+                f"{legacy_s / vectorized_s:>7.0f}x | {'✅' if identical else '❌'}"
+            )
@@ -0,0 +1,109 @@
+"""
+Benchmark: SDK objects vs. raw HTTP transport ('http') for insight pages
+
+1. Parse only - recorded insight pages (500 rows each, values as strings like
+   the Graph API) turned into row dicts:
+   - sdk:  json.loads -> ObjectParser (one AdsInsights per row) -> dict(row)
+   - http: orjson.loads -> rows used as they are
+   Prints best-of wall time and the tracemalloc heap peak.
+2. End to end - fetch_ad_performance against the local fake Graph server.
+
+Usage:
+    python benchmark_http_transport.py [n_pages]
+"""
+import copy
+import json
+import sys
+import os
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(__file__))
+
+import orjson
+from facebook_business.api import FacebookAdsApi
+from facebook_business.adobjects.adsinsights import AdsInsights
+from facebook_business.adobjects.objectparser import ObjectParser
+from src.meta_ads_client import MetaAdsClient, ACCOUNT_INSIGHTS_PAGE_SIZE
+from fake_graph_server import FakeGraphServer
+from benchmark_ad_insights import RECORDED_INSIGHT
+
+
+def make_pages(n_pages: int) -> list:
+    """Recorded response bodies (bytes) of n_pages full insight pages"""
+    pages = []
+    for page in range(n_pages):
+        rows = []
+        for i in range(ACCOUNT_INSIGHTS_PAGE_SIZE):
+            row = copy.deepcopy(RECORDED_INSIGHT)
+            row['ad_id'] = str(page * ACCOUNT_INSIGHTS_PAGE_SIZE + i)
+            rows.append(row)
+        pages.append(json.dumps({'data': rows, 'paging': {'cursors': {'after': str(page)}}}).encode())
+    return pages
+
+
+def parse_sdk(pages: list) -> int:
+    parser = ObjectParser(api=FacebookAdsApi.get_default_api(), target_class=AdsInsights)
+    rows = 0
+    for body in pages:
+        rows += len([dict(row) for row in parser.parse_multiple(json.loads(body))])
+    return rows
+
+
+def parse_http(pages: list) -> int:
+    rows = 0
+    for body in pages:
+        rows += len(orjson.loads(body)['data'])
+    return rows
+
+
+def measure(func, pages: list):
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        rows = func(pages)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, best, peak / 1024 / 1024
+
+
+def end_to_end(n_ads: int, transport: str) -> float:
+    server = FakeGraphServer(n_ads=n_ads).start()
+    try:
+        client = MetaAdsClient(access_token='benchmark', account_id=server.account_id, graph_url=server.url, transport=transport)
+        client._save_to_cache = lambda *args, **kwargs: None
+        start = time.perf_counter()
+        df = client.fetch_ad_performance(days=7, force_refresh=True)
+        elapsed = time.perf_counter() - start
+        assert len(df) == n_ads, f"expected {n_ads} rows, got {len(df)}"
+        return elapsed
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    n_pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    FacebookAdsApi.init(access_token='benchmark')
+    pages = make_pages(n_pages)
+
+    print("=" * 80)
+    print(f"⏱️  HTTP TRANSPORT BENCHMARK ({n_pages} recorded pages x {ACCOUNT_INSIGHTS_PAGE_SIZE} rows)")
+    print("=" * 80)
+    print(f"{'Path':>6} | {'Rows':>7} | {'Parse time':>10} | {'Peak heap':>10}")
+    print("-" * 46)
+    for name, func in [('sdk', parse_sdk), ('http', parse_http)]:
+        rows, elapsed, peak_mb = measure(func, pages)
+        print(f"{name:>6} | {rows:>7} | {elapsed:>9.3f}s | {peak_mb:>8.1f}MB")
+
+    print()
+    print(f"{'Ads':>6} | {'Transport':>9} | {'fetch_ad_performance':>20}")
+    print("-" * 42)
+    for n_ads in [500, 2000]:
+        for transport in ['sdk', 'http']:
+            print(f"{n_ads:>6} | {transport:>9} | {end_to_end(n_ads, transport):>19.2f}s")
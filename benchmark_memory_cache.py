@@ -0,0 +1,72 @@
+"""
+Benchmark: cache hit served from the disk file (L2) vs. the in-memory L1
+
+For synthetic ad frames and both cache formats:
+1. CacheManager.get - re-read and parse the file vs. memory lookup
+2. fetch_ad_performance on a cache hit (what a Home / Ad Performance render costs)
+
+Usage:
+    python benchmark_memory_cache.py
+"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient
+from src.cache_backends import JsonCacheBackend, ParquetCacheBackend
+from src.cache_manager import CacheManager
+from src.schema import apply_schema
+from benchmark_cache_formats import make_ad_frame
+
+REPEATS = 20
+
+
+def best_of(func) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(backend, n_ads: int, memory_max_bytes: int) -> tuple:
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir, backend, memory_max_bytes=memory_max_bytes, prepare=apply_schema)
+        client = MetaAdsClient(access_token='', account_id='', cache_dir=cache_dir)  # cache hits only, no API
+        client.cache = cache
+
+        cache_key = f"ads_{date_range(30)}"
+        cache.put(cache_key, make_ad_frame(n_ads))
+        cache.get(cache_key)  # warm L1
+
+        get_time = best_of(lambda: cache.get(cache_key))
+        fetch_time = best_of(lambda: client.fetch_ad_performance(days=30))
+        return get_time, fetch_time
+
+
+def date_range(days: int) -> str:
+    """start_end part of the fetch_ad_performance cache key"""
+    return f"{(datetime.now() - timedelta(days=days - 1)):%Y-%m-%d}_{datetime.now():%Y-%m-%d}"
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.CRITICAL)
+
+    print("=" * 80)
+    print("⏱️  MEMORY CACHE (L1) BENCHMARK")
+    print("=" * 80)
+    print(f"{'Ads':>6} | {'Format':>7} | {'Tier':>4} | {'cache.get':>10} | {'fetch_ad_performance':>20}")
+    print("-" * 62)
+    for n_ads in [500, 2000]:
+        for backend in [JsonCacheBackend(), ParquetCacheBackend()]:
+            for tier, memory_max_bytes in [('L2', 0), ('L1', 256 * 1024 * 1024)]:
+                get_time, fetch_time = measure(backend, n_ads, memory_max_bytes)
+                print(
+                    f"{n_ads:>6} | {backend.extension.lstrip('.'):>7} | {tier:>4} | "
+                    f"{get_time * 1000:>8.2f}ms | {fetch_time * 1000:>18.2f}ms"
+                )
@@ -0,0 +1,76 @@
+"""
+Benchmark: Memory footprint of insight frames before/after the schema registry
+
+Builds a synthetic 90-day ad-level dataset (daily rows, time_increment=1) plus
+breakdown frames in the shape the Graph API returns them (all values strings)
+and prints the per-frame footprint before and after src/schema.apply_schema.
+
+Usage:
+    python benchmark_schema_memory.py [n_ads] [days]
+"""
+import copy
+import sys
+import os
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor
+from src.schema import memory_report
+from benchmark_ad_insights import RECORDED_INSIGHT
+
+AGES = ['18-24', '25-34', '35-44', '45-54', '55-64', '65+']
+GENDERS = ['female', 'male', 'unknown']
+
+
+def make_daily_rows(n_ads: int, days: int, seed: int = 0) -> list:
+    """One row per ad and day with randomized string metrics"""
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 1)
+    rows = []
+    for day in range(days):
+        date = (start + timedelta(days=day)).strftime('%Y-%m-%d')
+        for ad in range(n_ads):
+            row = copy.deepcopy(RECORDED_INSIGHT)
+            impressions = int(rng.integers(100, 5000))
+            row.update({
+                'ad_id': str(120200000000 + ad), 'ad_name': f"Ad {ad} - Herbst Video",
+                'adset_id': str(120210000000 + ad // 10), 'adset_name': f"Adset {ad // 10}",
+                'campaign_id': str(120220000000 + ad // 50), 'campaign_name': f"Kampagne {ad // 50}",
+                'date_start': date, 'date_stop': date,
+                'spend': f"{rng.lognormal(2, 1):.2f}", 'impressions': str(impressions),
+                'reach': str(int(impressions * 0.8)), 'clicks': str(int(impressions * 0.02)),
+            })
+            row['actions'][0]['value'] = str(int(rng.integers(0, 5)))
+            rows.append(row)
+    return rows
+
+
+def make_age_gender_rows(daily_rows: list) -> list:
+    """age x gender breakdown rows (one per ad, age and gender over the range)"""
+    rows = []
+    for row in daily_rows:
+        if row['date_start'] != daily_rows[0]['date_start']:
+            break
+        for age in AGES:
+            for gender in GENDERS:
+                rows.append({**row, 'age': age, 'gender': gender})
+    return rows
+
+
+if __name__ == '__main__':
+    n_ads = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 90
+
+    daily_rows = make_daily_rows(n_ads, days)
+    frames = {
+        'ads_daily': DataProcessor.add_action_columns(pd.DataFrame(daily_rows)),
+        'demographics_age_gender': DataProcessor.add_action_columns(pd.DataFrame(make_age_gender_rows(daily_rows))),
+    }
+
+    print("=" * 80)
+    print(f"💾 SCHEMA MEMORY REPORT ({n_ads} ads x {days} days, ad level)")
+    print("=" * 80)
+    report = memory_report(frames)
+    print(report.to_string(index=False))
@@ -0,0 +1,99 @@
+"""
+Benchmark: Peak memory of a daily ad-level pull, materialized vs. streamed
+
+Feeds a synthetic lazy cursor (n_ads x days rows, values as strings like the
+Graph API) through both paths and measures the Python heap peak with tracemalloc:
+
+- materialized: list(cursor) -> _build_ad_frame -> cache.put (old fetchers)
+- streamed:     iter_ad_insights -> cache.put_batches (stream_ad_insights_to_cache)
+
+Usage:
+    python benchmark_streaming_memory.py [n_ads] [days]
+"""
+import copy
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient, AD_INSIGHT_FIELDS
+from src.cache_backends import ParquetCacheBackend
+from src.cache_manager import CacheManager
+from benchmark_ad_insights import RECORDED_INSIGHT
+
+
+class SyntheticAccount:
+    """get_insights returns a generator - rows are built only when the cursor reaches them"""
+
+    def __init__(self, n_ads: int, days: int):
+        self.n_ads = n_ads
+        self.days = days
+
+    def get_insights(self, fields=None, params=None):
+        start = datetime(2025, 1, 1)
+        for day in range(self.days):
+            date = (start + timedelta(days=day)).strftime('%Y-%m-%d')
+            for ad in range(self.n_ads):
+                row = copy.deepcopy(RECORDED_INSIGHT)
+                row.update({
+                    'ad_id': str(120200000000 + ad), 'ad_name': f"Ad {ad} - Herbst Video",
+                    'date_start': date, 'date_stop': date,
+                    'spend': f"{(ad * 7 + day) % 400 / 10:.2f}",
+                    'impressions': str(100 + (ad * 13 + day) % 5000),
+                })
+                yield row
+
+
+def make_client(n_ads: int, days: int, cache_dir: str) -> MetaAdsClient:
+    client = MetaAdsClient(access_token='benchmark', account_id='act_benchmark', cache_dir=cache_dir)
+    client.account = SyntheticAccount(n_ads, days)
+    client.async_min_days = client.async_min_rows = float('inf')  # synthetic cursor has no async jobs
+    client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+    return client
+
+
+def materialized(client: MetaAdsClient) -> int:
+    rows = list(client.account.get_insights(fields=AD_INSIGHT_FIELDS))
+    df = client._build_ad_frame(rows)
+    client.cache.put('ads_daily_materialized', df)
+    return len(df)
+
+
+def streamed(client: MetaAdsClient) -> int:
+    return client.stream_ad_insights_to_cache('2025-01-01', '2025-12-31', time_increment=1, cache_key='ads_daily_streamed')
+
+
+def measure(func, n_ads: int, days: int):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = make_client(n_ads, days, cache_dir)
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = func(client)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert rows == n_ads * days, f"expected {n_ads * days} rows, got {rows}"
+    return peak / 1024 / 1024, elapsed
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    n_ads = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 90
+
+    print("=" * 80)
+    print(f"💾 STREAMING MEMORY BENCHMARK (daily ad rows, up to {n_ads} ads x {days} days)")
+    print("=" * 80)
+    print(f"{'Rows':>8} | {'Path':>12} | {'Peak heap':>10} | {'Wall time':>10}")
+    print("-" * 52)
+
+    # Streamed peak stays flat while the materialized peak grows with the row count
+    for n in [n_ads // 4, n_ads // 2, n_ads]:
+        for name, func in [('materialized', materialized), ('streamed', streamed)]:
+            peak_mb, elapsed = measure(func, n, days)
+            print(f"{n * days:>8} | {name:>12} | {peak_mb:>8.1f}MB | {elapsed:>9.2f}s")
@@ -25,8 +25,12 @@ class Config:
             Configuration value or default
         """
         # Try Streamlit secrets first (for cloud deployment)
-        if hasattr(st, 'secrets') and key in st.secrets:
-            return st.secrets[key]
+        # (st.secrets raises if no secrets.toml exists, e.g. in scripts and CLI jobs)
+        try:
+            if hasattr(st, 'secrets') and key in st.secrets:
+                return st.secrets[key]
+        except Exception:
+            pass
 
         # Fall back to environment variables
         return os.getenv(key, default)
@@ -15,7 +15,8 @@ from config import Config
 from src.meta_ads_client import MetaAdsClient
 from src.ai_analyzer import AIAnalyzer
 from src.pdf_generator import PDFGenerator
-from src.data_processor import DataProcessor
+from src.data_processor import DataProcessor, masked_ratio
+from src.schema import apply_schema
 from src.visualizations import Visualizations
 from src.whatsapp_sender import WhatsAppSender
 from src.dashboard_home import render_home_professional
@@ -34,22 +35,11 @@ def safe_select_columns(df, columns):
 
 def convert_meta_strings_to_numbers(df):
     """
-    Convert Meta API string numbers to actual floats
-    Meta API returns all numeric values as strings, this converts them
+    Convert Meta API string numbers to actual numbers
+    Meta API returns all numeric values as strings - frames from MetaAdsClient
+    are already converted at ingestion, this only catches frames built elsewhere
     """
-    if df.empty:
-        return df
-
-    numeric_fields = ['spend', 'impressions', 'reach', 'frequency', 'clicks', 'ctr', 'unique_ctr',
-                     'cpc', 'cpm', 'cpp', 'inline_link_clicks', 'unique_clicks', 'inline_post_engagement',
-                     'cost_per_inline_link_click', 'cost_per_inline_post_engagement',
-                     'cost_per_unique_click', 'cost_per_unique_inline_link_click']
-
-    for field in numeric_fields:
-        if field in df.columns:
-            df[field] = pd.to_numeric(df[field], errors='coerce').fillna(0)
-
-    return df
+    return apply_schema(df)
 
 
 # Page config
@@ -144,14 +134,22 @@ def render_sidebar():
     return page
 
 
-def render_refresh_button():
-    """Render refresh button and timestamp"""
+def render_refresh_button(data_types=None):
+    """
+    Render refresh button and timestamp
+
+    Args:
+        data_types: Cache data types the current page shows (None = all)
+    """
     col1, col2 = st.columns([3, 1])
 
     with col2:
         if st.button("🔄 Aktualisieren", type="secondary", use_container_width=True):
-            # Clear cache and refresh
-            st.session_state.meta_client.clear_cache()
+            # Drop only the cache entries of this page and refresh
+            if data_types is None:
+                st.session_state.meta_client.clear_cache()
+            else:
+                st.session_state.meta_client.invalidate_cache(data_types)
             st.session_state.last_refresh = datetime.now()
             st.rerun()
 
@@ -162,13 +160,20 @@ def render_refresh_button():
             st.caption("Klicke auf 'Aktualisieren' für Live-Daten")
 
 
+def render_data_age_marker():
+    """Show the cache time if expired data was served while it refreshes in the background"""
+    stale_since = st.session_state.meta_client.pop_stale_data_time()
+    if stale_since:
+        st.caption(f"⏳ Daten von {stale_since.strftime('%H:%M')} Uhr - Aktualisierung läuft im Hintergrund")
+
+
 def render_home():
     """Render home page"""
     st.markdown('<div class="main-header">Meta Ads Autopilot 🚀</div>', unsafe_allow_html=True)
     st.markdown("### AI-powered Performance Dashboard mit Google Gemini")
 
     # Refresh button
-    render_refresh_button()
+    render_refresh_button(['campaigns', 'ads'])
 
     st.markdown("---")
 
@@ -176,6 +181,7 @@ def render_home():
     with st.spinner("Lade aktuelle Daten..."):
         campaign_df = st.session_state.meta_client.fetch_campaign_data(days=30)
         ad_df = st.session_state.meta_client.fetch_ad_performance(days=30)
+    render_data_age_marker()
 
     # Check API status and data availability
     api_status = st.session_state.meta_client.api_initialized
@@ -291,7 +297,7 @@ def render_weekly_report():
     st.markdown("## 📊 Weekly Performance Report")
 
     # Refresh button
-    render_refresh_button()
+    render_refresh_button(['campaigns', 'ads'])
 
     st.markdown("---")
 
@@ -379,14 +385,14 @@ def render_weekly_report():
     if analyze_button and start_date and end_date:
         with st.spinner("🔄 Lade Meta Ads Daten..."):
             # Use custom date range with start_date and end_date!
-            campaign_df = st.session_state.meta_client.fetch_campaign_data(
-                start_date=start_date.strftime('%Y-%m-%d'),
-                end_date=end_date.strftime('%Y-%m-%d')
-            )
-            ad_df = st.session_state.meta_client.fetch_ad_performance(
+            # Campaign view is rolled up from the ad-level data (one fetch for both)
+            rollups = st.session_state.meta_client.fetch_rollups(
                 start_date=start_date.strftime('%Y-%m-%d'),
                 end_date=end_date.strftime('%Y-%m-%d')
             )
+            campaign_df = rollups['campaign']
+            ad_df = rollups['ad']
+        render_data_age_marker()
 
         if campaign_df.empty and ad_df.empty:
             st.error("Keine Daten verfügbar für den gewählten Zeitraum")
@@ -550,10 +556,10 @@ def render_monthly_report():
                 st.error("Keine Daten verfügbar")
                 return
 
-            # Split into current and previous month
-            current_month = st.session_state.meta_client.fetch_ad_performance(days=30)
-
-            campaign_df = st.session_state.meta_client.fetch_campaign_data(days=30)
+            # Split into current and previous month (campaigns rolled up from the ads)
+            rollups = st.session_state.meta_client.fetch_rollups(days=30)
+            current_month = rollups['ad']
+            campaign_df = rollups['campaign']
 
         # Calculate metrics
         current_month = st.session_state.data_processor.calculate_metrics(current_month)
@@ -587,7 +593,7 @@ def render_ad_performance():
     st.markdown("## 🎯 Ad Performance Analysis")
 
     # Refresh button
-    render_refresh_button()
+    render_refresh_button(['ads'])
 
     col1, col2 = st.columns([3, 1])
 
@@ -599,6 +605,7 @@ def render_ad_performance():
 
     with st.spinner("Lade Ad Performance Daten..." if not force_refresh else "⚡ Lade frische Daten von Meta API..."):
         ad_df = st.session_state.meta_client.fetch_ad_performance(days=days, force_refresh=force_refresh)
+    render_data_age_marker()
 
     if ad_df.empty:
         st.warning("Keine Ad-Daten verfügbar")
@@ -612,9 +619,9 @@ def render_ad_performance():
     ad_df = st.session_state.data_processor.detect_ad_fatigue(ad_df)
 
     # Add performance score
-    ad_df['performance_score'] = ad_df.apply(
-        st.session_state.data_processor.calculate_performance_score,
-        axis=1
+    ad_df['performance_score'] = st.session_state.data_processor.calculate_performance_scores(
+        ad_df,
+        DataProcessor.score_thresholds_for(st.session_state.meta_client.account_id)
     )
 
     # Filters
@@ -749,7 +756,7 @@ def render_leads_dashboard():
     st.markdown("### Aktuelle Lead-Formulare Daten")
 
     # Refresh button
-    render_refresh_button()
+    render_refresh_button(['leads'])
 
     # Date range selector
     col1, col2 = st.columns([2, 2])
@@ -771,6 +778,13 @@ def render_leads_dashboard():
     with st.spinner("Lade echte Lead-Daten von Meta..."):
         leads_df = st.session_state.meta_client.fetch_leads_data(days=days, force_refresh=force_refresh)
 
+    lead_store = st.session_state.meta_client.lead_store
+    last_sync = lead_store.last_sync()
+    st.caption(
+        f"💾 Lead-Store: {lead_store.count():,} Leads lokal · letzter Sync: "
+        f"{last_sync.strftime('%d.%m.%Y %H:%M') if last_sync else 'ausstehend'}"
+    )
+
     if leads_df.empty:
         st.info("Keine Leads im gewählten Zeitraum gefunden")
         st.info("""
@@ -932,7 +946,7 @@ def render_ai_chat():
     st.markdown("### Interaktive Beratung für deine Meta Ads Kampagnen")
 
     # Refresh button
-    render_refresh_button()
+    render_refresh_button(['campaigns', 'ads', 'leads', 'breakdowns'])
 
     st.markdown("---")
 
@@ -981,21 +995,8 @@ def render_ai_chat():
 
                 # Extract leads from ad_df actions
                 if not ad_df.empty:
-                    def extract_leads(actions):
-                        if isinstance(actions, list):
-                            for action in actions:
-                                if isinstance(action, dict) and action.get('action_type') == 'lead':
-                                    try:
-                                        return int(action.get('value', 0))
-                                    except:
-                                        return 0
-                        return 0
-
-                    ad_df['leads'] = ad_df['actions'].apply(extract_leads)
-                    ad_df['cpl'] = ad_df.apply(
-                        lambda row: round(row['spend'] / row['leads'], 2) if row['leads'] > 0 else 0,
-                        axis=1
-                    )
+                    ad_df['leads'] = DataProcessor.add_action_columns(ad_df)['leads_extracted']
+                    ad_df['cpl'] = masked_ratio(ad_df['spend'], ad_df['leads'])
 
                 # Create COMPREHENSIVE context strings for Gemini with ALL metrics
                 if not campaign_df.empty:
@@ -1103,15 +1104,7 @@ def render_ai_chat():
                     if 'demographics_age_gender' in advanced_insights and not advanced_insights['demographics_age_gender'].empty:
                         demo_df = advanced_insights['demographics_age_gender']
 
-                        # Extract leads
-                        def extract_leads_adv(actions):
-                            if isinstance(actions, list):
-                                for action in actions:
-                                    if isinstance(action, dict) and action.get('action_type') == 'lead':
-                                        return int(action.get('value', 0))
-                            return 0
-
-                        demo_df['leads'] = demo_df['actions'].apply(extract_leads_adv)
+                        demo_df['leads'] = DataProcessor.add_action_columns(demo_df)['leads_extracted']
                         demo_df['segment'] = demo_df['age'].astype(str) + ' | ' + demo_df['gender'].astype(str)
 
                         demo_summary = demo_df.groupby('segment').agg({
@@ -1127,7 +1120,7 @@ def render_ai_chat():
                     # GEOGRAPHIC - COUNTRY + REGION
                     if 'geographic_country' in advanced_insights and not advanced_insights['geographic_country'].empty:
                         geo_df = advanced_insights['geographic_country']
-                        geo_df['leads'] = geo_df['actions'].apply(extract_leads_adv)
+                        geo_df['leads'] = DataProcessor.add_action_columns(geo_df)['leads_extracted']
 
                         geo_summary = geo_df.groupby('country').agg({
                             'spend': 'sum',
@@ -1142,7 +1135,7 @@ def render_ai_chat():
                     # PLACEMENTS
                     if 'placements' in advanced_insights and not advanced_insights['placements'].empty:
                         place_df = advanced_insights['placements']
-                        place_df['leads'] = place_df['actions'].apply(extract_leads_adv)
+                        place_df['leads'] = DataProcessor.add_action_columns(place_df)['leads_extracted']
                         place_df['placement'] = place_df['publisher_platform'].astype(str) + ' - ' + place_df['platform_position'].astype(str)
 
                         place_summary = place_df.groupby('placement').agg({
@@ -1403,7 +1396,7 @@ def render_advanced_insights():
     st.markdown("### 📊 Demografien, Plattformen, Video-Retention & mehr!")
 
     # Refresh button
-    render_refresh_button()
+    render_refresh_button(['breakdowns'])
 
     st.markdown("---")
 
@@ -1458,6 +1451,7 @@ def render_advanced_insights():
             days=days,
             level=level
         )
+    render_data_age_marker()
 
     if not insights or all(df.empty for df in insights.values()):
         st.warning("Keine Daten verfügbar für den gewählten Zeitraum. Prüfe ob Ads im gewählten Zeitraum aktiv waren.")
@@ -1491,13 +1485,10 @@ def render_advanced_insights():
                 Versuche es nochmal mit "Ad-Level" für vollständige Daten!
                 """)
 
-    # Helper function to extract actions - GLOBAL für alle Tabs!
-    def extract_leads_from_actions(actions):
-        if isinstance(actions, list):
-            for action in actions:
-                if isinstance(action, dict) and action.get('action_type') == 'lead':
-                    return int(action.get('value', 0))
-        return 0
+    # Leads are pre-parsed at ingestion (leads_extracted) - fill in for frames without it
+    for df in insights.values():
+        if not df.empty:
+            DataProcessor.add_action_columns(df)
 
     # Display insights in tabs
     tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
@@ -1516,12 +1507,9 @@ def render_advanced_insights():
         if 'demographics_age' in insights and not insights['demographics_age'].empty:
             st.markdown("#### Alter-Verteilung")
             age_df = insights['demographics_age']
+            if 'reach_approximate' in age_df.columns and age_df['reach_approximate'].any():
+                st.caption("ℹ️ Reichweite aus Alter×Geschlecht summiert (Näherung)")
 
-            # Process actions
-            if 'actions' in age_df.columns:
-                age_df['leads_extracted'] = age_df['actions'].apply(extract_leads_from_actions)
-            else:
-                age_df['leads_extracted'] = 0
 
             # Group by age
             if 'age' in age_df.columns:
@@ -1560,11 +1548,9 @@ def render_advanced_insights():
         if 'demographics_gender' in insights and not insights['demographics_gender'].empty:
             st.markdown("#### Geschlechter-Verteilung")
             gender_df = insights['demographics_gender']
+            if 'reach_approximate' in gender_df.columns and gender_df['reach_approximate'].any():
+                st.caption("ℹ️ Reichweite aus Alter×Geschlecht summiert (Näherung)")
 
-            if 'actions' in gender_df.columns:
-                gender_df['leads_extracted'] = gender_df['actions'].apply(extract_leads_from_actions)
-            else:
-                gender_df['leads_extracted'] = 0
 
             if 'gender' in gender_df.columns:
                 gender_summary = gender_df.groupby('gender').agg({
@@ -1599,10 +1585,6 @@ def render_advanced_insights():
             st.markdown("#### Alter + Geschlecht (Kombiniert)")
             age_gender_df = insights['demographics_age_gender']
 
-            if 'actions' in age_gender_df.columns:
-                age_gender_df['leads_extracted'] = age_gender_df['actions'].apply(extract_leads_from_actions)
-            else:
-                age_gender_df['leads_extracted'] = 0
 
             if 'age' in age_gender_df.columns and 'gender' in age_gender_df.columns:
                 age_gender_df['segment'] = age_gender_df['age'].astype(str) + ' - ' + age_gender_df['gender'].astype(str)
@@ -1642,10 +1624,6 @@ def render_advanced_insights():
             st.markdown("#### Länder-Verteilung")
             country_df = insights['geographic_country']
 
-            if 'actions' in country_df.columns:
-                country_df['leads_extracted'] = country_df['actions'].apply(extract_leads_from_actions)
-            else:
-                country_df['leads_extracted'] = 0
 
             if 'country' in country_df.columns:
                 country_summary = country_df.groupby('country').agg({
@@ -1680,10 +1658,6 @@ def render_advanced_insights():
             st.markdown("#### Regionen-Verteilung")
             region_df = insights['geographic_region']
 
-            if 'actions' in region_df.columns:
-                region_df['leads_extracted'] = region_df['actions'].apply(extract_leads_from_actions)
-            else:
-                region_df['leads_extracted'] = 0
 
             if 'region' in region_df.columns:
                 region_summary = region_df.groupby('region').agg({
@@ -1713,10 +1687,6 @@ def render_advanced_insights():
         if 'placements' in insights and not insights['placements'].empty:
             placement_df = insights['placements']
 
-            if 'actions' in placement_df.columns:
-                placement_df['leads_extracted'] = placement_df['actions'].apply(extract_leads_from_actions)
-            else:
-                placement_df['leads_extracted'] = 0
 
             # Group by platform and position
             if 'publisher_platform' in placement_df.columns and 'platform_position' in placement_df.columns:
@@ -1755,10 +1725,6 @@ def render_advanced_insights():
         if 'devices' in insights and not insights['devices'].empty:
             device_df = insights['devices']
 
-            if 'actions' in device_df.columns:
-                device_df['leads_extracted'] = device_df['actions'].apply(extract_leads_from_actions)
-            else:
-                device_df['leads_extracted'] = 0
 
             if 'impression_device' in device_df.columns:
                 device_summary = device_df.groupby('impression_device').agg({
@@ -1792,10 +1758,6 @@ def render_advanced_insights():
         if 'hourly' in insights and not insights['hourly'].empty:
             hourly_df = insights['hourly']
 
-            if 'actions' in hourly_df.columns:
-                hourly_df['leads_extracted'] = hourly_df['actions'].apply(extract_leads_from_actions)
-            else:
-                hourly_df['leads_extracted'] = 0
 
             if 'hourly_stats_aggregated_by_advertiser_time_zone' in hourly_df.columns:
                 hourly_df['hour'] = hourly_df['hourly_stats_aggregated_by_advertiser_time_zone'].astype(str)
@@ -1831,10 +1793,6 @@ def render_advanced_insights():
         if 'base' in insights and not insights['base'].empty:
             base_df = insights['base']
 
-            if 'actions' in base_df.columns:
-                base_df['leads_extracted'] = base_df['actions'].apply(extract_leads_from_actions)
-            else:
-                base_df['leads_extracted'] = 0
 
             # Show summary - SAFE conversion with error handling
             try:
@@ -1932,6 +1890,75 @@ def render_settings():
 
     st.markdown("---")
 
+    st.markdown("### 🗄️ Cache")
+    cache_backend = st.session_state.meta_client.cache_backend
+    st.info(f"**Cache-Format:** {cache_backend.extension.lstrip('.')} (META_CACHE_FORMAT)")
+
+    cache_stats = st.session_state.meta_client.cache_stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+        st.caption(f"{cache_stats['hits']} Hits / {cache_stats['misses']} Misses")
+        st.caption(f"Speicher (L1): {cache_stats['memory_hit_rate']:.0%} · Datei (L2): {cache_stats['disk_hit_rate']:.0%}")
+        if st.session_state.meta_client.stale_while_revalidate:
+            st.caption(f"{cache_stats['stale_hits']} veraltet ausgeliefert (max. {st.session_state.meta_client.max_stale_hours:g}h)")
+    with col2:
+        st.metric("Evictions", cache_stats['evictions'])
+        st.caption(f"{cache_stats['expirations']} abgelaufen")
+    with col3:
+        st.metric("Einträge", cache_stats['entries'])
+    with col4:
+        st.metric("Größe", f"{cache_stats['bytes'] / 1024 / 1024:.1f} MB")
+        st.caption(f"Limit: {cache_stats['max_bytes'] / 1024 / 1024:.0f} MB")
+        st.caption(
+            f"Im Speicher: {cache_stats['memory_entries']} Einträge, "
+            f"{cache_stats['memory_bytes'] / 1024 / 1024:.1f} / {cache_stats['memory_max_bytes'] / 1024 / 1024:.0f} MB"
+        )
+
+    coalescing = st.session_state.meta_client.coalescing_stats()
+    st.caption(
+        f"🔗 Zusammengeführte Abrufe: {coalescing['coalesced']} "
+        f"(gleiche Anfrage anderer Sessions lief bereits) · {coalescing['executions']} API-Abrufe · "
+        f"{coalescing['in_flight']} laufend"
+    )
+
+    if st.button("🗑️ Cache leeren"):
+        st.session_state.meta_client.clear_cache()
+        st.success("✅ Cache geleert")
+
+    if cache_backend.extension != '.json':
+        if st.button("🔄 JSON-Cache migrieren"):
+            migrated = st.session_state.meta_client.migrate_cache()
+            st.success(f"✅ {migrated} Cache-Einträge migriert")
+
+    st.markdown("---")
+
+    st.markdown("### 🚦 API Rate Limit")
+    rate_status = st.session_state.meta_client.rate_limit_status()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Auslastung", f"{rate_status['usage_pct']:.0f}%")
+        if rate_status['updated_at']:
+            st.caption(f"Stand: {rate_status['updated_at'].strftime('%H:%M:%S')}")
+        else:
+            st.caption("Noch keine API-Antwort")
+    with col2:
+        st.metric("Parallele Requests", f"{rate_status['concurrency_limit']} / {rate_status['max_concurrency']}")
+        if rate_status['pacing_delay']:
+            st.caption(f"Pause vor jedem Request: {rate_status['pacing_delay']:.1f}s")
+    with col3:
+        st.metric("Gedrosselt", rate_status['throttled'])
+        st.caption(f"{rate_status['calls']} Requests gesamt")
+    with col4:
+        st.metric("Gesperrt", f"{rate_status['blocked_seconds']:.0f}s")
+
+    if rate_status['usage']:
+        with st.expander("📊 Usage-Header Details"):
+            for header, values in rate_status['usage'].items():
+                st.markdown(f"**{header}:** " + ", ".join(f"{key} {value:.0f}%" for key, value in values.items()))
+
+    st.markdown("---")
+
     st.markdown("### 📋 Konfiguration")
     st.code(f"""
 Company Name: {Config.get('COMPANY_NAME', 'Not set')}
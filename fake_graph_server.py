@@ -0,0 +1,470 @@
+"""
+Fake Graph API Server
+Local stand-in for graph.facebook.com used by the test scripts (no Meta account needed)
+
+Usage:
+    server = FakeGraphServer(n_ads=120).start()
+    client = MetaAdsClient(access_token='test', account_id=server.account_id, graph_url=server.url)
+    ...
+    server.stop()
+"""
+import gzip
+import itertools
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+# Values returned per breakdown dimension
+BREAKDOWN_VALUES = {
+    'age': ['18-24', '25-34', '35-44', '45-54'],
+    'gender': ['male', 'female', 'unknown'],
+    'country': ['DE', 'AT', 'CH'],
+    'region': ['Bavaria', 'Berlin', 'Vienna'],
+    'publisher_platform': ['facebook', 'instagram'],
+    'platform_position': ['feed', 'story'],
+    'impression_device': ['iphone', 'android_smartphone', 'desktop'],
+    'hourly_stats_aggregated_by_advertiser_time_zone': [f'{h:02d}:00:00 - {h:02d}:59:59' for h in range(24)],
+}
+
+
+def make_insight_row(ad_id: str, campaign_id: str, adset_id: str) -> Dict:
+    """One insight row with string values like the real Graph API"""
+    return {
+        'account_id': '123', 'account_name': 'Fake Account', 'account_currency': 'EUR',
+        'ad_id': ad_id, 'ad_name': f'Ad {ad_id}',
+        'adset_id': adset_id, 'adset_name': f'Adset {adset_id}',
+        'campaign_id': campaign_id, 'campaign_name': f'Campaign {campaign_id}',
+        'date_start': '2024-10-01', 'date_stop': '2024-10-30',
+        'spend': '10.00', 'impressions': '1000', 'reach': '400', 'frequency': '2.5',
+        'clicks': '20', 'ctr': '2.0', 'cpm': '10.0', 'cpc': '0.5',
+        'objective': 'OUTCOME_LEADS', 'quality_ranking': 'average',
+        'actions': [
+            {'action_type': 'lead', 'value': '2'},
+            {'action_type': 'link_click', 'value': '15'},
+        ],
+        'cost_per_action_type': [{'action_type': 'lead', 'value': '5.0'}],
+        'video_play_actions': [{'action_type': 'video_view', 'value': '300'}],
+        'video_thruplay_watched_actions': [{'action_type': 'video_view', 'value': '90'}],
+    }
+
+
+def day_counts(day: str) -> Dict[str, float]:
+    """Base counts of one ad on one day - they differ per day, so daily ratios differ too"""
+    k = datetime.strptime(day, '%Y-%m-%d').toordinal() % 5 + 1
+    return {
+        'spend': 10.0 * k, 'impressions': 1000 + 100 * k, 'reach': 400, 'clicks': 20 * k,
+        'lead': k, 'link_click': 15 + k, 'unique_link_click': 10 + k,
+        'video_view': 300, 'thruplay': 90 + 10 * k,
+    }
+
+
+def make_counted_row(row: Dict, counts: Dict[str, float], avg_watch_seconds: float) -> Dict:
+    """Insight row whose ratio, result and cost fields are derived from counts (like Meta does for any range)"""
+    spend, impressions, reach, leads = counts['spend'], counts['impressions'], counts['reach'], counts['lead']
+    per_indicator = lambda value: [{'indicator': 'actions:lead', 'values': [{'value': str(value)}]}]
+    return {
+        **row,
+        'spend': str(spend), 'impressions': str(impressions), 'reach': str(reach), 'clicks': str(counts['clicks']),
+        'ctr': str(counts['clicks'] * 100 / impressions), 'cpm': str(spend * 1000 / impressions),
+        'cpc': str(spend / counts['clicks']), 'frequency': str(impressions / reach),
+        'actions': [
+            {'action_type': 'lead', 'value': str(leads)},
+            {'action_type': 'link_click', 'value': str(counts['link_click'])},
+        ],
+        'unique_actions': [{'action_type': 'link_click', 'value': str(counts['unique_link_click'])}],
+        'cost_per_action_type': [
+            {'action_type': 'lead', 'value': str(spend / leads)},
+            {'action_type': 'link_click', 'value': str(spend / counts['link_click'])},
+        ],
+        'cost_per_unique_action_type': [{'action_type': 'link_click', 'value': str(spend / counts['unique_link_click'])}],
+        'video_play_actions': [{'action_type': 'video_view', 'value': str(counts['video_view'])}],
+        'video_thruplay_watched_actions': [{'action_type': 'video_view', 'value': str(counts['thruplay'])}],
+        'cost_per_thruplay': [{'action_type': 'video_view', 'value': str(spend / counts['thruplay'])}],
+        'video_avg_time_watched_actions': [{'action_type': 'video_view', 'value': str(avg_watch_seconds)}],
+        'results': per_indicator(leads),
+        'cost_per_result': per_indicator(spend / leads),
+        'result_rate': per_indicator(leads * 100 / impressions),
+        'website_ctr': [{'action_type': 'link_click', 'value': str(counts['link_click'] * 100 / impressions)}],
+        'unique_link_clicks_ctr': str(counts['unique_link_click'] * 100 / reach),
+    }
+
+
+class FakeGraphServer:
+    """Threaded HTTP server that answers the Graph endpoints MetaAdsClient uses"""
+
+    def __init__(
+        self,
+        n_ads: int = 20,
+        n_campaigns: int = 3,
+        page_size: int = 25,
+        job_states: Optional[List[str]] = None,
+        account_id: str = 'act_123',
+        latency: float = 0.0,
+        failing_objects: Optional[List[str]] = None,
+        fail_batches: bool = False,
+        usage_pct: float = 0.0,
+        throttle_requests: int = 0,
+        throttle_code: int = 17,
+        n_pages: int = 0,
+        forms_per_page: int = 3,
+        leads_per_form: int = 0,
+        lead_interval_hours: float = 6.0,
+        range_totals: bool = False
+    ):
+        """
+        Args:
+            n_ads: Number of ads in the fake account
+            n_campaigns: Number of campaigns (ads are spread round-robin)
+            page_size: Default page size when no 'limit' is given
+            job_states: async_status sequence returned by successive polls of a report run
+            account_id: Ad account ID (format: act_XXXXX)
+            latency: Seconds every request is delayed (simulates Graph round-trip time)
+            failing_objects: Object IDs whose insights, leads or node requests return an error
+            fail_batches: Answer every batch request with HTTP 500
+            usage_pct: Usage reported in the x-business-use-case-usage / x-ad-account-usage headers
+            throttle_requests: Answer this many insights requests with a rate limit error
+            throttle_code: Graph error code of those errors (17 or 80004)
+            n_pages: Facebook pages returned by /me/accounts (lead forms live on pages)
+            forms_per_page: Lead forms per page
+            leads_per_form: Leads per form, the newest created now, each further one
+                            lead_interval_hours earlier
+            lead_interval_hours: Hours between two leads of a form
+            range_totals: Counts differ per day (see day_counts) and a time_range
+                          without time_increment returns the totals of its days,
+                          with results and cost/rate fields derived from them
+        """
+        self.account_id = account_id
+        self.range_totals = range_totals
+        self.latency = latency
+        self.failing_objects = set(failing_objects or [])
+        self.fail_batches = fail_batches
+        self.usage_pct = usage_pct
+        self.throttle_requests = throttle_requests
+        self.throttle_code = throttle_code
+        self.page_size = page_size
+        self.job_states = job_states or ['Job Not Started', 'Job Running', 'Job Completed']
+        self.campaigns = [str(5000 + c) for c in range(n_campaigns)]
+        self.adsets = [str(6000 + c) for c in range(n_campaigns * 2)]
+        self.ads = []
+        for i in range(n_ads):
+            self.ads.append({
+                'id': str(1000 + i),
+                'campaign_id': self.campaigns[i % n_campaigns],
+                'adset_id': self.adsets[i % len(self.adsets)],
+            })
+
+        # Pages -> lead forms -> leads (newest first, like the Graph API)
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.pages = [str(7000 + p) for p in range(n_pages)]
+        self.forms = {
+            page_id: [f'{page_id}{f:03d}' for f in range(forms_per_page)]
+            for page_id in self.pages
+        }
+        self.leads = {
+            form_id: [make_lead(form_id, i, now - timedelta(hours=i * lead_interval_hours)) for i in range(leads_per_form)]
+            for forms in self.forms.values() for form_id in forms
+        }
+
+        self.requests = []  # (method, path, params) of every request
+        self.connections = 0  # TCP connections accepted (keep-alive reuses one)
+        self.jobs = {}  # report_run_id -> {'params': ..., 'polls': int}
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'FakeGraphServer':
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(self))
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def count(self, method: Optional[str] = None, pattern: str = '') -> int:
+        """Number of logged requests matching method and path regex"""
+        with self._lock:
+            return sum(
+                1 for m, path, _ in self.requests
+                if (method is None or m == method) and re.search(pattern, path)
+            )
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def handle(self, method: str, path: str, params: Dict) -> tuple:
+        """Route one request, returns (status, json_body)"""
+        with self._lock:
+            self.requests.append((method, path, params))
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        return self._route(method, path, params)
+
+    def usage_headers(self) -> Dict[str, str]:
+        """Usage headers sent with every response (like the real Graph API)"""
+        business_usage = {
+            '1234': [{
+                'type': 'ads_insights', 'call_count': self.usage_pct, 'total_cputime': self.usage_pct / 2,
+                'total_time': self.usage_pct / 2, 'estimated_time_to_regain_access': 0,
+            }]
+        }
+        account_usage = {'acc_id_util_pct': self.usage_pct, 'reset_time_duration': 0}
+        return {
+            'x-business-use-case-usage': json.dumps(business_usage),
+            'x-ad-account-usage': json.dumps(account_usage),
+        }
+
+    def _route(self, method: str, path: str, params: Dict) -> tuple:
+        parts = [p for p in re.sub(r'^/v\d+\.\d+', '', path).split('/') if p]
+        node = parts[0] if parts else ''
+        edge = parts[1] if len(parts) > 1 else ''
+
+        if not node and method == 'POST' and 'batch' in params:
+            if self.fail_batches:
+                return 500, {'error': {'message': 'Batch failed', 'type': 'OAuthException', 'code': 1}}
+            return 200, self._batch(json.loads(params['batch']))
+
+        if edge == 'insights' and self._take_throttle():
+            message = 'User request limit reached' if self.throttle_code == 17 else 'There have been too many calls to this ad-account'
+            return 400, {'error': {'message': message, 'type': 'OAuthException', 'code': self.throttle_code, 'is_transient': True}}
+
+        if node in self.failing_objects and edge in ('insights', 'leads', ''):
+            return 400, {'error': {'message': f'{(edge or "node").capitalize()} for {node} unavailable', 'type': 'OAuthException', 'code': 100}}
+
+        if node == self.account_id:
+            if edge == 'insights' and method == 'POST':
+                return 200, self._create_job(params)
+            if edge == 'insights':
+                return 200, self._page(self._insight_rows(params), params, path)
+            if edge in ('ads', 'adsets', 'campaigns'):
+                return 200, self._page(self._objects(edge), params, path)
+
+        if node == 'me' and edge == 'accounts':
+            pages = [{'id': page_id, 'name': f'Page {page_id}', 'access_token': f'page-token-{page_id}'} for page_id in self.pages]
+            return 200, self._page(pages, params, path)
+
+        if node in self.forms and edge == 'leadgen_forms':
+            forms = [{'id': form_id, 'name': f'Form {form_id}', 'status': 'ACTIVE'} for form_id in self.forms[node]]
+            return 200, self._page(forms, params, path)
+
+        if node in self.leads and edge == 'leads':
+            return 200, self._page(_filter_leads(self.leads[node], params), params, path)
+
+        if node in self.leads and not edge:
+            return 200, {'id': node, 'name': f'Form {node}'}
+
+        if not edge:
+            for leads in self.leads.values():
+                for lead in leads:
+                    if lead['id'] == node:
+                        return 200, lead
+
+        if node in self.jobs:
+            if edge == 'insights':
+                return 200, self._page(self._insight_rows(self.jobs[node]['params']), params, path)
+            return 200, self._poll_job(node)
+
+        for ad in self.ads:
+            if node in (ad['id'], ad['campaign_id'], ad['adset_id']) and edge == 'insights':
+                return 200, self._page(self._insight_rows(params, object_id=node), params, path)
+
+        return 404, {'error': {'message': f'Unknown path {path}', 'type': 'GraphMethodException', 'code': 100}}
+
+    def _take_throttle(self) -> bool:
+        with self._lock:
+            if self.throttle_requests > 0:
+                self.throttle_requests -= 1
+                return True
+            return False
+
+    def _batch(self, calls: List[Dict]) -> List[Dict]:
+        """Answer a Graph batch request, one response per sub-request"""
+        responses = []
+        for call in calls:
+            parsed = urlparse('/' + call['relative_url'].lstrip('/'))
+            params = dict(parse_qsl(parsed.query))
+            params.update(parse_qsl(call.get('body', '')))
+            status, body = self._route(call['method'], parsed.path, params)
+            responses.append({
+                'code': status,
+                'headers': [{'name': 'Content-Type', 'value': 'application/json'}],
+                'body': json.dumps(body),
+            })
+        return responses
+
+    def _objects(self, edge: str) -> List[Dict]:
+        ids = {'ads': [ad['id'] for ad in self.ads], 'adsets': self.adsets, 'campaigns': self.campaigns}[edge]
+        return [{'id': object_id, 'name': f'{edge[:-1]} {object_id}', 'status': 'ACTIVE'} for object_id in ids]
+
+    def _insight_rows(self, params: Dict, object_id: Optional[str] = None) -> List[Dict]:
+        level = params.get('level', 'ad')
+        breakdowns = _json_param(params.get('breakdowns')) or []
+
+        # One row per object of the requested level
+        rows = {}
+        for ad in self.ads:
+            if object_id:
+                if object_id not in (ad['id'], ad['campaign_id'], ad['adset_id']):
+                    continue
+                key = object_id
+            else:
+                key = ad['id'] if level == 'ad' else ad[f'{level}_id']
+            if key not in rows:
+                rows[key] = make_insight_row(ad['id'], ad['campaign_id'], ad['adset_id'])
+
+        # time_increment=1 -> one row per day of the time_range
+        days = [None]
+        time_range = _json_param(params.get('time_range'))
+        if str(params.get('time_increment')) == '1' and isinstance(time_range, dict):
+            days = self._range_days(time_range)
+
+        result = []
+        combos = list(itertools.product(*[BREAKDOWN_VALUES.get(b, ['unknown']) for b in breakdowns]))
+        for day in days:
+            for row in rows.values():
+                if self.range_totals and isinstance(time_range, dict):
+                    row = self._counted_row(row, [day] if day else self._range_days(time_range))
+                for combo in combos:
+                    dated = {'date_start': day, 'date_stop': day} if day else {}
+                    result.append({**row, **dated, **dict(zip(breakdowns, combo))})
+        return result
+
+    @staticmethod
+    def _range_days(time_range: Dict) -> List[str]:
+        start = datetime.strptime(time_range['since'], '%Y-%m-%d')
+        end = datetime.strptime(time_range['until'], '%Y-%m-%d')
+        return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
+
+    @staticmethod
+    def _counted_row(row: Dict, days: List[str]) -> Dict:
+        """Row with the summed counts of some days (range_totals mode)"""
+        counts = {}
+        for day in days:
+            for key, value in day_counts(day).items():
+                counts[key] = counts.get(key, 0) + value
+        counts['reach'] = max(day_counts(day)['reach'] for day in days)  # same people every day
+        return make_counted_row(row, counts, avg_watch_seconds=5 + len(days) % 3)
+
+    def _create_job(self, params: Dict) -> Dict:
+        report_run_id = str(900000 + len(self.jobs))
+        self.jobs[report_run_id] = {'params': params, 'polls': 0}
+        return {'report_run_id': report_run_id}
+
+    def _poll_job(self, report_run_id: str) -> Dict:
+        job = self.jobs[report_run_id]
+        state = self.job_states[min(job['polls'], len(self.job_states) - 1)]
+        job['polls'] += 1
+        percent = 100 if state == 'Job Completed' else min(99, 30 * job['polls'])
+        return {
+            'id': report_run_id,
+            'async_status': state,
+            'async_percent_completion': percent,
+        }
+
+    def _page(self, rows: List[Dict], params: Dict, path: str) -> Dict:
+        limit = int(params.get('limit', self.page_size))
+        offset = int(params.get('after', 0))
+        body = {'data': rows[offset:offset + limit]}
+
+        end = offset + limit
+        body['paging'] = {'cursors': {'before': str(offset), 'after': str(end)}}
+        if end < len(rows):
+            next_params = {k: v for k, v in params.items() if k != 'after'}
+            next_params['after'] = str(end)
+            body['paging']['next'] = f'{self.url}{path}?{urlencode(next_params)}'
+        return body
+
+
+def make_lead(form_id: str, index: int, created: datetime) -> Dict:
+    """One lead of a form with field_data like the Graph API"""
+    return {
+        'id': f'{form_id}{index:05d}',
+        'created_time': created.strftime('%Y-%m-%dT%H:%M:%S+0000'),
+        'form_id': form_id,
+        'field_data': [
+            {'name': 'full_name', 'values': [f'Lead {index}']},
+            {'name': 'email', 'values': [f'lead{index}@example.com']},
+        ],
+    }
+
+
+def _filter_leads(leads: List[Dict], params: Dict) -> List[Dict]:
+    """Apply 'filtering' on time_created (unix seconds, GREATER_THAN / LESS_THAN)"""
+    for rule in _json_param(params.get('filtering')) or []:
+        if rule.get('field') != 'time_created':
+            continue
+        bound = float(rule['value'])
+        created = lambda lead: datetime.strptime(lead['created_time'], '%Y-%m-%dT%H:%M:%S%z').timestamp()
+        if rule.get('operator') == 'GREATER_THAN':
+            leads = [lead for lead in leads if created(lead) > bound]
+        elif rule.get('operator') == 'LESS_THAN':
+            leads = [lead for lead in leads if created(lead) < bound]
+    return leads
+
+
+def _json_param(value):
+    """The SDK JSON-encodes list and map params"""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _make_handler(server: FakeGraphServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # keep-alive like graph.facebook.com
+
+        def setup(self):
+            super().setup()
+            with server._lock:
+                server.connections += 1
+
+        def _respond(self, method: str):
+            parsed = urlparse(self.path)
+            params = dict(parse_qsl(parsed.query))
+            if method == 'POST':
+                length = int(self.headers.get('Content-Length', 0))
+                params.update(parse_qsl(self.rfile.read(length).decode()))
+
+            status, body = server.handle(method, parsed.path, params)
+            payload = json.dumps(body).encode()
+            compress = 'gzip' in self.headers.get('Accept-Encoding', '')
+            if compress:
+                payload = gzip.compress(payload, compresslevel=1)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            if compress:
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in server.usage_headers().items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._respond('GET')
+
+        def do_POST(self):
+            self._respond('POST')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
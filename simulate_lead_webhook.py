@@ -0,0 +1,72 @@
+"""
+Post a signed sample 'leadgen' notification to a running lead webhook receiver
+(python -m src.lead_webhook), like Meta does when a lead form is submitted
+
+Usage:
+    python simulate_lead_webhook.py <leadgen_id> <page_id> [form_id] [--url http://127.0.0.1:8765]
+"""
+import argparse
+import json
+import sys
+import os
+import time
+from typing import Optional, Tuple
+sys.path.append(os.path.dirname(__file__))
+
+import requests
+from config import Config
+from src.lead_webhook import DEFAULT_WEBHOOK_PORT, sign_payload
+
+
+def make_notification(leadgen_id: str, page_id: str, form_id: Optional[str] = None) -> dict:
+    """Notification payload in the format of Meta's page webhooks"""
+    now = int(time.time())
+    return {
+        'object': 'page',
+        'entry': [{
+            'id': page_id,
+            'time': now,
+            'changes': [{
+                'field': 'leadgen',
+                'value': {'leadgen_id': leadgen_id, 'page_id': page_id, 'form_id': form_id, 'created_time': now},
+            }],
+        }],
+    }
+
+
+def post_notification(url: str, app_secret: str, payload: dict, signature: Optional[str] = None) -> Tuple[int, str]:
+    """
+    Post a notification signed with the app secret
+
+    Args:
+        url: Receiver URL
+        app_secret: Meta app secret (the receiver's META_APP_SECRET)
+        payload: Notification payload
+        signature: Override the X-Hub-Signature-256 header (e.g. to test rejection)
+
+    Returns:
+        (status, response text)
+    """
+    body = json.dumps(payload).encode()
+    response = requests.post(url, data=body, headers={
+        'Content-Type': 'application/json',
+        'X-Hub-Signature-256': signature or sign_payload(body, app_secret),
+    }, timeout=30)
+    return response.status_code, response.text
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Post a sample leadgen webhook notification')
+    parser.add_argument('leadgen_id')
+    parser.add_argument('page_id')
+    parser.add_argument('form_id', nargs='?')
+    parser.add_argument('--url', default=f'http://127.0.0.1:{DEFAULT_WEBHOOK_PORT}')
+    args = parser.parse_args()
+
+    app_secret = Config.get('META_APP_SECRET')
+    if not app_secret:
+        print("❌ META_APP_SECRET not found in .env!")
+        sys.exit(1)
+
+    status, text = post_notification(args.url, app_secret, make_notification(args.leadgen_id, args.page_id, args.form_id))
+    print(f"{'✅' if status == 200 else '❌'} {status} {text}")
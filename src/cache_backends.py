@@ -0,0 +1,390 @@
+"""
+Cache Backends
+Storage formats for the DataFrame cache of MetaAdsClient (JSON or Parquet)
+"""
+import os
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TEMP_SUFFIX = '.tmp'
+
+
+@contextmanager
+def atomic_path(path: str) -> Iterator[str]:
+    """
+    Temporary path that replaces path (os.replace) once the block succeeds
+
+    Readers - also in other processes - see either the old or the new file,
+    never a partially written one. The temporary file is unique per process
+    and thread and is removed if writing fails.
+
+    Args:
+        path: Final file path
+
+    Yields:
+        Temporary path in the same directory to write to
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}{TEMP_SUFFIX}"
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class JsonCacheBackend:
+    """Legacy format: {'timestamp': ..., 'data': [records]} as JSON"""
+
+    extension = '.json'
+
+    def save(self, path: str, df: pd.DataFrame, timestamp: datetime) -> None:
+        """
+        Write DataFrame to cache file
+
+        Args:
+            path: Cache file path
+            df: DataFrame to store
+            timestamp: Time the data was fetched
+        """
+        cache_data = {
+            'timestamp': timestamp.isoformat(),
+            'data': df.to_dict('records')
+        }
+        with open(path, 'w') as f:
+            json.dump(cache_data, f, indent=2)
+
+    def save_batches(self, path: str, batches: Iterable[pd.DataFrame], timestamp: datetime) -> int:
+        """
+        Write DataFrame batches to one cache file without holding them all in memory
+
+        Args:
+            path: Cache file path
+            batches: DataFrames with the same columns (consumed one by one)
+            timestamp: Time the data was fetched
+
+        Returns:
+            Number of rows written
+        """
+        rows = 0
+        with open(path, 'w') as f:
+            f.write(f'{{"timestamp": {json.dumps(timestamp.isoformat())}, "data": [')
+            for df in batches:
+                for record in df.to_dict('records'):
+                    f.write((',\n' if rows else '\n') + json.dumps(record))
+                    rows += 1
+            f.write('\n]}')
+        return rows
+
+    def load(self, path: str) -> Tuple[datetime, pd.DataFrame]:
+        """
+        Read cache file
+
+        Args:
+            path: Cache file path
+
+        Returns:
+            Tuple of (fetch timestamp, DataFrame)
+        """
+        with open(path, 'r') as f:
+            cached_data = json.load(f)
+
+        return datetime.fromisoformat(cached_data['timestamp']), pd.DataFrame(cached_data['data'])
+
+
+class ParquetCacheBackend:
+    """
+    Columnar format: compressed Parquet with nested Meta action lists
+    stored as list<struct> columns and dtypes preserved
+    """
+
+    extension = '.parquet'
+    compression = 'zstd'
+
+    def save(self, path: str, df: pd.DataFrame, timestamp: datetime) -> None:
+        """
+        Write DataFrame to cache file
+
+        Args:
+            path: Cache file path
+            df: DataFrame to store
+            timestamp: Time the data was fetched
+        """
+        table, json_columns = self._to_table(df)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b'cache_timestamp'] = timestamp.isoformat().encode()
+        metadata[b'json_columns'] = json.dumps(json_columns).encode()
+        pq.write_table(table.replace_schema_metadata(metadata), path, compression=self.compression)
+
+    def save_batches(self, path: str, batches: Iterable[pd.DataFrame], timestamp: datetime) -> int:
+        """
+        Write DataFrame batches to one cache file without holding them all in memory
+
+        Every batch becomes a row group. The file schema is fixed by the first
+        batch: nested columns are stored JSON-encoded, categories as strings and
+        numbers widened to 64 bit so later batches always fit. Columns missing
+        in a later batch are written as nulls, unknown extra columns are dropped.
+
+        Args:
+            path: Cache file path
+            batches: DataFrames with the same columns (consumed one by one)
+            timestamp: Time the data was fetched
+
+        Returns:
+            Number of rows written
+        """
+        writer = None
+        schema = None
+        json_columns = []
+        rows = 0
+
+        try:
+            for df in batches:
+                if df.empty:
+                    continue
+
+                if writer is None:
+                    json_columns = [
+                        column for column in df.columns
+                        if df[column].dtype == object and df[column].map(lambda value: isinstance(value, (list, dict))).any()
+                    ]
+                    table = pa.Table.from_pandas(_stream_frame(df, json_columns), preserve_index=False)
+                    schema = pa.schema(
+                        [pa.field(field.name, _stream_type(field.type)) for field in table.schema],
+                        metadata={
+                            b'cache_timestamp': timestamp.isoformat().encode(),
+                            b'json_columns': json.dumps(json_columns).encode(),
+                        }
+                    )
+                    writer = pq.ParquetWriter(path, schema, compression=self.compression)
+                else:
+                    extra = [column for column in df.columns if column not in schema.names]
+                    if extra:
+                        logger.warning(f"Dropping columns not in the first batch: {', '.join(map(str, extra))}")
+
+                frame = _stream_frame(df.reindex(columns=schema.names), json_columns)
+                writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if writer is None:
+            self.save(path, pd.DataFrame(), timestamp)
+        return rows
+
+    def load(self, path: str) -> Tuple[datetime, pd.DataFrame]:
+        """
+        Read cache file
+
+        Args:
+            path: Cache file path
+
+        Returns:
+            Tuple of (fetch timestamp, DataFrame)
+        """
+        # One open file: read by path, pyarrow reopens it for the footer and the
+        # data and could see two different files across a concurrent rename
+        with open(path, 'rb') as f:
+            table = pq.read_table(f)
+        metadata = table.schema.metadata or {}
+        timestamp = datetime.fromisoformat(metadata[b'cache_timestamp'].decode())
+        json_columns = json.loads(metadata.get(b'json_columns', b'[]'))
+
+        # Nested columns would come back as numpy arrays - convert them separately
+        # to plain Python lists of dicts like the JSON backend returns
+        nested = [
+            field.name for field in table.schema
+            if pa.types.is_list(field.type) or pa.types.is_large_list(field.type)
+        ]
+        df = table.drop_columns(nested).to_pandas()
+
+        for name in nested:
+            column = table.column(name)
+            values = column.to_pylist()
+            # Arrow adds None for struct fields missing in a row - drop those keys again
+            if _has_null_children(column):
+                values = [_strip_none(value) for value in values]
+            df[name] = pd.Series(values, index=df.index, dtype=object)
+
+        df = df[table.column_names]
+
+        for column in json_columns:
+            df[column] = pd.Series(
+                [json.loads(value) if value is not None else None for value in table.column(column).to_pylist()],
+                index=df.index, dtype=object
+            )
+
+        return timestamp, df
+
+    @staticmethod
+    def _to_table(df: pd.DataFrame) -> Tuple[pa.Table, list]:
+        """Convert DataFrame to Arrow, JSON-encoding columns Arrow can't type (mixed types)"""
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False), []
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+
+        df = df.copy()
+        json_columns = []
+        for column in df.columns:
+            if df[column].dtype != object:
+                continue
+            try:
+                pa.array(df[column], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                df[column] = df[column].map(lambda value: json.dumps(value) if _is_present(value) else None)
+                json_columns.append(column)
+
+        return pa.Table.from_pandas(df, preserve_index=False), json_columns
+
+
+def _stream_frame(df: pd.DataFrame, json_columns: list) -> pd.DataFrame:
+    """Batch in the fixed streaming layout (JSON-encoded nested columns, categories as strings)"""
+    frame = df.copy()
+    for column in frame.columns:
+        if isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype(object).where(frame[column].notna(), None)
+    for column in json_columns:
+        frame[column] = frame[column].map(lambda value: json.dumps(value) if _is_present(value) else None)
+    return frame
+
+
+def _stream_type(arrow_type: pa.DataType) -> pa.DataType:
+    """Widen the type of a first-batch column so every later batch can be cast to it"""
+    if pa.types.is_integer(arrow_type):
+        return pa.int64()
+    if pa.types.is_floating(arrow_type):
+        return pa.float64()
+    if pa.types.is_null(arrow_type) or pa.types.is_dictionary(arrow_type):
+        return pa.string()
+    return arrow_type
+
+
+def _is_present(value) -> bool:
+    """True for lists/dicts and non-NaN scalars"""
+    if isinstance(value, (list, dict)):
+        return True
+    return value is not None and not pd.isna(value)
+
+
+def _has_null_children(column: pa.ChunkedArray) -> bool:
+    """True if any nested value of a list column is null (at any depth)"""
+    return any(_has_null_values(chunk.flatten()) for chunk in column.chunks)
+
+
+def _has_null_values(values: pa.Array) -> bool:
+    """True if values or any struct field / list item below them is null"""
+    if values.null_count:
+        return True
+    if pa.types.is_struct(values.type):
+        return any(_has_null_values(field) for field in values.flatten())
+    if pa.types.is_list(values.type) or pa.types.is_large_list(values.type):
+        return _has_null_values(values.flatten())
+    return False
+
+
+def _strip_none(value):
+    """Remove None entries Arrow adds for struct fields missing in a row"""
+    if isinstance(value, list):
+        return [_strip_none(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _strip_none(item) for key, item in value.items() if item is not None}
+    return value
+
+
+CACHE_BACKENDS = {
+    'json': JsonCacheBackend,
+    'parquet': ParquetCacheBackend,
+}
+
+
+def get_cache_backend(cache_format: str):
+    """
+    Get cache backend instance by name
+
+    Args:
+        cache_format: 'json' or 'parquet'
+
+    Returns:
+        Backend instance (falls back to JSON for unknown names)
+    """
+    backend_class = CACHE_BACKENDS.get((cache_format or 'json').lower())
+    if backend_class is None:
+        logger.warning(f"⚠️ Unknown cache format '{cache_format}' - using json")
+        backend_class = JsonCacheBackend
+    return backend_class()
+
+
+def migrate_json_cache(cache_dir: str, target=None) -> int:
+    """
+    Convert all legacy JSON cache entries in a directory to another backend
+
+    Args:
+        cache_dir: Cache directory
+        target: Target backend (default: ParquetCacheBackend)
+
+    Returns:
+        Number of migrated entries
+    """
+    target = target or ParquetCacheBackend()
+    source = JsonCacheBackend()
+    migrated = 0
+
+    for file in os.listdir(cache_dir):
+        if not file.endswith(source.extension):
+            continue
+
+        json_path = os.path.join(cache_dir, file)
+        target_path = json_path[:-len(source.extension)] + target.extension
+        try:
+            timestamp, df = source.load(json_path)
+            with atomic_path(target_path) as temp_path:
+                target.save(temp_path, df, timestamp)
+            os.remove(json_path)
+            migrated += 1
+            logger.info(f"Migrated cache entry {file} -> {os.path.basename(target_path)}")
+        except Exception as e:
+            logger.warning(f"Failed to migrate cache entry {file}: {str(e)}")
+
+    return migrated
+
+
+def load_legacy_entry(path_without_extension: str, target) -> Optional[Tuple[datetime, pd.DataFrame]]:
+    """
+    Load a legacy JSON cache entry and convert it to the target backend in place
+
+    Args:
+        path_without_extension: Cache path without file extension
+        target: Backend the entry is migrated to
+
+    Returns:
+        Tuple of (fetch timestamp, DataFrame) or None if no legacy entry exists
+    """
+    source = JsonCacheBackend()
+    json_path = path_without_extension + source.extension
+    if not os.path.exists(json_path):
+        return None
+
+    timestamp, df = source.load(json_path)
+    try:
+        with atomic_path(path_without_extension + target.extension) as temp_path:
+            target.save(temp_path, df, timestamp)
+        os.remove(json_path)
+        logger.info(f"Migrated legacy cache entry {os.path.basename(json_path)}")
+    except Exception as e:
+        logger.warning(f"Failed to migrate legacy cache entry: {str(e)}")
+
+    return timestamp, df
@@ -0,0 +1,522 @@
+"""
+Cache Manager
+Size-bounded disk cache with TTL per data type and LRU eviction, fronted by an
+in-memory cache of the parsed DataFrames
+"""
+import os
+import time
+import zlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+import pandas as pd
+
+from src.cache_backends import TEMP_SUFFIX, atomic_path, load_legacy_entry
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single process only
+    fcntl = None
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Max total size of all cache entries (200 MB)
+DEFAULT_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Max in-memory size (DataFrame memory_usage) of the parsed entries kept in front of the disk
+DEFAULT_MEMORY_MAX_BYTES = 256 * 1024 * 1024
+
+# Hours an entry stays fresh, by data type (= cache key prefix)
+DEFAULT_CACHE_TTL_HOURS = {
+    'campaigns': 1.0,
+    'ads': 1.0,
+    'leads': 0.25,
+    'breakdowns': 6.0,
+}
+FALLBACK_TTL_HOURS = 1.0
+
+# Stale-while-revalidate: hours past the TTL an entry may still be served while
+# it is refreshed in the background (older entries expire as usual)
+DEFAULT_MAX_STALE_HOURS = 24.0
+
+# Cross-process refresh locks: one lock file per stripe (bounded number of files,
+# two keys rarely share one) in <cache_dir>/.locks
+LOCK_STRIPES = 1024
+LOCK_DIR = '.locks'
+
+# Temp files of writers that died mid-write are removed after this age
+STALE_TEMP_FILE_SECONDS = 3600
+
+# One manager per cache directory and format, shared by all clients of the process
+_cache_managers = {}
+_cache_managers_lock = threading.Lock()
+
+
+def get_data_type(cache_key: str) -> str:
+    """Data type of a cache key ('ads_2024-10-01_2024-10-30' -> 'ads')"""
+    return cache_key.split('_', 1)[0]
+
+
+class CacheManager:
+    """
+    Disk cache index for one directory
+
+    Entry recency is the file modification time (bumped on every hit), so the
+    LRU order survives restarts and is shared with other processes using the
+    same directory.
+
+    Parsed entries are also kept in memory (L1, in front of the files = L2),
+    keyed by cache key plus file mtime and size, so a hit does not re-read and
+    re-parse the file and a file rewritten by another process is reloaded.
+    L1 hands out shallow copies - pandas >= 3 copy-on-write (pinned in
+    requirements.txt) keeps writes by a caller out of the shared frame.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        backend,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ttl_hours: Optional[Dict[str, float]] = None,
+        memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+        prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+    ):
+        """
+        Initialize cache manager
+
+        Args:
+            cache_dir: Cache directory
+            backend: Storage backend (JsonCacheBackend or ParquetCacheBackend)
+            max_bytes: Max total size of all entries before LRU eviction
+            ttl_hours: Hours an entry stays fresh, by data type
+            memory_max_bytes: Max size of the in-memory L1 (0 = disabled)
+            prepare: Applied once to every frame read from a file, before it
+                     is kept in memory (e.g. apply_schema)
+        """
+        self.cache_dir = cache_dir
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.ttl_hours = {**DEFAULT_CACHE_TTL_HOURS, **(ttl_hours or {})}
+        self.memory_max_bytes = memory_max_bytes
+        self.prepare = prepare
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._entries = OrderedDict()  # cache_key -> size in bytes, least recently used first
+        self._total_bytes = 0
+        self._memory = OrderedDict()  # cache_key -> (file version, bytes, cached_time, df), LRU first
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.refresh_index()
+
+    def _path(self, cache_key: str) -> str:
+        """Get cache file path"""
+        return os.path.join(self.cache_dir, f"{cache_key}{self.backend.extension}")
+
+    def refresh_index(self) -> None:
+        """Build the index from the files on disk (oldest access first)"""
+        files = []
+        for file in os.listdir(self.cache_dir):
+            if file.endswith(TEMP_SUFFIX):
+                self._remove_stale_temp_file(os.path.join(self.cache_dir, file))
+                continue
+            if not file.endswith(self.backend.extension):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, file))
+            files.append((stat.st_mtime, file[:-len(self.backend.extension)], stat.st_size))
+
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            for _, cache_key, size in sorted(files):
+                self._entries[cache_key] = size
+                self._total_bytes += size
+
+    @staticmethod
+    def _remove_stale_temp_file(path: str) -> None:
+        """Delete the temp file of a writer that died mid-write (live writers' files are recent)"""
+        try:
+            if time.time() - os.path.getmtime(path) > STALE_TEMP_FILE_SECONDS:
+                os.remove(path)
+                logger.info(f"Removed stale temp file {os.path.basename(path)}")
+        except OSError:
+            pass
+
+    @contextmanager
+    def lock(self, cache_key: str) -> Iterator[bool]:
+        """
+        Advisory lock of one key across processes (fcntl.flock), held while
+        the key is refreshed so other workers wait instead of fetching it too
+
+        Args:
+            cache_key: Cache key
+
+        Yields:
+            True if another process (or thread) held the lock and we waited -
+            the entry may have been written meanwhile
+        """
+        if fcntl is None:
+            yield False
+            return
+
+        lock_dir = os.path.join(self.cache_dir, LOCK_DIR)
+        os.makedirs(lock_dir, exist_ok=True)
+        stripe = zlib.crc32(cache_key.encode()) % LOCK_STRIPES
+        with open(os.path.join(lock_dir, f"{stripe}.lock"), 'a') as handle:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                waited = False
+            except BlockingIOError:
+                logger.info(f"⏳ Waiting for another worker refreshing {cache_key}")
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                waited = True
+            try:
+                yield waited
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _register(self, cache_key: str) -> None:
+        """Add or refresh an entry in the index as most recently used"""
+        size = os.path.getsize(self._path(cache_key))
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(cache_key, 0)
+            self._entries[cache_key] = size
+
+    def _remove(self, cache_key: str) -> None:
+        """Delete an entry from disk, index and memory"""
+        with self._lock:
+            self._total_bytes -= self._entries.pop(cache_key, 0)
+            self._memory_drop(cache_key)
+        try:
+            os.remove(self._path(cache_key))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _file_version(stat: os.stat_result) -> tuple:
+        """Identity of a file's content (changes on every rewrite)"""
+        return stat.st_mtime_ns, stat.st_size
+
+    def _memory_get(self, cache_key: str, version: tuple) -> Optional[Tuple[datetime, pd.DataFrame]]:
+        """Parsed entry from memory if it is of this file version"""
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is None or entry[0] != version:
+                return None
+            self._memory.move_to_end(cache_key)
+            return entry[2], entry[3]
+
+    def _memory_put(self, cache_key: str, version: tuple, cached_time: datetime, df: pd.DataFrame) -> None:
+        """Keep a parsed entry in memory, evicting least recently used ones above memory_max_bytes"""
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.memory_max_bytes:
+            return
+
+        with self._lock:
+            self._memory_drop(cache_key)
+            self._memory[cache_key] = (version, size, cached_time, df)
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_max_bytes:
+                self._memory_drop(next(iter(self._memory)))
+
+    def _memory_drop(self, cache_key: str) -> None:
+        """Forget a parsed entry (caller holds the lock)"""
+        entry = self._memory.pop(cache_key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+
+    def _memory_rekey(self, cache_key: str, version: tuple) -> None:
+        """Follow our own mtime bump of a file whose content did not change"""
+        with self._lock:
+            entry = self._memory.get(cache_key)
+            if entry is not None:
+                self._memory[cache_key] = (version, *entry[1:])
+
+    def ttl_for(self, cache_key: str) -> float:
+        """Hours an entry of this key stays fresh"""
+        return self.ttl_hours.get(get_data_type(cache_key), FALLBACK_TTL_HOURS)
+
+    def get(self, cache_key: str, max_age_hours: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """
+        Load an entry if it exists and is fresh
+
+        Args:
+            cache_key: Cache key
+            max_age_hours: Override the TTL of the entry's data type
+
+        Returns:
+            Cached DataFrame or None (miss)
+        """
+        entry = self.get_entry(cache_key, max_age_hours)
+        return entry[0] if entry is not None else None
+
+    def get_entry(
+        self,
+        cache_key: str,
+        max_age_hours: Optional[float] = None,
+        max_stale_hours: float = 0.0
+    ) -> Optional[Tuple[pd.DataFrame, datetime, bool]]:
+        """
+        Load an entry that is fresh or at most max_stale_hours past its TTL
+
+        Args:
+            cache_key: Cache key
+            max_age_hours: Override the TTL of the entry's data type
+            max_stale_hours: Hours past the TTL the entry may still be returned
+
+        Returns:
+            (DataFrame, time it was cached, stale) or None (miss)
+        """
+        cache_path = self._path(cache_key)
+        max_age = max_age_hours if max_age_hours is not None else self.ttl_for(cache_key)
+        from_memory = False
+
+        try:
+            stat = os.stat(cache_path)
+        except OSError:
+            stat = None
+
+        try:
+            if stat is not None:
+                version = self._file_version(stat)
+                memory = self._memory_get(cache_key, version)
+                if memory is not None:
+                    cached_time, df = memory
+                    from_memory = True
+                else:
+                    cached_time, df = self.backend.load(cache_path)
+                    if self.prepare is not None and not df.empty:
+                        df = self.prepare(df)
+                    if self.memory_max_bytes:
+                        self._memory_put(cache_key, version, cached_time, df)
+            else:
+                # Entry written in legacy JSON format -> convert on first read
+                legacy = None
+                if self.backend.extension != '.json':
+                    legacy = load_legacy_entry(cache_path[:-len(self.backend.extension)], self.backend)
+                if legacy is None:
+                    with self._lock:
+                        self.misses += 1
+                    return None
+                cached_time, df = legacy
+        except Exception as e:
+            logger.warning(f"Failed to load cache: {str(e)}")
+            with self._lock:
+                self.misses += 1
+            return None
+
+        age = datetime.now() - cached_time
+        if age >= timedelta(hours=max_age + max_stale_hours):
+            with self._lock:
+                self.misses += 1
+                self.expirations += 1
+            self._remove(cache_key)
+            logger.info(f"Cache entry {cache_key} expired")
+            return None
+        stale = age >= timedelta(hours=max_age)
+
+        # Bump recency on disk and in the index (memory follows the new mtime
+        # only if the file was not rewritten since it was read)
+        try:
+            unchanged = stat is not None and self._file_version(os.stat(cache_path)) == self._file_version(stat)
+            os.utime(cache_path)
+            self._register(cache_key)
+            if unchanged:
+                self._memory_rekey(cache_key, self._file_version(os.stat(cache_path)))
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+            if from_memory:
+                self.memory_hits += 1
+            if stale:
+                self.stale_hits += 1
+            lookups = self.hits + self.misses
+            l1_rate, l2_rate = self.memory_hits / lookups, (self.hits - self.memory_hits) / lookups
+        logger.info(
+            f"Loaded {cache_key} from {'memory' if from_memory else 'cache'}"
+            f"{f' (stale, cached {cached_time:%H:%M})' if stale else ''} - L1 {l1_rate:.0%} / L2 {l2_rate:.0%} hits"
+        )
+        return df.copy(deep=False), cached_time, stale
+
+    def put(self, cache_key: str, df: pd.DataFrame) -> None:
+        """
+        Store an entry and evict least recently used entries above max_bytes
+
+        The entry is written to a temporary file and renamed over the old one,
+        so readers in other processes never load a truncated file.
+
+        Args:
+            cache_key: Cache key
+            df: DataFrame to store
+        """
+        try:
+            with atomic_path(self._path(cache_key)) as temp_path:
+                self.backend.save(temp_path, df, datetime.now())
+            with self._lock:
+                self._memory_drop(cache_key)
+            self._register(cache_key)
+            logger.info(f"Saved {cache_key} to cache")
+        except Exception as e:
+            logger.error(f"Failed to save cache: {str(e)}")
+            return
+
+        self._evict(keep=cache_key)
+
+    def put_batches(self, cache_key: str, batches: Iterable[pd.DataFrame]) -> int:
+        """
+        Store an entry written batch by batch (constant memory for large pulls)
+
+        Like put(), the batches go to a temporary file that replaces the entry
+        only once the stream is complete, so readers never see a partial entry.
+
+        Args:
+            cache_key: Cache key
+            batches: DataFrames with the same columns (e.g. MetaAdsClient.iter_ad_insights)
+
+        Returns:
+            Number of rows stored
+
+        Raises:
+            Exception: Whatever the batch iterator raised (the entry is left unchanged)
+        """
+        with atomic_path(self._path(cache_key)) as temp_path:
+            rows = self.backend.save_batches(temp_path, batches, datetime.now())
+        with self._lock:
+            self._memory_drop(cache_key)
+
+        self._register(cache_key)
+        logger.info(f"Saved {cache_key} to cache ({rows} rows streamed)")
+        self._evict(keep=cache_key)
+        return rows
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Remove least recently used entries until the cache fits max_bytes"""
+        while True:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes:
+                    return
+                victim = next((key for key in self._entries if key != keep), None)
+                if victim is None:
+                    return
+                self.evictions += 1
+            self._remove(victim)
+            logger.info(f"Evicted {victim} from cache")
+
+    def invalidate(self, data_types: Optional[Iterable[str]] = None) -> int:
+        """
+        Delete entries of some data types
+
+        Args:
+            data_types: Data types to drop (e.g. ['campaigns', 'ads']), None = all
+
+        Returns:
+            Number of deleted entries
+        """
+        data_types = set(data_types) if data_types is not None else None
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if data_types is None or get_data_type(key) in data_types
+            ]
+
+        for key in keys:
+            self._remove(key)
+
+        # Legacy JSON entries are not indexed when another format is active
+        if self.backend.extension != '.json':
+            for file in os.listdir(self.cache_dir):
+                if file.endswith('.json') and (data_types is None or get_data_type(file) in data_types):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, file))
+                    except OSError:
+                        pass
+
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cache entries ({', '.join(sorted(data_types)) if data_types else 'all'})")
+        return len(keys)
+
+    def clear(self) -> int:
+        """Delete all entries"""
+        return self.invalidate(None)
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters
+
+        Returns:
+            Dict with hits (L1 + L2), memory_hits (L1), disk_hits (L2), stale_hits,
+            misses, evictions, expirations, hit rates, entries, bytes and max_bytes,
+            memory_entries, memory_bytes and memory_max_bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.hits - self.memory_hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_hit_rate': self.memory_hits / lookups if lookups else 0.0,
+                'disk_hit_rate': (self.hits - self.memory_hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'memory_max_bytes': self.memory_max_bytes,
+            }
+
+
+def get_cache_manager(
+    cache_dir: str,
+    backend,
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ttl_hours: Optional[Dict[str, float]] = None,
+    memory_max_bytes: int = DEFAULT_MEMORY_MAX_BYTES,
+    prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None
+) -> CacheManager:
+    """
+    Get the process-wide cache manager for a directory and format
+
+    The first call creates the manager; later calls share it (and its counters)
+    and only update the size limits and TTLs.
+
+    Args:
+        cache_dir: Cache directory
+        backend: Storage backend
+        max_bytes: Max total size of all entries
+        ttl_hours: Hours an entry stays fresh, by data type
+        memory_max_bytes: Max size of the in-memory L1
+        prepare: Applied once to every frame read from a file
+
+    Returns:
+        CacheManager instance
+    """
+    key = (os.path.abspath(cache_dir), backend.extension)
+    with _cache_managers_lock:
+        manager = _cache_managers.get(key)
+        if manager is None:
+            manager = CacheManager(cache_dir, backend, max_bytes, ttl_hours, memory_max_bytes, prepare)
+            _cache_managers[key] = manager
+        else:
+            manager.max_bytes = max_bytes
+            manager.memory_max_bytes = memory_max_bytes
+            manager.ttl_hours = {**DEFAULT_CACHE_TTL_HOURS, **(ttl_hours or {})}
+    return manager
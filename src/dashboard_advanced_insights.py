@@ -8,15 +8,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from typing import Dict
-
-
-def extract_leads_from_actions(actions):
-    """Extract leads from actions"""
-    if isinstance(actions, list):
-        for action in actions:
-            if isinstance(action, dict) and action.get('action_type') == 'lead':
-                return int(action.get('value', 0))
-    return 0
+from src.data_processor import DataProcessor
 
 
 def safe_aggregate(df, group_col, agg_dict):
@@ -147,6 +139,7 @@ def render_advanced_insights_professional(meta_client):
         )
 
     with col3:
+        force_refresh = st.checkbox("⚡ Cache ignorieren", value=False, help="Erzwingt frische Daten von Meta API")
         if st.button("🔥 Analysieren", use_container_width=True):
             st.rerun()
 
@@ -157,7 +150,8 @@ def render_advanced_insights_professional(meta_client):
         try:
             insights = meta_client.fetch_comprehensive_insights(
                 days=days,
-                level=level
+                level=level,
+                force_refresh=force_refresh
             )
 
             if not insights or all(df.empty for df in insights.values()):
@@ -172,12 +166,21 @@ def render_advanced_insights_professional(meta_client):
     available_breakdowns = [k for k, v in insights.items() if not v.empty]
     st.success(f"✅ {len(available_breakdowns)} Breakdown-Datensätze geladen!")
 
-    # Extract leads for all dataframes
+    # Timing per breakdown pass (passes run in parallel)
+    timings = getattr(meta_client, 'last_insights_timings', {})
+    if timings:
+        with st.expander("⏱️ Ladezeiten pro Breakdown"):
+            timing_df = pd.DataFrame(
+                [(key, round(seconds, 2)) for key, seconds in timings.items() if key != 'total'],
+                columns=['Breakdown', 'Sekunden']
+            )
+            st.dataframe(timing_df, use_container_width=True, hide_index=True)
+            st.caption(f"Gesamt (parallel): {timings.get('total', 0):.2f}s")
+
+    # Leads are pre-parsed at ingestion (leads_extracted) - fill in for frames without it
     for key in insights:
-        if not insights[key].empty and 'actions' in insights[key].columns:
-            insights[key]['leads_extracted'] = insights[key]['actions'].apply(extract_leads_from_actions)
-        elif not insights[key].empty:
-            insights[key]['leads_extracted'] = 0
+        if not insights[key].empty:
+            DataProcessor.add_action_columns(insights[key])
 
     # Create tabs for each breakdown category
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -199,6 +202,8 @@ def render_advanced_insights_professional(meta_client):
         # AGE
         if 'demographics_age' in insights and not insights['demographics_age'].empty:
             age_df = insights['demographics_age']
+            if 'reach_approximate' in age_df.columns and age_df['reach_approximate'].any():
+                st.caption("ℹ️ Reichweite aus Alter×Geschlecht summiert (Näherung)")
 
             if 'age' in age_df.columns:
                 age_summary = safe_aggregate(
@@ -219,6 +224,8 @@ def render_advanced_insights_professional(meta_client):
         # GENDER
         if 'demographics_gender' in insights and not insights['demographics_gender'].empty:
             gender_df = insights['demographics_gender']
+            if 'reach_approximate' in gender_df.columns and gender_df['reach_approximate'].any():
+                st.caption("ℹ️ Reichweite aus Alter×Geschlecht summiert (Näherung)")
 
             if 'gender' in gender_df.columns:
                 gender_summary = safe_aggregate(
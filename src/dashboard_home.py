@@ -8,18 +8,8 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-
-
-def extract_action_value(actions, action_type):
-    """Extract specific action value from actions list"""
-    if isinstance(actions, list):
-        for action in actions:
-            if isinstance(action, dict) and action.get('action_type') == action_type:
-                try:
-                    return float(action.get('value', 0))
-                except (ValueError, TypeError):
-                    return 0
-    return 0
+from src.data_processor import DataProcessor, extract_numeric_values
+from src.schema import apply_schema
 
 
 def extract_result_value(result_data):
@@ -67,30 +57,6 @@ def safe_int(value, default=0):
         return default
 
 
-def extract_numeric_value(value, default=0):
-    """
-    Extract numeric value from various Meta API formats
-    Handles: lists like [{"value": "123"}], plain numbers, strings
-    """
-    if value is None:
-        return default
-
-    # If it's a list (Meta API format)
-    if isinstance(value, list):
-        if len(value) > 0 and isinstance(value[0], dict):
-            try:
-                return float(value[0].get('value', default))
-            except (ValueError, TypeError, KeyError):
-                return default
-        return default
-
-    # If it's already a number
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return default
-
-
 def render_kpi_card(label, value, delta=None, delta_color="normal", help=None):
     """Render a professional KPI card"""
     st.metric(label=label, value=value, delta=delta, delta_color=delta_color, help=help)
@@ -123,6 +89,7 @@ def render_home_professional(meta_client):
     with col3:
         force_refresh = st.checkbox("⚡ Cache ignorieren", value=False, help="Erzwingt frische Daten von Meta API")
         if st.button("🔄 Aktualisieren", use_container_width=True):
+            meta_client.invalidate_cache(['ads'])
             st.rerun()
 
     st.markdown("---")
@@ -163,18 +130,12 @@ def render_home_professional(meta_client):
             for key, value in list(first_row.items())[:15]:
                 st.write(f"- **{key}**: {type(value).__name__} = {str(value)[:100]}")
 
-    # Convert ALL numeric string fields to actual numbers
-    # Meta API returns numbers as strings, we need to convert them
-    numeric_fields = ['spend', 'impressions', 'reach', 'frequency', 'clicks', 'ctr', 'unique_ctr',
-                     'cpc', 'cpm', 'cpp', 'inline_link_clicks', 'unique_clicks', 'inline_post_engagement']
+    # Numeric fields are converted at ingestion (src/schema.py) - no-op for those frames
+    apply_schema(df)
 
-    for field in numeric_fields:
-        if field in df.columns:
-            df[field] = pd.to_numeric(df[field], errors='coerce').fillna(0)
-
-    # Extract actions (leads)
-    df['leads'] = df['actions'].apply(lambda x: extract_action_value(x, 'lead'))
-    df['link_clicks_action'] = df['actions'].apply(lambda x: extract_action_value(x, 'link_click'))
+    # Actions (leads, link clicks) are pre-parsed at ingestion
+    DataProcessor.add_action_columns(df)
+    df['leads'] = df['leads_extracted']
 
     # =============================================================================
     # SECTION 1: KEY PERFORMANCE INDICATORS (KPIs)
@@ -383,16 +344,17 @@ def render_home_professional(meta_client):
     if has_video_data:
         video_col1, video_col2, video_col3, video_col4, video_col5 = st.columns(5)
 
-        # Extract video metrics
+        # Video metrics: totals per action field from one pass over the nested lists
+        video_fields = [
+            'video_play_actions', 'video_15_sec_watched_actions', 'video_30_sec_watched_actions',
+            'video_thruplay_watched_actions', 'video_p25_watched_actions', 'video_p50_watched_actions',
+            'video_p75_watched_actions', 'video_p95_watched_actions', 'video_p100_watched_actions',
+        ]
+        video_totals = DataProcessor.build_actions_table(df, fields=video_fields) \
+            .groupby('field', observed=True)['value'].sum()
+
         def extract_video_metric(df, column_name):
-            total = 0
-            if column_name in df.columns:
-                for actions in df[column_name]:
-                    if isinstance(actions, list):
-                        for action in actions:
-                            if isinstance(action, dict):
-                                total += float(action.get('value', 0))
-            return total
+            return float(video_totals.get(column_name, 0))
 
         video_plays = extract_video_metric(df, 'video_play_actions')
         video_3s = extract_video_metric(df, 'video_play_actions')  # 3sec plays
@@ -527,7 +489,7 @@ def render_home_professional(meta_client):
 
         for col in numeric_columns:
             if col in df_clean.columns:
-                df_clean[col] = df_clean[col].apply(extract_numeric_value)
+                df_clean[col] = extract_numeric_values(df_clean[col])
 
         campaign_summary = df_clean.groupby('campaign_name').agg({
             'spend': 'sum',
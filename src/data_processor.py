@@ -2,14 +2,152 @@
 Data Processor
 Utilities for calculating metrics, detecting issues, and formatting data
 """
+import json
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
+from config import Config
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Base counts that can be summed across days or objects
+# (reach is NOT additive - summing it gives an upper bound, see aggregate_daily_insights)
+ADDITIVE_METRICS = [
+    'spend', 'impressions', 'reach', 'clicks', 'unique_clicks',
+    'inline_link_clicks', 'unique_inline_link_clicks', 'inline_post_engagement',
+]
+
+# Ratio metrics recomputed from summed base counts: metric -> (numerator, denominator, factor)
+RATIO_METRICS = {
+    'ctr': ('clicks', 'impressions', 100),
+    'cpm': ('spend', 'impressions', 1000),
+    'cpc': ('spend', 'clicks', 1),
+    'cpp': ('spend', 'reach', 1000),
+    'frequency': ('impressions', 'reach', 1),
+    'unique_ctr': ('unique_clicks', 'reach', 100),
+    'inline_link_click_ctr': ('inline_link_clicks', 'impressions', 100),
+    'unique_inline_link_click_ctr': ('unique_inline_link_clicks', 'reach', 100),
+    'cost_per_inline_link_click': ('spend', 'inline_link_clicks', 1),
+    'cost_per_unique_click': ('spend', 'unique_clicks', 1),
+    'cost_per_unique_inline_link_click': ('spend', 'unique_inline_link_clicks', 1),
+    'cost_per_inline_post_engagement': ('spend', 'inline_post_engagement', 1),
+}
+
+# Meta action lists ([{"action_type": ..., "value": ...}]) summed per action_type
+ACTION_LIST_FIELDS = [
+    'actions', 'unique_actions',
+    'video_play_actions', 'video_thruplay_watched_actions',
+    'video_15_sec_watched_actions', 'video_30_sec_watched_actions',
+    'video_p25_watched_actions', 'video_p50_watched_actions', 'video_p75_watched_actions',
+    'video_p95_watched_actions', 'video_p100_watched_actions',
+]
+
+# All nested Meta fields holding [{"action_type": ..., "value": ...}] lists
+ACTION_TYPED_FIELDS = ACTION_LIST_FIELDS + [
+    'cost_per_action_type', 'cost_per_unique_action_type',
+    'video_avg_time_watched_actions', 'video_continuous_2_sec_watched_actions',
+]
+
+# Meta result lists ([{"indicator": "actions:lead", "values": [{"value": ...}]}]): results
+# are summed per indicator across days, cost per result and result rate are recomputed
+# from the summed results: field -> (numerator, denominator, factor)
+RESULT_RATIO_FIELDS = {
+    'cost_per_result': ('spend', 'results', 1),
+    'result_rate': ('results', 'impressions', 100),
+}
+
+# Per-action-type costs and rates recomputed from summed counts for the action types
+# the daily rows reported: field -> (numerator, denominator, factor)
+ACTION_RATIO_FIELDS = {
+    'cost_per_unique_action_type': ('spend', 'unique_actions', 1),
+    'cost_per_thruplay': ('spend', 'video_thruplay_watched_actions', 1),
+    'cost_per_15_sec_video_view': ('spend', 'video_15_sec_watched_actions', 1),
+    'website_ctr': ('actions', 'impressions', 100),
+}
+
+# Scalar rates of one action type: metric -> (action list field, action_type, denominator, factor)
+ACTION_TYPE_RATE_METRICS = {
+    'unique_link_clicks_ctr': ('unique_actions', 'link_click', 'reach', 100),
+}
+
+# Action lists only summed when daily rows are aggregated
+DAILY_SUMMED_LIST_FIELDS = ['video_continuous_2_sec_watched_actions']
+
+# Averages, curves and per-impression rates whose counts Meta does not return -
+# they cannot be rebuilt from daily rows and are dropped on aggregation
+NON_AGGREGATABLE_FIELDS = [
+    'video_avg_time_watched_actions', 'video_play_curve_actions', 'video_view_per_impression',
+    'link_clicks_per_results', 'unique_video_view_15_sec',
+]
+
+# Numeric columns added at ingestion: column -> (field, action_type)
+ACTION_VALUE_COLUMNS = {
+    'leads_extracted': ('actions', 'lead'),
+    'link_clicks_action': ('actions', 'link_click'),
+    'video_plays_3s': ('video_play_actions', 'video_view'),
+    'thru_plays': ('video_thruplay_watched_actions', 'video_view'),
+    'video_15s_views': ('video_15_sec_watched_actions', 'video_view'),
+    'video_30s_views': ('video_30_sec_watched_actions', 'video_view'),
+}
+
+# Ad-level metrics derived at ingestion, recomputed from summed counts on rollups
+DERIVED_RATIO_METRICS = {
+    'cpl': ('spend', 'leads_extracted', 1),
+    'hook_rate': ('video_plays_3s', 'impressions', 100),
+    'hold_rate': ('thru_plays', 'video_plays_3s', 100),
+}
+
+# Rollup of ad-level rows: level -> (group column, descriptive columns kept per group)
+ROLLUP_LEVELS = {
+    'adset': ('adset_id', [
+        'adset_name', 'campaign_id', 'campaign_name', 'account_id', 'account_name',
+        'account_currency', 'objective', 'optimization_goal', 'buying_type',
+    ]),
+    'campaign': ('campaign_id', [
+        'campaign_name', 'account_id', 'account_name', 'account_currency', 'objective', 'buying_type',
+    ]),
+    'account': ('account_id', ['account_name', 'account_currency']),
+}
+
+# Person-deduplicated counts - only approximately additive across breakdown values
+REACH_TYPE_METRICS = ['reach', 'unique_clicks', 'unique_inline_link_clicks']
+
+# Reach counts unique people, so it is not additive across ads (overlapping audiences):
+# 'upper_bound' = sum of the ads' reach (default, people reached by several ads count twice)
+# 'lower_bound' = reach of the biggest ad
+# 'exact'       = reach from a separate level query (see MetaAdsClient.fetch_level_reach)
+REACH_STRATEGIES = ('upper_bound', 'lower_bound', 'exact')
+
+# Performance score (0-100): base score plus points per metric. Rules of a metric are
+# checked in order, the first matching (operator, threshold, points) counts.
+# only_positive: metric is only scored when > 0 (no leads -> no CPL score)
+SCORE_BASE = 50
+DEFAULT_SCORE_THRESHOLDS = {
+    'cpl': {
+        'rules': [('<', 5, 20), ('<', 8, 10), ('>', 15, -20), ('>', 10, -10)],
+        'only_positive': True,
+    },
+    'hook_rate': {
+        'rules': [('>', 25, 15), ('>', 15, 10), ('<', 10, -10)],
+    },
+    'hold_rate': {
+        'rules': [('>', 50, 10), ('>', 30, 5), ('<', 20, -5)],
+    },
+    'frequency': {
+        'rules': [('>', 8, -15), ('>', 6, -10), ('<', 2, 5)],
+    },
+}
+
+SCORE_OPERATORS = {
+    '<': np.less,
+    '<=': np.less_equal,
+    '>': np.greater,
+    '>=': np.greater_equal,
+}
+
 
 def extract_numeric_value(value, default=0):
     """
@@ -35,6 +173,68 @@ def extract_numeric_value(value, default=0):
         return default
 
 
+def extract_numeric_values(series: pd.Series, default=0) -> pd.Series:
+    """
+    Vectorized extract_numeric_value for a whole column (same results)
+
+    Numbers and numeric strings are converted in bulk by numpy (which uses
+    float() per value, unlike pd.to_numeric's parser). Columns holding Meta
+    lists like [{"value": "123"}] or invalid strings fall back to
+    extract_numeric_value per value.
+    """
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.astype(np.float64)
+
+    values = series.to_numpy(dtype=object)
+    try:
+        result = values.astype(np.float64)
+    except (ValueError, TypeError):
+        result = np.fromiter((extract_numeric_value(value, default) for value in values), np.float64, len(values))
+    else:
+        # numpy turns None into NaN - extract_numeric_value decides for missing values
+        for i in np.flatnonzero(pd.isna(values)):
+            result[i] = extract_numeric_value(values[i], default)
+
+    return pd.Series(result, index=series.index, name=series.name)
+
+
+def round_like_python(values: np.ndarray, decimals: int = 2) -> np.ndarray:
+    """
+    np.round with the results of Python's round()
+
+    np.round scales by 10**decimals first, which can flip values sitting right
+    at a .5 boundary - those few are re-rounded with round().
+    """
+    rounded = np.round(values, decimals)
+    scaled = values * 10 ** decimals
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < np.maximum(1e-6, np.abs(scaled) * 1e-12)
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), decimals)
+    return rounded
+
+
+def masked_ratio(numerator: pd.Series, denominator: pd.Series, factor: float = 1, decimals: int = 2) -> pd.Series:
+    """
+    round(numerator / denominator * factor, decimals) where denominator > 0, else 0
+
+    Same values (and dtype) as the row-wise apply this replaces: int 0 column
+    if no row has a positive denominator.
+    """
+    num = numerator.to_numpy(dtype=np.float64)
+    den = denominator.to_numpy(dtype=np.float64)
+    valid = den > 0
+
+    if not valid.any():
+        return pd.Series(np.zeros(len(den), dtype=np.int64), index=numerator.index)
+
+    ratio = np.zeros(len(den))
+    if factor == 1:
+        ratio[valid] = round_like_python(num[valid] / den[valid], decimals)
+    else:
+        ratio[valid] = round_like_python(num[valid] / den[valid] * factor, decimals)
+    return pd.Series(ratio, index=numerator.index)
+
+
 class DataProcessor:
     """Process and analyze Meta Ads data"""
 
@@ -56,35 +256,23 @@ class DataProcessor:
         numeric_columns = ['spend', 'leads', 'video_plays_3s', 'impressions', 'thru_plays', 'clicks', 'frequency']
         for col in numeric_columns:
             if col in df.columns:
-                df[col] = df[col].apply(extract_numeric_value)
+                df[col] = extract_numeric_values(df[col])
 
         # Calculate CPL if not present
         if 'cpl' not in df.columns and 'spend' in df.columns and 'leads' in df.columns:
-            df['cpl'] = df.apply(
-                lambda row: round(row['spend'] / row['leads'], 2) if row['leads'] > 0 else 0,
-                axis=1
-            )
+            df['cpl'] = masked_ratio(df['spend'], df['leads'])
 
         # Calculate Hook Rate if video data present
         if 'hook_rate' not in df.columns and 'video_plays_3s' in df.columns and 'impressions' in df.columns:
-            df['hook_rate'] = df.apply(
-                lambda row: round((row['video_plays_3s'] / row['impressions'] * 100), 2) if row['impressions'] > 0 else 0,
-                axis=1
-            )
+            df['hook_rate'] = masked_ratio(df['video_plays_3s'], df['impressions'], 100)
 
         # Calculate Hold Rate if video data present
         if 'hold_rate' not in df.columns and 'thru_plays' in df.columns and 'video_plays_3s' in df.columns:
-            df['hold_rate'] = df.apply(
-                lambda row: round((row['thru_plays'] / row['video_plays_3s'] * 100), 2) if row['video_plays_3s'] > 0 else 0,
-                axis=1
-            )
+            df['hold_rate'] = masked_ratio(df['thru_plays'], df['video_plays_3s'], 100)
 
         # Calculate CTR if clicks data present
         if 'clicks' in df.columns and 'impressions' in df.columns and 'ctr' not in df.columns:
-            df['ctr'] = df.apply(
-                lambda row: round((row['clicks'] / row['impressions'] * 100), 2) if row['impressions'] > 0 else 0,
-                axis=1
-            )
+            df['ctr'] = masked_ratio(df['clicks'], df['impressions'], 100)
 
         return df
 
@@ -104,7 +292,7 @@ class DataProcessor:
 
         if 'frequency' in df.columns:
             # Extract numeric values from frequency column (handles Meta API list format)
-            df['frequency'] = df['frequency'].apply(extract_numeric_value)
+            df['frequency'] = extract_numeric_values(df['frequency'])
 
             df['ad_fatigue'] = df['frequency'] >= frequency_threshold
             df['fatigue_severity'] = df['frequency'].apply(
@@ -177,58 +365,137 @@ class DataProcessor:
         return df_filtered.nsmallest(bottom_n, metric) if not ascending else df_filtered.nlargest(bottom_n, metric)
 
     @staticmethod
-    def calculate_performance_score(row: pd.Series) -> float:
+    def calculate_performance_score(row: pd.Series, thresholds: Optional[Dict] = None) -> float:
         """
         Calculate overall performance score (0-100)
 
         Args:
             row: DataFrame row with metrics
+            thresholds: Threshold table (default: DEFAULT_SCORE_THRESHOLDS)
 
         Returns:
             Performance score
         """
-        score = 50  # Base score
-
-        # CPL scoring (lower is better)
-        if 'cpl' in row and row['cpl'] > 0:
-            if row['cpl'] < 5:
-                score += 20
-            elif row['cpl'] < 8:
-                score += 10
-            elif row['cpl'] > 15:
-                score -= 20
-            elif row['cpl'] > 10:
-                score -= 10
-
-        # Hook rate scoring
-        if 'hook_rate' in row:
-            if row['hook_rate'] > 25:
-                score += 15
-            elif row['hook_rate'] > 15:
-                score += 10
-            elif row['hook_rate'] < 10:
-                score -= 10
-
-        # Hold rate scoring
-        if 'hold_rate' in row:
-            if row['hold_rate'] > 50:
-                score += 10
-            elif row['hold_rate'] > 30:
-                score += 5
-            elif row['hold_rate'] < 20:
-                score -= 5
-
-        # Frequency penalty
-        if 'frequency' in row:
-            if row['frequency'] > 8:
-                score -= 15
-            elif row['frequency'] > 6:
-                score -= 10
-            elif row['frequency'] < 2:
-                score += 5
+        score = SCORE_BASE
+
+        for metric, table in (thresholds or DEFAULT_SCORE_THRESHOLDS).items():
+            if metric not in row:
+                continue
+            value = row[metric]
+            if table.get('only_positive') and not value > 0:
+                continue
+            for operator, threshold, points in table['rules']:
+                if SCORE_OPERATORS[operator](value, threshold):
+                    score += points
+                    break
 
         return max(0, min(100, score))
 
+    @staticmethod
+    def calculate_performance_scores(df: pd.DataFrame, thresholds: Optional[Dict] = None) -> pd.Series:
+        """
+        Vectorized calculate_performance_score for a whole frame (same scores)
+
+        Args:
+            df: DataFrame with metrics (cpl, hook_rate, hold_rate, frequency)
+            thresholds: Threshold table (default: DEFAULT_SCORE_THRESHOLDS)
+
+        Returns:
+            Series with performance score per row
+        """
+        score = np.full(len(df), SCORE_BASE, dtype=np.int64)
+
+        for metric, table in (thresholds or DEFAULT_SCORE_THRESHOLDS).items():
+            if metric not in df.columns:
+                continue
+            values = df[metric].to_numpy(dtype=np.float64)
+
+            # First matching rule wins, like the if/elif chain
+            points = np.select(
+                [SCORE_OPERATORS[operator](values, threshold) for operator, threshold, _ in table['rules']],
+                [rule_points for _, _, rule_points in table['rules']],
+                default=0
+            )
+            if table.get('only_positive'):
+                points = np.where(values > 0, points, 0)
+            score += points.astype(np.int64)
+
+        return pd.Series(np.clip(score, 0, 100), index=df.index, name='performance_score')
+
+    @staticmethod
+    def score_thresholds_for(account_id: Optional[str] = None) -> Dict:
+        """
+        Get the performance score thresholds of an ad account
+
+        META_SCORE_THRESHOLDS (JSON or secrets table) overrides the defaults per metric,
+        either for all accounts ({"cpl": {...}}) or per account ({"act_123": {"cpl": {...}}}).
+        A metric whose merged table is malformed (no rules, a rule that isn't an
+        (operator, threshold, points) triple, unknown operator) keeps its default
+        table - or is dropped if it has none - with a warning.
+
+        Args:
+            account_id: Ad account ID (format: act_XXXXX)
+
+        Returns:
+            Threshold table
+        """
+        thresholds = {metric: dict(table) for metric, table in DEFAULT_SCORE_THRESHOLDS.items()}
+
+        overrides = Config.get('META_SCORE_THRESHOLDS')
+        if not overrides:
+            return thresholds
+
+        try:
+            if isinstance(overrides, str):
+                overrides = json.loads(overrides)
+            overrides = dict(overrides)
+            if account_id and account_id in overrides:
+                overrides = dict(overrides[account_id])
+            elif any(key.startswith('act_') for key in overrides):
+                return thresholds  # Per-account table without entry for this account
+
+            merged = {}
+            for metric, table in overrides.items():
+                merged[metric] = {**thresholds.get(metric, {}), **dict(table)}
+        except Exception as e:
+            logger.warning(f"⚠️ Invalid META_SCORE_THRESHOLDS - using defaults: {str(e)}")
+            return {metric: dict(table) for metric, table in DEFAULT_SCORE_THRESHOLDS.items()}
+
+        for metric, table in merged.items():
+            try:
+                DataProcessor._check_score_table(table)
+                thresholds[metric] = table
+            except ValueError as e:
+                fallback = 'using defaults' if metric in DEFAULT_SCORE_THRESHOLDS else 'ignoring it'
+                logger.warning(f"⚠️ Invalid META_SCORE_THRESHOLDS entry '{metric}' - {fallback}: {str(e)}")
+
+        return thresholds
+
+    @staticmethod
+    def _check_score_table(table: Dict) -> None:
+        """
+        Validate a threshold table of one metric
+
+        Args:
+            table: {'rules': [(operator, threshold, points), ...], 'only_positive': ...}
+
+        Raises:
+            ValueError: If calculate_performance_scores could not use the table
+        """
+        rules = table.get('rules')
+        if not isinstance(rules, (list, tuple)) or not rules:
+            raise ValueError("missing 'rules'")
+        for rule in rules:
+            if not isinstance(rule, (list, tuple)) or len(rule) != 3:
+                raise ValueError(f"rule {rule!r} is not an (operator, threshold, points) triple")
+            operator, threshold, points = rule
+            if operator not in SCORE_OPERATORS:
+                raise ValueError(f"unknown operator {operator!r} (use {', '.join(SCORE_OPERATORS)})")
+            if isinstance(threshold, bool) or not isinstance(threshold, (int, float)):
+                raise ValueError(f"threshold {threshold!r} is not a number")
+            if isinstance(points, bool) or not isinstance(points, int):
+                raise ValueError(f"points {points!r} are not an integer")
+
     @staticmethod
     def format_currency(value: float, currency: str = '€') -> str:
         """
@@ -352,6 +619,503 @@ class DataProcessor:
 
         return df.resample(period).agg(agg_dict).reset_index()
 
+    @staticmethod
+    def aggregate_daily_insights(df: pd.DataFrame, group_by: str = 'ad_id') -> pd.DataFrame:
+        """
+        Aggregate daily insight rows (time_increment=1) into one row per object
+
+        Base counts, action lists and results (per indicator) are summed, ratio
+        metrics (CTR, CPM, frequency, cost per result, result rate, cost per
+        action type, ...) are recomputed from the summed counts instead of
+        averaging daily ratios. Fields without counts to rebuild them from
+        (NON_AGGREGATABLE_FIELDS) are dropped. Reach is not additive across
+        days: the summed value is an upper bound and rows spanning more than
+        one day are flagged with reach_approximate.
+
+        Args:
+            df: Daily insight rows (one row per object and day)
+            group_by: Object ID column to aggregate by
+
+        Returns:
+            DataFrame with one row per object over the whole date range
+        """
+        if df.empty or group_by not in df.columns:
+            return df
+
+        df = df.copy()
+        additive = [col for col in ADDITIVE_METRICS if col in df.columns]
+        for col in additive:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+        grouped = df.groupby(group_by, sort=False)
+        result = grouped[additive].sum()
+
+        # Descriptive fields (names, IDs, rankings, objective): latest day wins
+        recomputed = (
+            set(additive) | set(RATIO_METRICS) | set(ACTION_LIST_FIELDS) | set(DAILY_SUMMED_LIST_FIELDS)
+            | set(RESULT_RATIO_FIELDS) | set(ACTION_RATIO_FIELDS) | set(ACTION_TYPE_RATE_METRICS)
+            | set(NON_AGGREGATABLE_FIELDS) | {'results', 'cost_per_action_type', 'date_start', 'date_stop', group_by}
+        )
+        descriptive = [col for col in df.columns if col not in recomputed]
+        if descriptive:
+            result = result.join(grouped[descriptive].last())
+
+        if 'date_start' in df.columns:
+            result['date_start'] = grouped['date_start'].min()
+        if 'date_stop' in df.columns:
+            result['date_stop'] = grouped['date_stop'].max()
+
+        days_per_object = grouped.size()
+        if 'reach' in result.columns:
+            result['reach_approximate'] = days_per_object > 1
+
+        DataProcessor._recompute_ratios(result, RATIO_METRICS)
+        DataProcessor._sum_action_list_fields(df, result, group_by, ACTION_LIST_FIELDS + DAILY_SUMMED_LIST_FIELDS)
+        DataProcessor._recompute_action_ratios(df, result, group_by)
+        DataProcessor._aggregate_results(df, result, group_by)
+
+        return result.reset_index()
+
+    @staticmethod
+    def rollup(
+        df: pd.DataFrame,
+        level: str,
+        reach_strategy: str = 'upper_bound',
+        exact_reach: Optional[Dict[str, float]] = None
+    ) -> pd.DataFrame:
+        """
+        Roll ad-level rows up to adset, campaign or account level
+
+        Base counts and pre-parsed action columns are summed, action lists are
+        summed per action_type, and ratio metrics (CTR, CPM, CPL, hook rate, ...)
+        are recomputed from the sums instead of averaging the ads' ratios.
+
+        Args:
+            df: Ad-level rows (one row per ad over the range, see fetch_ad_performance)
+            level: 'adset', 'campaign' or 'account' (see ROLLUP_LEVELS)
+            reach_strategy: How to combine the ads' reach (see REACH_STRATEGIES)
+            exact_reach: Reach per group ID for reach_strategy='exact'
+                         (groups without a value fall back to 'upper_bound')
+
+        Returns:
+            DataFrame with one row per group, ad_count, legacy leads column and
+            reach_approximate flag (True where reach is an estimate)
+        """
+        if level not in ROLLUP_LEVELS:
+            raise ValueError(f"Unknown rollup level '{level}' - use one of {', '.join(ROLLUP_LEVELS)}")
+        if reach_strategy not in REACH_STRATEGIES:
+            raise ValueError(f"Unknown reach strategy '{reach_strategy}' - use one of {', '.join(REACH_STRATEGIES)}")
+
+        group_by, descriptive = ROLLUP_LEVELS[level]
+        if df.empty or group_by not in df.columns:
+            return pd.DataFrame()
+
+        df = df.copy()
+        for col in ['date_start', 'date_stop']:
+            if col in df.columns:
+                df[col] = df[col].astype(str)
+
+        grouped, result = DataProcessor._sum_groups(df, group_by, descriptive)
+        if 'date_start' in df.columns:
+            result['date_start'] = grouped['date_start'].min()
+        if 'date_stop' in df.columns:
+            result['date_stop'] = grouped['date_stop'].max()
+
+        ad_count = grouped.size()
+        result['ad_count'] = ad_count
+
+        if 'reach' in result.columns:
+            approximate = ad_count > 1
+            if reach_strategy == 'lower_bound':
+                result['reach'] = grouped['reach'].max()
+            elif reach_strategy == 'exact' and exact_reach:
+                exact = pd.Series(exact_reach, dtype=float).reindex(result.index.astype(str)).to_numpy()
+                known = ~np.isnan(exact)
+                result['reach'] = np.where(known, exact, result['reach']).astype(np.int64)
+                approximate &= ~known
+            result['reach_approximate'] = approximate
+
+        DataProcessor._recompute_ratios(result, {**RATIO_METRICS, **DERIVED_RATIO_METRICS})
+        DataProcessor._sum_action_list_fields(df, result, group_by)
+
+        # Legacy name used by the campaign tables and AI prompts
+        if 'leads_extracted' in result.columns:
+            result['leads'] = result['leads_extracted']
+
+        result = result.reset_index()
+        result[group_by] = result[group_by].astype(str)
+        return result
+
+    @staticmethod
+    def derive_breakdown(
+        df: pd.DataFrame,
+        dimensions: List[str],
+        id_column: Optional[str] = None,
+        reach_df: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """
+        Collapse a multi-dimension breakdown to fewer dimensions (e.g. age x gender -> age)
+
+        Additive metrics and action lists are summed over the dropped dimensions,
+        ratios are recomputed. Reach-type counts (REACH_TYPE_METRICS) are summed
+        as well: the buckets are disjoint (one age and gender per person), but Meta
+        estimates reach per bucket, so the sums only approximate a direct query and
+        rows are flagged with reach_approximate - unless reach_df supplies them.
+        Numeric columns that can't be recomputed from sums are left out.
+
+        Args:
+            df: Breakdown rows (one per object, date range and dimension combination)
+            dimensions: Dimensions to keep (e.g. ['age'])
+            id_column: Object ID column of the level (e.g. 'ad_id')
+            reach_df: Rows of a reach-only pass with exactly these dimensions (optional)
+
+        Returns:
+            DataFrame with one row per object, date range and kept dimension values
+        """
+        if df.empty:
+            return pd.DataFrame()
+
+        keys = [col for col in [id_column, 'date_start', 'date_stop'] if col and col in df.columns] + dimensions
+        df = df.copy()
+        df['_group'] = DataProcessor._group_key(df, keys)
+
+        # Descriptive = IDs, names, dates, dimensions (not numbers or nested lists)
+        skip = set(ACTION_TYPED_FIELDS) | {'_group'}
+        descriptive = [
+            col for col in df.columns
+            if col not in skip and (
+                isinstance(df[col].dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(df[col])
+            )
+        ]
+        descriptive = [col for col in descriptive if col in keys or df.groupby('_group', observed=True)[col].nunique().max() <= 1]
+
+        grouped, result = DataProcessor._sum_groups(df, '_group', descriptive)
+
+        reach_columns = [col for col in REACH_TYPE_METRICS if col in result.columns]
+        if reach_columns:
+            result['reach_approximate'] = grouped.size() > 1
+            if reach_df is not None and not reach_df.empty:
+                exact = reach_df.assign(_group=DataProcessor._group_key(reach_df, keys))
+                exact_columns = [col for col in reach_columns if col in exact.columns]
+                for col in exact_columns:
+                    exact[col] = extract_numeric_values(exact[col]).fillna(0)
+                exact = exact.groupby('_group')[exact_columns].sum().reindex(result.index)
+                known = exact[exact_columns].notna().all(axis=1).to_numpy()
+                for col in exact_columns:
+                    result[col] = np.where(known, exact[col], result[col]).astype(result[col].dtype)
+                result['reach_approximate'] &= ~known
+
+        DataProcessor._recompute_ratios(result, {**RATIO_METRICS, **DERIVED_RATIO_METRICS})
+        DataProcessor._sum_action_list_fields(df, result, '_group')
+
+        return result.reset_index(drop=True)[descriptive + [col for col in result.columns if col not in descriptive]]
+
+    @staticmethod
+    def _group_key(df: pd.DataFrame, keys: List[str]) -> pd.Series:
+        """One string key per row from several columns (for per-group action list sums)"""
+        key = df[keys[0]].astype(str)
+        for col in keys[1:]:
+            key = key + '|' + df[col].astype(str)
+        return key
+
+    @staticmethod
+    def _sum_groups(df: pd.DataFrame, group_by: str, descriptive: List[str]):
+        """
+        Sum additive metrics and pre-parsed action columns per group
+
+        Args:
+            df: Rows to aggregate (additive columns are converted in place)
+            group_by: Group column
+            descriptive: Columns taken from the first row of each group
+
+        Returns:
+            Tuple of (groupby object, result indexed by group_by)
+        """
+        additive = [col for col in ADDITIVE_METRICS + list(ACTION_VALUE_COLUMNS) if col in df.columns]
+        for col in additive:
+            if not pd.api.types.is_numeric_dtype(df[col].dtype):
+                df[col] = extract_numeric_values(df[col]).fillna(0)
+
+        grouped = df.groupby(group_by, sort=False, observed=True)
+        result = grouped[additive].sum()
+
+        descriptive = [col for col in descriptive if col in df.columns and col != group_by]
+        if descriptive:
+            result = result.join(grouped[descriptive].first())
+        return grouped, result
+
+    @staticmethod
+    def _recompute_ratios(result: pd.DataFrame, ratios: Dict[str, Tuple[str, str, float]]) -> None:
+        """Recompute ratio metrics from summed counts (0 where the denominator is 0)"""
+        for metric, (numerator, denominator, factor) in ratios.items():
+            if numerator in result.columns and denominator in result.columns:
+                num = result[numerator].to_numpy(dtype=float)
+                den = result[denominator].to_numpy(dtype=float)
+                result[metric] = np.divide(num * factor, den, out=np.zeros_like(num), where=den > 0)
+
+    @staticmethod
+    def _sum_action_list_fields(
+        df: pd.DataFrame,
+        result: pd.DataFrame,
+        group_by: str,
+        fields: Optional[List[str]] = None
+    ) -> None:
+        """Sum action list fields (default: ACTION_LIST_FIELDS) of df per group into result (indexed by group_by)"""
+        for field in fields or ACTION_LIST_FIELDS:
+            if field in df.columns:
+                result[field] = DataProcessor._sum_action_lists(df, group_by, field).reindex(result.index)
+
+        # Cost per action recomputed from summed spend and summed action counts
+        if 'actions' in result.columns and 'spend' in result.columns:
+            result['cost_per_action_type'] = [
+                [
+                    {'action_type': action['action_type'], 'value': spend / action['value']}
+                    for action in actions if action['value'] > 0
+                ] if isinstance(actions, list) else []
+                for actions, spend in zip(result['actions'], result['spend'])
+            ]
+
+    @staticmethod
+    def _recompute_action_ratios(df: pd.DataFrame, result: pd.DataFrame, group_by: str) -> None:
+        """
+        Recompute per-action-type costs/rates and single action type rates of
+        aggregated rows from the summed spend, impressions, reach and action lists
+
+        Args:
+            df: Rows before aggregation (tells which action types a field reported)
+            result: Aggregated rows indexed by group_by, with summed action lists
+            group_by: Group column
+        """
+        def totals(actions) -> Dict[str, float]:
+            return {action['action_type']: action['value'] for action in actions} if isinstance(actions, list) else {}
+
+        def amounts(column: str) -> list:
+            """Per row: {action_type: value} for action lists, a number for count columns"""
+            if column in ACTION_TYPED_FIELDS:
+                return [totals(actions) for actions in result[column]]
+            return result[column].to_numpy(dtype=float).tolist()
+
+        for field, (numerator, denominator, factor) in ACTION_RATIO_FIELDS.items():
+            if field not in df.columns or numerator not in result.columns or denominator not in result.columns:
+                if field in df.columns:
+                    result.drop(columns=field, inplace=True, errors='ignore')
+                continue
+
+            reported = DataProcessor._sum_action_lists(df, group_by, field).reindex(result.index)
+            rows = []
+            for types, num, den in zip(reported, amounts(numerator), amounts(denominator)):
+                row = []
+                for action in types if isinstance(types, list) else []:
+                    action_type = action['action_type']
+                    top = num.get(action_type, 0) if isinstance(num, dict) else num
+                    bottom = den.get(action_type, 0) if isinstance(den, dict) else den
+                    if bottom > 0:
+                        row.append({'action_type': action_type, 'value': top * factor / bottom})
+                rows.append(row)
+            result[field] = rows
+
+        for metric, (field, action_type, denominator, factor) in ACTION_TYPE_RATE_METRICS.items():
+            if metric not in df.columns:
+                continue
+            if field not in result.columns or denominator not in result.columns:
+                result.drop(columns=metric, inplace=True, errors='ignore')
+                continue
+            counts = np.array([totals(actions).get(action_type, 0) for actions in result[field]], dtype=float)
+            den = result[denominator].to_numpy(dtype=float)
+            result[metric] = np.divide(counts * factor, den, out=np.zeros_like(counts), where=den > 0)
+
+    @staticmethod
+    def _aggregate_results(df: pd.DataFrame, result: pd.DataFrame, group_by: str) -> None:
+        """
+        Sum Meta result lists per object, indicator and attribution windows and
+        recompute the result-based ratios (RESULT_RATIO_FIELDS) from the sums
+
+        Args:
+            df: Rows before aggregation
+            result: Aggregated rows indexed by group_by
+            group_by: Group column
+        """
+        if 'results' not in df.columns:
+            for field in RESULT_RATIO_FIELDS:
+                result.drop(columns=field, inplace=True, errors='ignore')
+            return
+
+        # object -> indicator -> attribution windows -> summed value
+        sums: Dict = {}
+        for object_id, results in zip(df[group_by], df['results']):
+            if not isinstance(results, list):
+                continue
+            for entry in results:
+                if not isinstance(entry, dict):
+                    continue
+                indicators = sums.setdefault(object_id, {}).setdefault(entry.get('indicator', 'unknown'), {})
+                for value in entry.get('values') or []:
+                    windows = tuple(value.get('attribution_windows') or ())
+                    indicators[windows] = indicators.get(windows, 0.0) + extract_numeric_value(value.get('value'))
+
+        def result_list(indicators: Dict, transform) -> List[Dict]:
+            rows = []
+            for indicator, windows in indicators.items():
+                values = []
+                for window, total in windows.items():
+                    value = transform(total)
+                    if value is None:
+                        continue
+                    values.append({'value': value, 'attribution_windows': list(window)} if window else {'value': value})
+                if values:
+                    rows.append({'indicator': indicator, 'values': values})
+            return rows
+
+        per_object = [sums.get(object_id, {}) for object_id in result.index]
+        result['results'] = [result_list(indicators, lambda total: total) for indicators in per_object]
+
+        for field, (numerator, denominator, factor) in RESULT_RATIO_FIELDS.items():
+            if field not in df.columns:
+                continue
+            per_result = denominator == 'results'  # cost per result: spend / results, else results / impressions
+            counterpart = numerator if per_result else denominator
+            if counterpart not in result.columns:
+                result.drop(columns=field, inplace=True, errors='ignore')
+                continue
+
+            def ratio(total: float, amount: float, per_result=per_result, factor=factor) -> Optional[float]:
+                if per_result:
+                    return amount * factor / total if total > 0 else None
+                return total * factor / amount if amount > 0 else None
+
+            result[field] = [
+                result_list(indicators, lambda total, amount=amount: ratio(total, amount))
+                for indicators, amount in zip(per_object, result[counterpart].to_numpy(dtype=float).tolist())
+            ]
+
+    @staticmethod
+    def _sum_action_lists(df: pd.DataFrame, group_by: str, field: str) -> pd.Series:
+        """Sum a Meta action list column per object and action_type"""
+        records = [
+            (object_id, action.get('action_type', 'unknown'), extract_numeric_value([action]))
+            for object_id, actions in zip(df[group_by], df[field])
+            if isinstance(actions, list)
+            for action in actions
+        ]
+        if not records:
+            return pd.Series(dtype=object)
+
+        sums = pd.DataFrame(records, columns=[group_by, 'action_type', 'value']) \
+            .groupby([group_by, 'action_type'], sort=False)['value'].sum()
+
+        lists = {}
+        for (object_id, action_type), value in sums.items():
+            lists.setdefault(object_id, []).append({'action_type': action_type, 'value': value})
+        return pd.Series(lists, dtype=object)
+
+    @staticmethod
+    def build_actions_table(
+        df: pd.DataFrame,
+        id_column: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Explode all nested action lists of a frame into one long table
+
+        Args:
+            df: Insights DataFrame with action list columns
+            id_column: Object ID column (e.g. 'ad_id', 'campaign_id')
+            fields: Action list fields to explode (default: ACTION_TYPED_FIELDS)
+
+        Returns:
+            DataFrame with columns row (index label in df), object_id, date_start,
+            field, action_type and value (float) - one row per action entry
+        """
+        rows, field_names, action_types, values = [], [], [], []
+        for field in fields or ACTION_TYPED_FIELDS:
+            if field not in df.columns:
+                continue
+            for label, actions in zip(df.index, df[field]):
+                if not isinstance(actions, list):
+                    continue
+                for action in actions:
+                    if isinstance(action, dict):
+                        rows.append(label)
+                        field_names.append(field)
+                        action_types.append(action.get('action_type', 'unknown'))
+                        values.append(action.get('value', 0))
+
+        table = pd.DataFrame({
+            'row': pd.Index(rows, dtype=df.index.dtype if rows else np.int64),
+            'object_id': df[id_column].reindex(rows).to_numpy() if id_column in df.columns else None,
+            'date_start': df['date_start'].reindex(rows).to_numpy() if 'date_start' in df.columns else None,
+            'field': pd.Categorical(field_names),
+            'action_type': pd.Categorical(action_types),
+            'value': extract_numeric_values(pd.Series(values, dtype=object)).to_numpy(),
+        })
+        for column in ['object_id', 'date_start']:
+            table[column] = table[column].astype('category')
+        return table
+
+    @staticmethod
+    def pivot_actions(
+        actions_table: pd.DataFrame,
+        field: str = 'actions',
+        action_types: Optional[List[str]] = None,
+        index: Optional[pd.Index] = None,
+        fill_value: Optional[float] = 0
+    ) -> pd.DataFrame:
+        """
+        Wide numbers of one action field: one column per action_type
+
+        Args:
+            actions_table: Long table from build_actions_table
+            field: Action list field (e.g. 'actions', 'cost_per_action_type')
+            action_types: Only these action types (missing ones become fill_value columns)
+            index: Align rows to this index (e.g. the source frame's index)
+            fill_value: Value for rows without that action type (None = NaN)
+
+        Returns:
+            DataFrame indexed by row label of the source frame
+        """
+        selected = actions_table[actions_table['field'] == field]
+        if action_types is not None:
+            selected = selected[selected['action_type'].isin(action_types)]
+
+        wide = selected.groupby(['row', 'action_type'], observed=True, sort=False)['value'].sum().unstack()
+        wide.columns = list(wide.columns)
+
+        if action_types is not None:
+            wide = wide.reindex(columns=action_types)
+        if index is not None:
+            wide = wide.reindex(index)
+        if fill_value is not None:
+            wide = wide.fillna(fill_value)
+        return wide
+
+    @staticmethod
+    def add_action_columns(df: pd.DataFrame, actions_table: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        Ingestion step: add pre-parsed action numbers (ACTION_VALUE_COLUMNS) to a frame
+
+        Pages read these columns instead of walking the action lists on every render.
+
+        Args:
+            df: Insights DataFrame
+            actions_table: Long table of df (built if not given)
+
+        Returns:
+            DataFrame with leads_extracted, link_clicks_action and video count columns
+        """
+        missing = {column: spec for column, spec in ACTION_VALUE_COLUMNS.items() if column not in df.columns}
+        if not missing:
+            return df
+
+        if actions_table is None:
+            actions_table = DataProcessor.build_actions_table(
+                df, fields=sorted({field for field, _ in missing.values()})
+            )
+
+        for column, (field, action_type) in missing.items():
+            wide = DataProcessor.pivot_actions(actions_table, field, [action_type], index=df.index)
+            df[column] = wide[action_type].to_numpy().astype(np.int64)
+        return df
+
     @staticmethod
     def create_summary_stats(df: pd.DataFrame) -> Dict[str, float]:
         """
@@ -0,0 +1,239 @@
+"""
+Graph HTTP Transport
+Raw HTTP access to the Graph insights endpoints (plain dicts instead of SDK objects)
+"""
+import json
+import logging
+import re
+import threading
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from facebook_business.api import FacebookAdsApi
+from facebook_business.exceptions import FacebookRequestError
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+GRAPH_URL = 'https://graph.facebook.com'
+
+# Pooled keep-alive connections per host, shared by all transports of the process
+# (covers the concurrent breakdown passes and lead form workers)
+SESSION_POOL_SIZE = 20
+
+# Seconds to wait for connect / for the response of one page
+REQUEST_TIMEOUT_SECONDS = (10, 300)
+
+# Query params kept out of errors and logs (paging.next URLs carry them too)
+SECRET_PARAMS = ('access_token', 'appsecret_proof')
+_SECRET_PARAM_PATTERN = re.compile(rf"\b({'|'.join(SECRET_PARAMS)})=[^&\s'\"]+")
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """Process-wide pooled session (keep-alive, gzip) for all Graph HTTP calls"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=SESSION_POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _shared_session = session
+        return _shared_session
+
+
+def redact_url(url: str) -> str:
+    """URL without token query params (for request contexts of errors)"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def redact_text(text: str) -> str:
+    """Text (e.g. a requests exception message) with token query param values masked"""
+    return _SECRET_PARAM_PATTERN.sub(r'\1=***', text)
+
+
+class GraphPage:
+    """One parsed Graph response (same headers() accessor as facebook_business.api.FacebookResponse)"""
+
+    __slots__ = ('body', '_headers')
+
+    def __init__(self, body: Dict, headers: Dict):
+        self.body = body
+        self._headers = headers
+
+    def headers(self) -> Dict:
+        return self._headers
+
+
+class GraphHttpTransport:
+    """
+    Graph GET requests over the shared pooled requests.Session
+
+    Pages are parsed with orjson and rows are returned as the plain dicts of
+    the JSON body - the same values dict(AdsInsights) yields, without building
+    an SDK object per row. Errors are raised as FacebookRequestError so
+    callers (and the rate limiter) handle them like SDK errors.
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        graph_url: Optional[str] = None,
+        api_version: Optional[str] = None,
+        scheduler=None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Args:
+            access_token: Meta API access token
+            graph_url: Graph API base URL (default: https://graph.facebook.com)
+            api_version: Graph API version (default: the SDK's version)
+            scheduler: RateLimitScheduler every request runs through (optional)
+            session: HTTP session (default: the process-wide shared session)
+        """
+        self.access_token = access_token
+        self.base_url = f"{(graph_url or GRAPH_URL).rstrip('/')}/{api_version or FacebookAdsApi.API_VERSION}"
+        self.scheduler = scheduler
+
+        self.session = session or get_shared_session()
+        self.requests_sent = 0
+        self._counter_lock = threading.Lock()
+
+    @staticmethod
+    def _encode_params(params: Dict) -> Dict:
+        """Graph query params: lists and maps as JSON (like the SDK does)"""
+        return {
+            key: json.dumps(value) if isinstance(value, (list, dict)) else value
+            for key, value in params.items()
+        }
+
+    def _send(self, url: str, params: Optional[Dict]) -> GraphPage:
+        """
+        One GET request, parsed (raises FacebookRequestError on Graph errors)
+
+        Raised errors never contain the access token: callers log str(error),
+        which includes the request context.
+        """
+        try:
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT_SECONDS)
+        except requests.RequestException as e:
+            # Connection errors quote the full URL, query string included
+            raise type(e)(redact_text(str(e))) from None
+        with self._counter_lock:
+            self.requests_sent += 1
+
+        try:
+            body = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            body = None
+
+        if response.status_code >= 400 or not isinstance(body, dict) or 'error' in body:
+            raise FacebookRequestError(
+                'Call was not successful',
+                {
+                    'method': 'GET',
+                    'path': redact_url(url),
+                    'params': {key: value for key, value in (params or {}).items() if key not in SECRET_PARAMS},
+                },
+                response.status_code,
+                response.headers,
+                response.text
+            )
+        return GraphPage(body, response.headers)
+
+    def _get(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """GET through the rate limit scheduler (if any) and return the body"""
+        if self.scheduler is not None:
+            return self.scheduler.call(self._send, url, params).body
+        return self._send(url, params).body
+
+    def iter_pages(self, path: str, params: Optional[Dict] = None, access_token: Optional[str] = None) -> Iterator[List[Dict]]:
+        """
+        Request an edge and follow paging.next lazily
+
+        Args:
+            path: Node/edge path, e.g. 'act_123/insights'
+            params: Query params of the first page
+            access_token: Token for this request (e.g. a page token), default: the transport's
+
+        Yields:
+            The data list of each page
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        query = {**self._encode_params(params or {}), 'access_token': access_token or self.access_token}
+
+        while url:
+            body = self._get(url, query)
+            yield body.get('data', [])
+
+            # paging.next is a complete URL (query included)
+            url = body.get('paging', {}).get('next')
+            query = None
+
+    def iter_edge(
+        self,
+        path: str,
+        params: Optional[Dict] = None,
+        fields: Optional[List[str]] = None,
+        access_token: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        All rows of an edge across pages
+
+        Args:
+            path: Node/edge path, e.g. '<form_id>/leads'
+            params: Query params
+            fields: Fields to request
+            access_token: Token for this request, default: the transport's
+
+        Yields:
+            One dict per row
+        """
+        params = dict(params or {})
+        if fields:
+            params['fields'] = ','.join(fields)
+
+        for page in self.iter_pages(path, params, access_token):
+            yield from page
+
+    def get_node(self, node_id: str, fields: Optional[List[str]] = None, access_token: Optional[str] = None) -> Dict:
+        """
+        One Graph node (e.g. a single lead or lead form)
+
+        Args:
+            node_id: Graph node ID
+            fields: Fields to request
+            access_token: Token for this request, default: the transport's
+
+        Returns:
+            The node's JSON body
+        """
+        params = {'access_token': access_token or self.access_token}
+        if fields:
+            params['fields'] = ','.join(fields)
+        return self._get(f"{self.base_url}/{node_id}", params)
+
+    def iter_insights(self, object_id: str, params: Optional[Dict] = None, fields: Optional[List[str]] = None) -> Iterator[Dict]:
+        """
+        Insight rows of an object (ad account, campaign, adset, ad or report run)
+
+        Args:
+            object_id: Graph node ID (e.g. 'act_123' or a report_run_id)
+            params: Insights params (time_range, level, breakdowns, limit, ...)
+            fields: Insights fields
+
+        Returns:
+            Lazy iterator of insight row dicts
+        """
+        return self.iter_edge(f"{object_id}/insights", params, fields)
@@ -0,0 +1,120 @@
+"""
+Daily Insights Store
+Day-partitioned storage of ad-level insights for incremental sync
+"""
+import os
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import pandas as pd
+
+from src.cache_backends import atomic_path
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DailyInsightsStore:
+    """One JSON partition per day holding the rows of every ad for that day"""
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Initialize store
+
+        Args:
+            base_dir: Directory for partitions (default: data/cache/daily)
+        """
+        self.base_dir = base_dir or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), 'data', 'cache', 'daily'
+        )
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _partition_path(self, day: str) -> str:
+        """Get partition file path for a day (YYYY-MM-DD)"""
+        return os.path.join(self.base_dir, f"ads_{day}.json")
+
+    def _load_partition(self, day: str) -> Optional[Dict]:
+        """Load raw partition dict or None if missing/corrupt"""
+        path = self._partition_path(day)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load partition {day}: {str(e)}")
+            return None
+
+    def is_final(self, day: str, attribution_window_days: int) -> bool:
+        """
+        Check if a stored partition no longer changes
+
+        A day is final once it was fetched after its attribution window closed,
+        before that Meta may still attribute conversions to it.
+
+        Args:
+            day: Date in YYYY-MM-DD format
+            attribution_window_days: Days after which Meta stops updating a day
+
+        Returns:
+            True if the partition exists and was fetched after the window closed
+        """
+        partition = self._load_partition(day)
+        if partition is None:
+            return False
+
+        fetched_at = datetime.fromisoformat(partition['fetched_at'])
+        window_closed = datetime.strptime(day, '%Y-%m-%d') + timedelta(days=attribution_window_days + 1)
+        return fetched_at >= window_closed
+
+    def save_day(self, day: str, rows: List[Dict]) -> None:
+        """
+        Replace the partition of one day
+
+        Args:
+            day: Date in YYYY-MM-DD format
+            rows: Ad rows of that day (may be empty = no delivery)
+        """
+        partition = {
+            'day': day,
+            'fetched_at': datetime.now().isoformat(),
+            'rows': rows
+        }
+        with atomic_path(self._partition_path(day)) as temp_path:
+            with open(temp_path, 'w') as f:
+                json.dump(partition, f)
+
+    def load_range(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Load all stored rows between two dates (inclusive)
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+
+        Returns:
+            DataFrame with the daily rows of all stored days in the range
+        """
+        rows = []
+        for day in self.days_between(start_date, end_date):
+            partition = self._load_partition(day)
+            if partition is not None:
+                rows.extend(partition['rows'])
+
+        return pd.DataFrame(rows)
+
+    def clear(self) -> None:
+        """Delete all partitions"""
+        for file in os.listdir(self.base_dir):
+            if file.endswith('.json'):
+                os.remove(os.path.join(self.base_dir, file))
+
+    @staticmethod
+    def days_between(start_date: str, end_date: str) -> List[str]:
+        """All dates between start and end (inclusive) as YYYY-MM-DD"""
+        start = datetime.strptime(start_date, '%Y-%m-%d')
+        end = datetime.strptime(end_date, '%Y-%m-%d')
+        return [(start + timedelta(days=i)).strftime('%Y-%m-%d') for i in range((end - start).days + 1)]
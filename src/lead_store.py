@@ -0,0 +1,252 @@
+"""
+Lead Store
+Local SQLite store of lead form submissions with a per-form sync watermark
+"""
+import os
+import json
+import sqlite3
+import logging
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+import pandas as pd
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    lead_id      TEXT PRIMARY KEY,
+    created_ts   INTEGER NOT NULL,  -- unix seconds (UTC)
+    created_time TEXT NOT NULL,     -- 'YYYY-MM-DD HH:MM:SS' (UTC)
+    form_id      TEXT,
+    form_name    TEXT,
+    page_id      TEXT,
+    page_name    TEXT,
+    fields       TEXT               -- JSON {field name: first value}
+);
+CREATE INDEX IF NOT EXISTS idx_leads_created_ts ON leads (created_ts);
+CREATE TABLE IF NOT EXISTS form_watermarks (
+    form_id         TEXT PRIMARY KEY,
+    last_created_ts INTEGER,          -- newest lead seen (NULL = none yet)
+    covered_from_ts INTEGER NOT NULL, -- oldest time synced completely
+    synced_at       TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class LeadStore:
+    """
+    Leads of all forms, deduplicated on lead_id and indexed by created time
+
+    Every form keeps a watermark (newest lead seen) and the oldest time it was
+    synced from, so a sync only needs the leads newer than the watermark.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize store
+
+        Args:
+            db_path: SQLite file (default: data/cache/leads.sqlite3)
+        """
+        self.db_path = db_path or os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), 'data', 'cache', 'leads.sqlite3'
+        )
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')  # concurrent form workers + dashboard readers
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """New connection (one per call - safe across threads)"""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def sync_window(self, form_id: str, since_ts: int) -> int:
+        """
+        Oldest created time a sync of a form has to request
+
+        Args:
+            form_id: Lead form ID
+            since_ts: Oldest time (unix seconds) the caller needs
+
+        Returns:
+            since_ts if the form was never synced that far back, otherwise the
+            watermark (newest lead seen, or the last synced start if it had none)
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT last_created_ts, covered_from_ts FROM form_watermarks WHERE form_id = ?', (form_id,)
+            ).fetchone()
+
+        if row is None or since_ts < row[1]:
+            return since_ts
+        return row[0] if row[0] is not None else row[1]
+
+    def add_form_leads(self, form_id: str, leads: List[Dict], covered_from_ts: int) -> int:
+        """
+        Insert new leads of one form and advance its watermark (one transaction)
+
+        Args:
+            form_id: Lead form ID
+            leads: Lead dicts (lead_id, created_time, form_name, page_id, page_name, fields)
+            covered_from_ts: Oldest time (unix seconds) the synced request covered
+
+        Returns:
+            Number of leads that were not stored yet
+        """
+        records = _to_records(leads, form_id)
+        newest = max((record[1] for record in records), default=None)
+
+        with closing(self._connect()) as conn, conn:
+            inserted = _insert(conn, records)
+
+            conn.execute(
+                """
+                INSERT INTO form_watermarks (form_id, last_created_ts, covered_from_ts, synced_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (form_id) DO UPDATE SET
+                    last_created_ts = MAX(COALESCE(last_created_ts, excluded.last_created_ts), COALESCE(excluded.last_created_ts, last_created_ts)),
+                    covered_from_ts = MIN(covered_from_ts, excluded.covered_from_ts),
+                    synced_at = excluded.synced_at
+                """,
+                (form_id, newest, covered_from_ts, datetime.now().isoformat())
+            )
+
+        return inserted
+
+    def add_leads(self, leads: List[Dict]) -> int:
+        """
+        Insert single leads without touching any watermark (leadgen webhook)
+
+        A pushed lead says nothing about the leads before it, so the next sync
+        still requests everything newer than the form's watermark.
+
+        Args:
+            leads: Lead dicts (lead_id, created_time, form_id, form_name, page_id, page_name, fields)
+
+        Returns:
+            Number of leads that were not stored yet
+        """
+        with closing(self._connect()) as conn, conn:
+            return _insert(conn, _to_records(leads))
+
+    def query(self, since: datetime, until: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Leads created in a time window, newest first
+
+        Args:
+            since: Window start (naive = local time)
+            until: Window end (default: now)
+
+        Returns:
+            DataFrame with lead_id, created_time, form_name, page_name and one
+            column per form field (same layout as MetaAdsClient.fetch_leads_data)
+        """
+        until_ts = int(until.timestamp()) if until else 2 ** 62
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                """
+                SELECT lead_id, created_time, form_name, page_name, fields FROM leads
+                WHERE created_ts BETWEEN ? AND ?
+                ORDER BY created_ts DESC, lead_id
+                """,
+                (int(since.timestamp()), until_ts)
+            ).fetchall()
+
+        return pd.DataFrame([
+            {'lead_id': lead_id, 'created_time': created_time, 'form_name': form_name, 'page_name': page_name, **json.loads(fields)}
+            for lead_id, created_time, form_name, page_name, fields in rows
+        ])
+
+    def _get_state(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        """Value of a sync_state key (None if missing)"""
+        row = conn.execute('SELECT value FROM sync_state WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def mark_synced(self, covered_from_ts: int) -> None:
+        """
+        Record a completed sync of all forms
+
+        Args:
+            covered_from_ts: Oldest time (unix seconds) the sync covered
+        """
+        with closing(self._connect()) as conn, conn:
+            covered = self._get_state(conn, 'covered_from_ts')
+            covered = min(int(covered), covered_from_ts) if covered else covered_from_ts
+            conn.executemany(
+                'INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)',
+                [('last_sync', datetime.now().isoformat()), ('covered_from_ts', str(covered))]
+            )
+
+    def mark_stale(self) -> None:
+        """Force a sync on the next read (watermarks are kept - it stays incremental)"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sync_state WHERE key = 'last_sync'")
+
+    def last_sync(self) -> Optional[datetime]:
+        """Time of the last completed sync (None = never or marked stale)"""
+        with closing(self._connect()) as conn:
+            value = self._get_state(conn, 'last_sync')
+        return datetime.fromisoformat(value) if value else None
+
+    def is_fresh(self, since_ts: int, max_age_hours: float) -> bool:
+        """
+        Check if a window can be served without syncing
+
+        Args:
+            since_ts: Oldest time (unix seconds) the caller needs
+            max_age_hours: Max age of the last sync
+
+        Returns:
+            True if the last sync is recent enough and reached back to since_ts
+        """
+        with closing(self._connect()) as conn:
+            last_sync = self._get_state(conn, 'last_sync')
+            covered = self._get_state(conn, 'covered_from_ts')
+
+        if not last_sync or not covered or int(covered) > since_ts:
+            return False
+        return (datetime.now() - datetime.fromisoformat(last_sync)).total_seconds() < max_age_hours * 3600
+
+    def count(self) -> int:
+        """Number of stored leads"""
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM leads').fetchone()[0]
+
+    def clear(self) -> None:
+        """Delete all leads, watermarks and sync state"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM leads')
+            conn.execute('DELETE FROM form_watermarks')
+            conn.execute('DELETE FROM sync_state')
+
+
+def _to_records(leads: List[Dict], form_id: Optional[str] = None) -> List[tuple]:
+    """Lead dicts -> rows of the leads table (form_id default: the lead's own)"""
+    return [
+        (
+            lead['lead_id'], _to_timestamp(lead['created_time']), lead['created_time'],
+            form_id or lead.get('form_id'), lead.get('form_name'), lead.get('page_id'), lead.get('page_name'),
+            json.dumps(lead.get('fields', {}))
+        )
+        for lead in leads
+    ]
+
+
+def _insert(conn: sqlite3.Connection, records: List[tuple]) -> int:
+    """INSERT OR IGNORE rows of the leads table, returns the number inserted"""
+    before = conn.total_changes
+    conn.executemany('INSERT OR IGNORE INTO leads VALUES (?, ?, ?, ?, ?, ?, ?, ?)', records)
+    return conn.total_changes - before
+
+
+def _to_timestamp(created_time: str) -> int:
+    """'YYYY-MM-DD HH:MM:SS' (UTC, as stored) -> unix seconds"""
+    return int(datetime.strptime(created_time, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc).timestamp())
@@ -0,0 +1,229 @@
+"""
+Lead Webhook Receiver
+Accepts Meta 'leadgen' change notifications and stores each new lead locally
+
+Run next to the dashboard (behind a reverse proxy with TLS) and subscribe the
+callback URL to the page's 'leadgen' field in the Meta app:
+
+    python -m src.lead_webhook --port 8765
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+from config import Config
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEBHOOK_PORT = 8765
+
+# Notifications are small (one entry per page and batch) - larger bodies are rejected
+MAX_BODY_BYTES = 1024 * 1024
+
+
+def sign_payload(body: bytes, app_secret: str) -> str:
+    """X-Hub-Signature-256 header value Meta sends with a payload"""
+    return 'sha256=' + hmac.new(app_secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def leadgen_changes(payload: Dict) -> List[Dict]:
+    """
+    'leadgen' change values of a notification payload
+
+    Args:
+        payload: Parsed notification ({'object': 'page', 'entry': [{'changes': [...]}]})
+
+    Returns:
+        Values with leadgen_id, page_id, form_id, created_time
+    """
+    if payload.get('object') != 'page':
+        return []
+
+    changes = []
+    for entry in payload.get('entry', []):
+        for change in entry.get('changes', []):
+            value = change.get('value') or {}
+            if change.get('field') == 'leadgen' and value.get('leadgen_id'):
+                changes.append({**value, 'page_id': str(value.get('page_id') or entry.get('id'))})
+    return changes
+
+
+class LeadWebhookReceiver:
+    """
+    HTTP endpoint for Meta leadgen webhooks
+
+    GET answers the subscription handshake (hub.challenge), POST verifies the
+    payload signature, fetches every announced lead by ID and appends it to
+    the client's lead store - new leads cost one Graph call each instead of a
+    sync of all forms. A notification whose lead could not be fetched is
+    answered with 500 so Meta delivers it again (the store dedupes on lead_id).
+    """
+
+    def __init__(
+        self,
+        client,
+        app_secret: Optional[str] = None,
+        verify_token: Optional[str] = None,
+        host: str = '127.0.0.1',
+        port: int = DEFAULT_WEBHOOK_PORT
+    ):
+        """
+        Args:
+            client: Initialized MetaAdsClient (Graph access and lead store)
+            app_secret: Meta app secret the payloads are signed with (default: META_APP_SECRET)
+            verify_token: Token of the subscription handshake (default: META_WEBHOOK_VERIFY_TOKEN)
+            host: Interface to listen on
+            port: Port to listen on (0 = any free port)
+
+        Raises:
+            ValueError: If the app secret is missing or the client has no API access
+        """
+        self.client = client
+        self.app_secret = app_secret or Config.get('META_APP_SECRET')
+        self.verify_token = verify_token or Config.get('META_WEBHOOK_VERIFY_TOKEN')
+        if not self.app_secret:
+            raise ValueError("META_APP_SECRET is required to verify webhook signatures")
+        if not client.api_initialized:
+            raise ValueError("Meta API not initialized - leads cannot be fetched")
+
+        self.host = host
+        self.port = port
+        self.stats = {'notifications': 0, 'leads_stored': 0, 'duplicates': 0, 'rejected': 0, 'failed': 0}
+        self._stats_lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += value
+
+    def verify_signature(self, body: bytes, signature: Optional[str]) -> bool:
+        """Check the X-Hub-Signature-256 header against the raw body"""
+        if not signature:
+            return False
+        return hmac.compare_digest(sign_payload(body, self.app_secret), signature)
+
+    def handle_verification(self, params: Dict) -> Tuple[int, str]:
+        """
+        Subscription handshake - echo hub.challenge if the verify token matches
+
+        Returns:
+            (status, plain text body)
+        """
+        if params.get('hub.mode') == 'subscribe' and self.verify_token and params.get('hub.verify_token') == self.verify_token:
+            logger.info("✅ Webhook subscription verified")
+            return 200, params.get('hub.challenge', '')
+
+        self._count('rejected')
+        return 403, 'Forbidden'
+
+    def handle_notification(self, body: bytes, signature: Optional[str]) -> Tuple[int, str]:
+        """
+        Verify a notification and store the leads it announces
+
+        Args:
+            body: Raw request body
+            signature: X-Hub-Signature-256 header
+
+        Returns:
+            (status, plain text body)
+        """
+        if not self.verify_signature(body, signature):
+            self._count('rejected')
+            logger.warning("⚠️ Webhook payload with invalid signature rejected")
+            return 403, 'Invalid signature'
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._count('rejected')
+            return 400, 'Invalid JSON'
+
+        self._count('notifications')
+        failed = 0
+        for change in leadgen_changes(payload):
+            try:
+                lead = self.client.fetch_lead(change['leadgen_id'], change['page_id'], change.get('form_id'))
+            except Exception as e:
+                failed += 1
+                logger.error(f"❌ Failed to fetch lead {change['leadgen_id']}: {str(e)}")
+                continue
+
+            if lead is None:
+                continue
+            inserted = self.client.lead_store.add_leads([lead])
+            self._count('leads_stored', inserted)
+            self._count('duplicates', 1 - inserted)
+            logger.info(f"📥 Lead {lead['lead_id']} from form '{lead['form_name']}' {'stored' if inserted else 'already stored'}")
+
+        if failed:
+            self._count('failed', failed)
+            return 500, 'Lead fetch failed'
+        return 200, 'EVENT_RECEIVED'
+
+    def start(self) -> 'LeadWebhookReceiver':
+        """Serve in a background thread"""
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _make_handler(self))
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"✅ Lead webhook receiver listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+
+def _make_handler(receiver: LeadWebhookReceiver):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status: int, text: str):
+            payload = text.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._reply(*receiver.handle_verification(dict(parse_qsl(urlparse(self.path).query))))
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            if length > MAX_BODY_BYTES:
+                self._reply(413, 'Payload too large')
+                return
+            body = self.rfile.read(length)
+            self._reply(*receiver.handle_notification(body, self.headers.get('X-Hub-Signature-256')))
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+if __name__ == '__main__':
+    from src.meta_ads_client import MetaAdsClient
+
+    parser = argparse.ArgumentParser(description='Receive Meta leadgen webhooks into the local lead store')
+    parser.add_argument('--host', default=Config.get('META_LEAD_WEBHOOK_HOST', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=int(Config.get('META_LEAD_WEBHOOK_PORT', DEFAULT_WEBHOOK_PORT)))
+    args = parser.parse_args()
+
+    receiver = LeadWebhookReceiver(MetaAdsClient(), host=args.host, port=args.port).start()
+    try:
+        receiver._thread.join()
+    except KeyboardInterrupt:
+        receiver.stop()
@@ -4,36 +4,328 @@ Fetches campaign and ad performance data from Facebook Business API
 """
 import os
 import json
+import hashlib
+import time
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 from facebook_business.api import FacebookAdsApi
 from facebook_business.adobjects.adaccount import AdAccount
 from facebook_business.adobjects.campaign import Campaign
 from facebook_business.adobjects.ad import Ad
+from facebook_business.adobjects.adreportrun import AdReportRun
 from facebook_business.adobjects.lead import Lead
 from facebook_business.adobjects.page import Page
 from config import Config
+from src.cache_backends import get_cache_backend, migrate_json_cache
+from src.cache_manager import DEFAULT_CACHE_MAX_BYTES, DEFAULT_CACHE_TTL_HOURS, DEFAULT_MAX_STALE_HOURS, DEFAULT_MEMORY_MAX_BYTES, get_cache_manager
+from src.data_processor import ROLLUP_LEVELS, DataProcessor, extract_numeric_values
+from src.graph_http import GraphHttpTransport, redact_text
+from src.insights_store import DailyInsightsStore
+from src.lead_store import LeadStore
+from src.rate_limiter import DEFAULT_MAX_CONCURRENCY, MAX_RETRIES, get_rate_limiter, is_throttling_error
+from src.schema import apply_schema
+from src.single_flight import get_single_flight
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# NUR die 67 VERIFIZIERTEN Fields die WIRKLICH funktionieren!
+# (getestet mit test_ALL_meta_fields.py)
+AD_INSIGHT_FIELDS = [
+    # IDs & Names & Dates (13 fields)
+    'account_id', 'account_name', 'account_currency',
+    'ad_id', 'ad_name',
+    'adset_id', 'adset_name',
+    'campaign_id', 'campaign_name',
+    'date_start', 'date_stop',
+    'created_time', 'updated_time',
+
+    # Basic Metrics (5 fields)
+    'spend', 'impressions', 'reach', 'frequency', 'clicks',
+
+    # CTR & Engagement (13 fields)
+    'ctr', 'unique_ctr',
+    'inline_link_clicks', 'inline_link_click_ctr',
+    'unique_inline_link_clicks', 'unique_inline_link_click_ctr',
+    'unique_link_clicks_ctr',
+    'unique_clicks',
+    'inline_post_engagement',
+    'website_ctr',
+    'unique_actions',
+    'actions',
+    'result_rate',
+
+    # Costs (13 fields)
+    'cpc', 'cpm', 'cpp',
+    'cost_per_inline_link_click',
+    'cost_per_inline_post_engagement',
+    'cost_per_unique_click',
+    'cost_per_unique_inline_link_click',
+    'cost_per_action_type',
+    'cost_per_unique_action_type',
+    'cost_per_result',
+    'cost_per_thruplay',
+    'cost_per_15_sec_video_view',
+    'link_clicks_per_results',
+
+    # Results & Performance (2 fields)
+    'results',
+    'result_values_performance_indicator',
+
+    # Video Metrics (13 fields)
+    'video_play_actions',
+    'video_play_curve_actions',
+    'video_avg_time_watched_actions',
+    'video_15_sec_watched_actions',
+    'video_30_sec_watched_actions',
+    'video_p25_watched_actions',
+    'video_p50_watched_actions',
+    'video_p75_watched_actions',
+    'video_p95_watched_actions',
+    'video_p100_watched_actions',
+    'video_thruplay_watched_actions',
+    'video_view_per_impression',
+    'unique_video_view_15_sec',
+
+    # Quality & Rankings (3 fields)
+    'quality_ranking',
+    'engagement_rate_ranking',
+    'conversion_rate_ranking',
+
+    # Attribution & Config (5 fields)
+    'attribution_setting',
+    'buying_type',
+    'objective',
+    'optimization_goal',
+    'creative_media_type',
+]
+
+# Rows per page for account-level insights queries (Graph API maximum is 500)
+ACCOUNT_INSIGHTS_PAGE_SIZE = 500
+
+# Transports for insights requests
+# 'sdk'   = one HTTP call per object (facebook_business default)
+# 'batch' = Graph Batch API for per-object requests, up to GRAPH_BATCH_SIZE sub-requests per HTTP call
+# 'http'  = raw HTTP with a pooled session, rows as plain dicts (no SDK objects) - see src/graph_http.py
+INSIGHTS_TRANSPORTS = ('sdk', 'batch', 'http')
+GRAPH_BATCH_SIZE = 50  # Graph API maximum per batch request
+
+# Lead downloads via Pages API (/me/accounts -> /{page}/leadgen_forms -> /{form}/leads)
+LEAD_FIELDS = ['id', 'created_time', 'field_data']
+LEADS_PAGE_SIZE = 500  # Rows per page of the forms and leads edges
+MAX_LEAD_FORM_WORKERS = 8  # Forms downloaded concurrently
+# With the leadgen webhook receiver running (src/lead_webhook.py) new leads are
+# pushed into the lead store; polling is only a safety net for missed notifications
+LEAD_WEBHOOK_RESYNC_HOURS = 24
+
+# Async insights report jobs (is_async) - used for big queries that time out synchronously
+ASYNC_REPORT_MIN_DAYS = 60  # Date ranges with at least this many days run as async job
+ASYNC_REPORT_MIN_ROWS = 20000  # Estimated result rows above this run as async job
+ASYNC_POLL_INITIAL_SECONDS = 1.0
+ASYNC_POLL_MAX_SECONDS = 30.0
+ASYNC_POLL_TIMEOUT_SECONDS = 900
+
+# Incremental daily sync: days Meta may still attribute conversions to (re-pulled on every sync)
+ATTRIBUTION_WINDOW_DAYS = 3
+
+# Assumed number of objects per level until the first fetch tells us the real count
+DEFAULT_OBJECT_COUNT_ESTIMATE = 100
+
+# Approximate number of rows each breakdown value multiplies a result by
+BREAKDOWN_ROW_FACTORS = {
+    'age': 6,
+    'gender': 3,
+    'country': 5,
+    'region': 30,
+    'publisher_platform': 4,
+    'platform_position': 6,
+    'impression_device': 8,
+    'hourly_stats_aggregated_by_advertiser_time_zone': 24,
+}
+
+# Breakdown passes of fetch_comprehensive_insights: (result key, breakdowns, icon, label)
+COMPREHENSIVE_BREAKDOWNS = [
+    ('base', [], '📊', 'Base insights'),
+    ('demographics_age', ['age'], '👥', 'Age demographics'),
+    ('demographics_gender', ['gender'], '👥', 'Gender demographics'),
+    ('demographics_age_gender', ['age', 'gender'], '👥', 'Age+Gender demographics'),
+    ('geographic_country', ['country'], '🌍', 'Country breakdown'),
+    ('geographic_region', ['region'], '🌍', 'Region breakdown'),
+    ('placements', ['publisher_platform', 'platform_position'], '📱', 'Placement breakdown'),
+    ('devices', ['impression_device'], '💻', 'Device breakdown'),  # besser als device_platform
+    ('hourly', ['hourly_stats_aggregated_by_advertiser_time_zone'], '🕐', 'Hourly breakdown'),
+]
+
+# Breakdowns computed locally from another pass: result key -> (source result key, kept dimensions)
+DERIVED_BREAKDOWNS = {
+    'demographics_age': ('demographics_age_gender', ['age']),
+    'demographics_gender': ('demographics_age_gender', ['gender']),
+}
+
+# How fetch_comprehensive_insights gets the DERIVED_BREAKDOWNS:
+# 'fetch'        = own API pass each (legacy)
+# 'derive'       = aggregated from the source pass, reach-type metrics approximate (default)
+# 'derive_exact' = aggregated, plus one reach-only pass each for exact reach
+DEMOGRAPHICS_MODES = ('fetch', 'derive', 'derive_exact')
+
+# Fields of the reach-only passes of 'derive_exact'
+REACH_PASS_FIELDS = ['ad_id', 'adset_id', 'campaign_id', 'date_start', 'date_stop',
+                     'reach', 'unique_clicks', 'unique_inline_link_clicks']
+
+# Action list fields fetch_campaign_data turns into wide actions_* / cost_per_* / video columns
+CAMPAIGN_ACTION_FIELDS = [
+    'actions', 'cost_per_action_type',
+    'video_play_actions', 'video_p25_watched_actions', 'video_p50_watched_actions',
+    'video_p75_watched_actions', 'video_p95_watched_actions', 'video_p100_watched_actions',
+    'video_thruplay_watched_actions', 'video_continuous_2_sec_watched_actions',
+    'video_30_sec_watched_actions', 'video_avg_time_watched_actions',
+]
+
+# Concurrency of fetch_comprehensive_insights
+MAX_BREAKDOWN_WORKERS = len(COMPREHENSIVE_BREAKDOWNS)  # Worker threads per call (one per pass)
+# Process-wide cap per ad account (all sessions). Below the worker count so that
+# one call already queues its passes and a second session doesn't double the load.
+MAX_CONCURRENT_PASSES_PER_ACCOUNT = 4
+
+# Process-wide semaphores capping concurrent insight passes per ad account: account_id -> (limit, semaphore)
+_account_semaphores: Dict[str, Tuple[int, threading.BoundedSemaphore]] = {}
+_account_semaphores_lock = threading.Lock()
+
+
+def _get_account_semaphore(account_id: str, limit: int) -> threading.BoundedSemaphore:
+    """
+    Get the shared concurrency semaphore for an ad account
+
+    The cap is shared by all clients of the account, so the first limit wins
+    for the lifetime of the process; a client asking for another limit gets
+    the existing semaphore and a warning.
+
+    Args:
+        account_id: Ad account ID
+        limit: Concurrent passes allowed for the account
+
+    Returns:
+        Semaphore to hold while a pass talks to the API
+    """
+    with _account_semaphores_lock:
+        if account_id not in _account_semaphores:
+            _account_semaphores[account_id] = (limit, threading.BoundedSemaphore(limit))
+        current_limit, semaphore = _account_semaphores[account_id]
+    if current_limit != limit:
+        logger.warning(
+            f"⚠️ {account_id} already capped at {current_limit} concurrent passes in this process - "
+            f"ignoring limit {limit}"
+        )
+    return semaphore
+
+
+# Cache entries being refreshed in the background (stale-while-revalidate), all sessions
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
 
 class MetaAdsClient:
     """Client for fetching Meta Ads performance data"""
 
-    def __init__(self, access_token: Optional[str] = None, account_id: Optional[str] = None):
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        account_id: Optional[str] = None,
+        graph_url: Optional[str] = None,
+        transport: Optional[str] = None,
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialize Meta Ads API client
 
         Args:
             access_token: Meta API access token
             account_id: Ad account ID (format: act_XXXXX)
+            graph_url: Override Graph API base URL (e.g. local fake server for tests)
+            transport: How insights are requested: 'sdk' (one call per object, default),
+                       'batch' (Graph Batch API, 50 per call) or 'http' (raw HTTP,
+                       no SDK objects per row)
+            cache_dir: Directory of the disk cache, daily partitions and lead
+                       store (default: data/cache, e.g. a temp dir for tests)
         """
         self.access_token = access_token or Config.get('META_ACCESS_TOKEN')
         self.account_id = account_id or Config.get('META_AD_ACCOUNT_ID')
+        self.graph_url = graph_url or Config.get('META_GRAPH_URL')
+
+        self.transport = (transport or Config.get('META_TRANSPORT', 'sdk')).lower()
+        if self.transport not in INSIGHTS_TRANSPORTS:
+            logger.warning(f"⚠️ Unknown transport '{self.transport}' - using 'sdk'")
+            self.transport = 'sdk'
+
+        # Async report job settings
+        self.async_min_days = int(Config.get('META_ASYNC_MIN_DAYS', ASYNC_REPORT_MIN_DAYS))
+        self.async_min_rows = int(Config.get('META_ASYNC_MIN_ROWS', ASYNC_REPORT_MIN_ROWS))
+        self.async_poll_initial = ASYNC_POLL_INITIAL_SECONDS
+        self.async_poll_max = ASYNC_POLL_MAX_SECONDS
+        self.async_poll_timeout = ASYNC_POLL_TIMEOUT_SECONDS
+
+        # Last seen number of objects per level (for row estimation)
+        self._object_counts = {}
+
+        # Concurrency settings for breakdown passes
+        self.max_workers = int(Config.get('META_MAX_WORKERS', MAX_BREAKDOWN_WORKERS))
+        self.max_concurrent_per_account = int(Config.get('META_MAX_CONCURRENT_PER_ACCOUNT', MAX_CONCURRENT_PASSES_PER_ACCOUNT))
+
+        # Seconds per breakdown pass of the last fetch_comprehensive_insights call
+        self.last_insights_timings: Dict[str, float] = {}
+
+        # Disk cache ('json' = legacy indented JSON, 'parquet' = columnar, compressed)
+        # with an in-memory L1 of parsed frames shared by all sessions
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'cache')
+        self.cache_backend = get_cache_backend(Config.get('META_CACHE_FORMAT', 'json'))
+        self.cache = get_cache_manager(
+            self.cache_dir,
+            self.cache_backend,
+            max_bytes=int(Config.get('META_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES)),
+            ttl_hours={
+                data_type: float(Config.get(f'META_CACHE_TTL_{data_type.upper()}_HOURS', hours))
+                for data_type, hours in DEFAULT_CACHE_TTL_HOURS.items()
+            },
+            memory_max_bytes=int(Config.get('META_CACHE_MEMORY_MAX_BYTES', DEFAULT_MEMORY_MAX_BYTES)),
+            prepare=apply_schema  # frames kept in memory are typed once, not on every render
+        )
+
+        # Stale-while-revalidate: expired entries are served at once and refreshed in the background
+        self.stale_while_revalidate = str(Config.get('META_CACHE_STALE_WHILE_REVALIDATE', 'false')).lower() in ('1', 'true', 'yes')
+        self.max_stale_hours = float(Config.get('META_CACHE_MAX_STALE_HOURS', DEFAULT_MAX_STALE_HOURS))
+        self._stale_served: Dict[str, datetime] = {}  # cache_key -> cached time of stale entries served
+        self._stale_served_lock = threading.Lock()
+
+        # Incremental daily sync of ad insights
+        self.incremental_sync = str(Config.get('META_INCREMENTAL_SYNC', 'false')).lower() in ('1', 'true', 'yes')
+        self.attribution_window_days = int(Config.get('META_ATTRIBUTION_WINDOW_DAYS', ATTRIBUTION_WINDOW_DAYS))
+        self.daily_store = DailyInsightsStore(os.path.join(self.cache_dir, 'daily'))
+
+        # Local lead store, synced incrementally per form (see sync_leads)
+        self.lead_store = LeadStore(os.path.join(self.cache_dir, 'leads.sqlite3'))
+        self.lead_webhook = str(Config.get('META_LEAD_WEBHOOK', 'false')).lower() in ('1', 'true', 'yes')
+        self._lead_pages: Dict[str, Dict] = {}  # page_id -> page dict incl. page token (webhook lookups)
+        self._lead_form_names: Dict[str, str] = {}
+        self._lead_lookup_lock = threading.Lock()
+
+        # Usage-header based pacing and retries of throttled calls (shared per ad account)
+        self.rate_limiter = get_rate_limiter(
+            self.account_id or '',
+            max_concurrency=int(Config.get('META_RATE_LIMIT_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)),
+            max_retries=int(Config.get('META_RATE_LIMIT_MAX_RETRIES', MAX_RETRIES))
+        )
+        self.http = None  # Raw HTTP transport (transport 'http' only)
+
+        # Identical concurrent fetches of all sessions run once (see _coalesced)
+        self.single_flight = get_single_flight()
+        self.lead_form_workers = int(Config.get('META_LEAD_FORM_WORKERS', MAX_LEAD_FORM_WORKERS))
 
         if not self.access_token or not self.account_id:
             logger.warning("Meta API credentials not configured")
@@ -41,8 +333,15 @@ class MetaAdsClient:
             return
 
         try:
-            FacebookAdsApi.init(access_token=self.access_token)
+            api = FacebookAdsApi.init(access_token=self.access_token)
+            if self.graph_url:
+                api._session.GRAPH = self.graph_url.rstrip('/')
+            self.rate_limiter.install(api)
             self.account = AdAccount(self.account_id)
+            # Pages API (leads) - own limits, so not paced by the ad account's scheduler
+            self.pages_http = GraphHttpTransport(self.access_token, self.graph_url)
+            if self.transport == 'http':
+                self.http = GraphHttpTransport(self.access_token, self.graph_url, scheduler=self.rate_limiter)
             self.api_initialized = True
             logger.info(f"✅ Meta Ads API initialized for account {self.account_id}")
             logger.info(f"✅ Token length: {len(self.access_token)} chars")
@@ -52,46 +351,335 @@ class MetaAdsClient:
             logger.error(f"❌ Go to https://developers.facebook.com/tools/explorer/ to generate new token")
             self.api_initialized = False
 
-    def _get_cache_path(self, cache_key: str) -> str:
-        """Get cache file path"""
-        cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'cache')
-        os.makedirs(cache_dir, exist_ok=True)
-        return os.path.join(cache_dir, f"{cache_key}.json")
+    def _load_from_cache(
+        self,
+        cache_key: str,
+        max_age_hours: Optional[float] = None,
+        revalidate: Optional[Callable[[], pd.DataFrame]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load data from cache if fresh (default max age = TTL of the key's data type)
 
-    def _load_from_cache(self, cache_key: str, max_age_hours: int = 1) -> Optional[Dict]:
-        """Load data from cache if fresh"""
-        cache_path = self._get_cache_path(cache_key)
+        Args:
+            cache_key: Cache key
+            max_age_hours: Override the TTL
+            revalidate: Fetch that refreshes the entry - with stale-while-revalidate
+                        an expired entry (up to max_stale_hours past the TTL) is
+                        returned and this runs in the background
 
-        if not os.path.exists(cache_path):
-            return None
+        Returns:
+            Cached DataFrame or None (miss)
+        """
+        if revalidate is None or not self.stale_while_revalidate:
+            return self.cache.get(cache_key, max_age_hours)
 
-        try:
-            with open(cache_path, 'r') as f:
-                cached_data = json.load(f)
+        entry = self.cache.get_entry(cache_key, max_age_hours, max_stale_hours=self.max_stale_hours)
+        if entry is None:
+            return None
 
-            cached_time = datetime.fromisoformat(cached_data['timestamp'])
-            if datetime.now() - cached_time < timedelta(hours=max_age_hours):
-                logger.info(f"Loaded {cache_key} from cache")
-                return cached_data['data']
-        except Exception as e:
-            logger.warning(f"Failed to load cache: {str(e)}")
+        df, cached_time, stale = entry
+        if stale:
+            with self._stale_served_lock:
+                self._stale_served[cache_key] = cached_time
+            self._revalidate(cache_key, revalidate)
+        return df
+
+    def _revalidate(self, cache_key: str, fetch: Callable[[], pd.DataFrame]) -> None:
+        """Refresh a stale cache entry in a background thread (once per entry, across sessions)"""
+        key = f"{self.account_id}:{cache_key}"
+        with _revalidating_lock:
+            if key in _revalidating:
+                return
+            _revalidating.add(key)
+
+        def run():
+            try:
+                logger.info(f"🔄 Refreshing stale cache entry {cache_key} in the background")
+                self._coalesced(cache_key, fetch, cached=lambda: self.cache.get(cache_key))
+            except Exception as e:
+                logger.warning(f"⚠️ Background refresh of {cache_key} failed: {str(e)}")
+            finally:
+                with _revalidating_lock:
+                    _revalidating.discard(key)
+
+        threading.Thread(target=run, name=f"revalidate-{cache_key}", daemon=True).start()
+
+    def pop_stale_data_time(self) -> Optional[datetime]:
+        """
+        Oldest cache time of the stale entries served since the last call
 
-        return None
+        Returns:
+            Time the oldest stale entry was cached (None = all data was fresh)
+        """
+        with self._stale_served_lock:
+            oldest = min(self._stale_served.values(), default=None)
+            self._stale_served.clear()
+        return oldest
 
-    def _save_to_cache(self, cache_key: str, data: Dict) -> None:
+    def _save_to_cache(self, cache_key: str, df: pd.DataFrame) -> None:
         """Save data to cache"""
-        cache_path = self._get_cache_path(cache_key)
+        self.cache.put(cache_key, df)
 
-        try:
-            cache_data = {
-                'timestamp': datetime.now().isoformat(),
-                'data': data
-            }
-            with open(cache_path, 'w') as f:
-                json.dump(cache_data, f, indent=2)
-            logger.info(f"Saved {cache_key} to cache")
-        except Exception as e:
-            logger.error(f"Failed to save cache: {str(e)}")
+    def _coalesced(self, cache_key: str, fetch: Callable[[], Any], cached: Optional[Callable[[], Any]] = None):
+        """
+        Run a fetch once for all concurrent callers with the same account and cache key
+
+        Within the process the callers share one in-flight call. Across processes
+        (several Streamlit workers, scheduled jobs) the key's file lock lets one
+        worker fetch while the others wait and then read what it wrote.
+
+        Args:
+            cache_key: Cache key of the fetched data
+            fetch: Function doing the API call(s) and writing the cache
+            cached: Reads the result another worker wrote while we waited for
+                    the lock (None = nothing there, fetch anyway)
+
+        Returns:
+            The fetch result (DataFrames shared with other callers are copied)
+        """
+        result, shared = self.single_flight.do(f"{self.account_id}:{cache_key}", self._fetch_locked, cache_key, fetch, cached)
+        if shared and isinstance(result, pd.DataFrame):
+            return result.copy()
+        return result
+
+    def _fetch_locked(self, cache_key: str, fetch: Callable[[], Any], cached: Optional[Callable[[], Any]]):
+        """Run fetch holding the key's cross-process lock (see _coalesced)"""
+        with self.cache.lock(cache_key) as waited:
+            if waited and cached is not None:
+                result = cached()
+                if result is not None:
+                    logger.info(f"📦 {cache_key} was refreshed by another worker meanwhile")
+                    return result
+            return fetch()
+
+    def coalescing_stats(self) -> Dict:
+        """Executed and coalesced fetches of the process"""
+        return self.single_flight.stats()
+
+    def invalidate_cache(self, data_types: List[str]) -> int:
+        """
+        Delete cached entries of some data types only
+
+        Args:
+            data_types: e.g. ['campaigns', 'ads'] (see DEFAULT_CACHE_TTL_HOURS)
+
+        Returns:
+            Number of deleted entries
+        """
+        if 'leads' in data_types:
+            self.lead_store.mark_stale()
+        return self.cache.invalidate(data_types)
+
+    def cache_stats(self) -> Dict:
+        """Get cache hit/miss/eviction counters and size"""
+        return self.cache.stats()
+
+    def rate_limit_status(self) -> Dict:
+        """Get current API usage, concurrency limit and throttling counters"""
+        return self.rate_limiter.status()
+
+    def migrate_cache(self) -> int:
+        """
+        Convert all legacy JSON cache entries to the configured cache format
+
+        Returns:
+            Number of migrated entries
+        """
+        if self.cache_backend.extension == '.json' or not os.path.exists(self.cache_dir):
+            return 0
+        migrated = migrate_json_cache(self.cache_dir, self.cache_backend)
+        self.cache.refresh_index()
+        return migrated
+
+    def _estimate_insight_rows(self, level: str, time_range: Dict, breakdowns: Optional[List[str]] = None, time_increment: Optional[int] = None) -> int:
+        """
+        Roughly estimate how many rows an insights query will return
+
+        Args:
+            level: 'ad', 'adset', 'campaign' or 'account'
+            time_range: Dict with 'since' and 'until' (YYYY-MM-DD)
+            breakdowns: Breakdown dimensions of the query
+            time_increment: 1 for daily rows, None for one row per object
+
+        Returns:
+            Estimated number of result rows
+        """
+        rows = 1 if level == 'account' else self._object_counts.get(level, DEFAULT_OBJECT_COUNT_ESTIMATE)
+
+        for breakdown in breakdowns or []:
+            rows *= BREAKDOWN_ROW_FACTORS.get(breakdown, 1)
+
+        if time_increment == 1:
+            rows *= self._range_days(time_range)
+
+        return rows
+
+    @staticmethod
+    def _range_days(time_range: Dict) -> int:
+        """Number of days in a time_range (inclusive)"""
+        since = datetime.strptime(time_range['since'], '%Y-%m-%d')
+        until = datetime.strptime(time_range['until'], '%Y-%m-%d')
+        return (until - since).days + 1
+
+    def _should_use_async(self, level: str, time_range: Dict, breakdowns: Optional[List[str]] = None, time_increment: Optional[int] = None) -> bool:
+        """Decide if a query is big enough to run as async report job"""
+        days = self._range_days(time_range)
+        estimated_rows = self._estimate_insight_rows(level, time_range, breakdowns, time_increment)
+
+        if days >= self.async_min_days or estimated_rows >= self.async_min_rows:
+            logger.info(f"⏳ Using async report job ({days} days, ~{estimated_rows} rows estimated)")
+            return True
+        return False
+
+    def _run_async_insights(self, params: Dict, fields: List[str]):
+        """
+        Run an account-level insights query as async report job
+
+        Submits the job, polls its status with exponential backoff and returns
+        a cursor that streams the paginated result.
+
+        Args:
+            params: Insights params (time_range, level, breakdowns, ...)
+            fields: Insights fields
+
+        Returns:
+            Cursor over AdsInsights of the finished job
+
+        Raises:
+            RuntimeError: If the job fails or is skipped by Meta
+            TimeoutError: If the job does not finish within async_poll_timeout
+        """
+        job = self.account.get_insights(params=dict(params), fields=fields, is_async=True)
+        job_id = job[AdReportRun.Field.id]
+        logger.info(f"⏳ Async insights job {job_id} submitted")
+
+        delay = self.async_poll_initial
+        deadline = time.monotonic() + self.async_poll_timeout
+
+        while True:
+            job.api_get(fields=[AdReportRun.Field.async_status, AdReportRun.Field.async_percent_completion])
+            status = job[AdReportRun.Field.async_status]
+            percent = job[AdReportRun.Field.async_percent_completion]
+            logger.info(f"   ⏳ Job {job_id}: {status} ({percent}%)")
+
+            if status == 'Job Completed':
+                break
+            if status in ('Job Failed', 'Job Skipped'):
+                raise RuntimeError(f"Async insights job {job_id} ended with status '{status}'")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Async insights job {job_id} not finished after {self.async_poll_timeout}s")
+
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, self.async_poll_max)
+
+        logger.info(f"✅ Async insights job {job_id} completed")
+        if self.http:
+            return self.http.iter_insights(job_id, {'limit': ACCOUNT_INSIGHTS_PAGE_SIZE})
+        return job.get_insights(params={'limit': ACCOUNT_INSIGHTS_PAGE_SIZE})
+
+    def _get_account_insights(self, params: Dict, fields: List[str]):
+        """
+        Synchronous account-level insights query with the configured transport
+
+        Args:
+            params: Insights params (time_range, level, breakdowns, limit, ...)
+            fields: Insights fields
+
+        Returns:
+            Lazy iterable of insight rows (AdsInsights, or dicts with transport 'http')
+        """
+        if self.http:
+            return self.http.iter_insights(self.account_id, params, fields)
+        return self.account.get_insights(params=params, fields=fields)
+
+    def _fetch_object_insights(self, objects: List, params: Dict, fields: List[str]) -> List[Union[List[Dict], Exception]]:
+        """
+        Fetch insights for many objects (campaigns, adsets, ads) with the configured transport
+
+        Args:
+            objects: SDK objects with get_insights()
+            params: Insights params for every object
+            fields: Insights fields
+
+        Returns:
+            List aligned with objects: insight rows of each object, or the
+            Exception if the request for that object failed
+        """
+        if self.transport == 'batch':
+            return self._batch_fetch_object_insights(objects, params, fields)
+
+        results = []
+        for obj in objects:
+            try:
+                if self.http:
+                    results.append(list(self.http.iter_insights(obj['id'], params, fields)))
+                else:
+                    results.append(list(obj.get_insights(params=params, fields=fields)))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def _batch_fetch_object_insights(self, objects: List, params: Dict, fields: List[str]) -> List[Union[List[Dict], Exception]]:
+        """
+        Fetch per-object insights via Graph Batch API (up to 50 sub-requests per HTTP call)
+
+        Failed sub-requests, sub-requests with more than one page and whole
+        failed batches are retried as single calls.
+
+        Args:
+            objects: SDK objects with get_insights()
+            params: Insights params for every object
+            fields: Insights fields
+
+        Returns:
+            List aligned with objects: insight rows of each object, or the
+            Exception if the request for that object failed
+        """
+        api = FacebookAdsApi.get_default_api()
+        results = [None] * len(objects)  # None = still needs a single call
+
+        def on_success(index, response):
+            body = response.json()
+            if body.get('paging', {}).get('next'):
+                return  # More than one page - fetched completely as single call below
+            results[index] = body.get('data', [])
+
+        def on_failure(index, response):
+            logger.warning(f"   ⚠️ Batch sub-request failed for object {objects[index].get('id')}: {response.error()}")
+
+        batch_params = {**params, 'limit': ACCOUNT_INSIGHTS_PAGE_SIZE}
+
+        for chunk_start in range(0, len(objects), GRAPH_BATCH_SIZE):
+            chunk = range(chunk_start, min(chunk_start + GRAPH_BATCH_SIZE, len(objects)))
+            batch = api.new_batch()
+            for index in chunk:
+                objects[index].get_insights(
+                    params=dict(batch_params),
+                    fields=fields,
+                    batch=batch,
+                    success=partial(on_success, index),
+                    failure=partial(on_failure, index)
+                )
+
+            try:
+                # Sub-requests without any response come back as new batch - retry once
+                retry_batch = batch.execute()
+                if retry_batch is not None:
+                    retry_batch.execute()
+            except Exception as e:
+                logger.warning(f"⚠️ Batch request failed ({str(e)}) - falling back to single calls")
+
+        # Single calls for everything the batches could not deliver
+        for index, rows in enumerate(results):
+            if rows is None:
+                try:
+                    results[index] = list(objects[index].get_insights(params=params, fields=fields))
+                except Exception as e:
+                    results[index] = e
+
+        return results
 
     def fetch_campaign_data(self, days: int = 7, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
         """
@@ -113,11 +701,20 @@ class MetaAdsClient:
             start_date = (datetime.now() - timedelta(days=days-1)).strftime('%Y-%m-%d')
 
         cache_key = f"campaigns_{start_date}_{end_date}"
-        cached_data = self._load_from_cache(cache_key)
+        fetch = partial(self._fetch_campaign_data_from_api, start_date, end_date, cache_key)
+
+        def from_cache(revalidate=None):
+            cached_df = self._load_from_cache(cache_key, revalidate=revalidate)
+            return apply_schema(cached_df) if cached_df is not None else None
 
-        if cached_data is not None:
-            return pd.DataFrame(cached_data)
+        cached_df = from_cache(revalidate=fetch)
+        if cached_df is not None:
+            return cached_df
 
+        return self._coalesced(cache_key, fetch, cached=from_cache)
+
+    def _fetch_campaign_data_from_api(self, start_date: str, end_date: str, cache_key: str) -> pd.DataFrame:
+        """Fetch campaign insights from the API and cache them (see fetch_campaign_data)"""
         if not self.api_initialized:
             logger.error("❌ Meta Ads API not initialized")
             logger.error("❌ Check if META_ACCESS_TOKEN and META_AD_ACCOUNT_ID are set correctly")
@@ -131,96 +728,96 @@ class MetaAdsClient:
                 'until': end_date
             }
 
-            campaigns = self.account.get_campaigns(fields=[
+            campaigns = list(self.account.get_campaigns(fields=[
                 Campaign.Field.name,
                 Campaign.Field.status,
-            ])
+            ]))
+
+            # ALLE verfügbaren Insights-Felder abrufen!
+            campaign_insights = self._fetch_object_insights(
+                campaigns,
+                params={
+                    'time_range': time_range,
+                    'level': 'campaign',
+                    'breakdowns': []  # Keine Breakdowns für Campaign-Level
+                },
+                fields=[
+                    # Basic Info
+                    'campaign_id',
+                    'campaign_name',
+                    'objective',
+
+                    # Spend & Budget
+                    'spend',
+                    'budget_remaining',
+                    'daily_budget',
+                    'lifetime_budget',
+
+                    # Delivery
+                    'impressions',
+                    'reach',
+                    'frequency',
+                    'social_spend',
+
+                    # Engagement
+                    'clicks',
+                    'unique_clicks',
+                    'ctr',
+                    'unique_ctr',
+                    'cpc',
+                    'cpm',
+                    'cpp',
+
+                    # Video Metrics (vollständig!)
+                    'video_play_actions',
+                    'video_avg_time_watched_actions',
+                    'video_p25_watched_actions',
+                    'video_p50_watched_actions',
+                    'video_p75_watched_actions',
+                    'video_p95_watched_actions',
+                    'video_p100_watched_actions',
+                    'video_thruplay_watched_actions',
+                    'video_continuous_2_sec_watched_actions',
+                    'video_30_sec_watched_actions',
+
+                    # Conversions
+                    'actions',
+                    'action_values',
+                    'cost_per_action_type',
+                    'cost_per_unique_action_type',
+                    'conversions',
+                    'conversion_values',
+
+                    # Quality & Relevance
+                    'quality_score_organic',
+                    'quality_score_ectr',
+                    'quality_score_ecvr',
+
+                    # Link Clicks
+                    'outbound_clicks',
+                    'unique_outbound_clicks',
+                    'outbound_clicks_ctr',
+                    'cost_per_outbound_click',
+
+                    # Landing Page
+                    'website_ctr',
+                    'purchase_roas',
+
+                    # Age & Gender (wenn verfügbar)
+                    'cost_per_estimated_ad_recallers',
+                    'estimated_ad_recall_rate',
+                    'estimated_ad_recallers'
+                ]
+            )
 
             campaign_data = []
             campaign_count = 0
-            for campaign in campaigns:
+            for campaign, insights in zip(campaigns, campaign_insights):
                 campaign_count += 1
                 logger.info(f"📊 Processing campaign {campaign_count}: {campaign.get('name', 'Unknown')}")
 
-                # ALLE verfügbaren Insights-Felder abrufen!
-                try:
-                    insights = campaign.get_insights(
-                        params={
-                            'time_range': time_range,
-                            'level': 'campaign',
-                            'breakdowns': []  # Keine Breakdowns für Campaign-Level
-                        },
-                    fields=[
-                        # Basic Info
-                        'campaign_id',
-                        'campaign_name',
-                        'objective',
-
-                        # Spend & Budget
-                        'spend',
-                        'budget_remaining',
-                        'daily_budget',
-                        'lifetime_budget',
-
-                        # Delivery
-                        'impressions',
-                        'reach',
-                        'frequency',
-                        'social_spend',
-
-                        # Engagement
-                        'clicks',
-                        'unique_clicks',
-                        'ctr',
-                        'unique_ctr',
-                        'cpc',
-                        'cpm',
-                        'cpp',
-
-                        # Video Metrics (vollständig!)
-                        'video_play_actions',
-                        'video_avg_time_watched_actions',
-                        'video_p25_watched_actions',
-                        'video_p50_watched_actions',
-                        'video_p75_watched_actions',
-                        'video_p95_watched_actions',
-                        'video_p100_watched_actions',
-                        'video_thruplay_watched_actions',
-                        'video_continuous_2_sec_watched_actions',
-                        'video_30_sec_watched_actions',
-
-                        # Conversions
-                        'actions',
-                        'action_values',
-                        'cost_per_action_type',
-                        'cost_per_unique_action_type',
-                        'conversions',
-                        'conversion_values',
-
-                        # Quality & Relevance
-                        'quality_score_organic',
-                        'quality_score_ectr',
-                        'quality_score_ecvr',
-
-                        # Link Clicks
-                        'outbound_clicks',
-                        'unique_outbound_clicks',
-                        'outbound_clicks_ctr',
-                        'cost_per_outbound_click',
-
-                        # Landing Page
-                        'website_ctr',
-                        'purchase_roas',
-
-                        # Age & Gender (wenn verfügbar)
-                        'cost_per_estimated_ad_recallers',
-                        'estimated_ad_recall_rate',
-                        'estimated_ad_recallers'
-                    ]
-                    )
-
-                except Exception as e:
-                    logger.error(f"   ❌ Error getting insights for campaign: {str(e)}")
+                if isinstance(insights, Exception):
+                    logger.error(f"   ❌ Error getting insights for campaign: {str(insights)}")
                     continue
 
                 insights_list = list(insights)
@@ -231,35 +828,6 @@ class MetaAdsClient:
                     continue
 
                 for insight in insights_list:
-                    # Extract ALL actions
-                    actions_dict = {}
-                    if 'actions' in insight:
-                        for action in insight['actions']:
-                            action_type = action.get('action_type', 'unknown')
-                            actions_dict[f'actions_{action_type}'] = int(action.get('value', 0))
-
-                    # Extract ALL costs
-                    costs_dict = {}
-                    if 'cost_per_action_type' in insight:
-                        for cost in insight['cost_per_action_type']:
-                            cost_type = cost.get('action_type', 'unknown')
-                            costs_dict[f'cost_per_{cost_type}'] = float(cost.get('value', 0))
-
-                    # Extract video metrics
-                    video_dict = {}
-                    for video_field in ['video_play_actions', 'video_p25_watched_actions', 'video_p50_watched_actions',
-                                       'video_p75_watched_actions', 'video_p95_watched_actions', 'video_p100_watched_actions',
-                                       'video_thruplay_watched_actions', 'video_continuous_2_sec_watched_actions',
-                                       'video_30_sec_watched_actions', 'video_avg_time_watched_actions']:
-                        if video_field in insight:
-                            for action in insight[video_field]:
-                                action_type = action.get('action_type', 'unknown')
-                                video_dict[f'{video_field}_{action_type}'] = float(action.get('value', 0))
-
-                    # Legacy fields for compatibility
-                    leads = actions_dict.get('actions_lead', 0)
-                    cpl = costs_dict.get('cost_per_lead', 0)
-
                     # Build comprehensive data dict
                     campaign_data.append({
                         # Basic Info
@@ -307,24 +875,18 @@ class MetaAdsClient:
                         'estimated_ad_recallers': int(insight.get('estimated_ad_recallers', 0)),
                         'estimated_ad_recall_rate': float(insight.get('estimated_ad_recall_rate', 0)),
 
-                        # Legacy compatibility
-                        'leads': leads,
-                        'cpl': cpl,
-
-                        # Add ALL extracted actions
-                        **actions_dict,
-                        **costs_dict,
-                        **video_dict
+                        # Raw action lists - exploded below in one pass
+                        **{field: insight[field] for field in CAMPAIGN_ACTION_FIELDS if field in insight}
                     })
 
-            df = pd.DataFrame(campaign_data)
+            df = apply_schema(self._add_campaign_action_columns(pd.DataFrame(campaign_data)))
 
             if df.empty:
                 logger.warning("⚠️ No campaigns found in Meta account - using mock data")
             else:
                 logger.info(f"✅ Successfully fetched {len(df)} campaigns from Meta API!")
 
-            self._save_to_cache(cache_key, df.to_dict('records'))
+            self._save_to_cache(cache_key, df)
             return df
 
         except Exception as e:
@@ -332,7 +894,150 @@ class MetaAdsClient:
             logger.error(f"❌ Check if your Meta Access Token is still valid!")
             return pd.DataFrame()
 
-    def fetch_ad_performance(self, days: int = 7, start_date: Optional[str] = None, end_date: Optional[str] = None, force_refresh: bool = False) -> pd.DataFrame:
+    @staticmethod
+    def _add_campaign_action_columns(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ingestion step for campaign rows: explode the raw action lists once and
+        replace them with wide numeric columns (actions_<type>, cost_per_<type>,
+        <video field>_<type>) plus legacy leads/cpl
+
+        Args:
+            df: Campaign rows with raw action list columns
+
+        Returns:
+            DataFrame without the list columns
+        """
+        if df.empty:
+            return df
+
+        table = DataProcessor.build_actions_table(df, id_column='campaign_id', fields=CAMPAIGN_ACTION_FIELDS)
+
+        wide = {}
+        for field in CAMPAIGN_ACTION_FIELDS:
+            pivot = DataProcessor.pivot_actions(table, field, index=df.index, fill_value=None)
+            prefix = {'actions': 'actions_', 'cost_per_action_type': 'cost_per_'}.get(field, f'{field}_')
+            for action_type in pivot.columns:
+                values = pivot[action_type]
+                # Action counts stay integers like Meta reports them
+                if field == 'actions' and not values.isna().any():
+                    values = values.astype(np.int64)
+                wide[f'{prefix}{action_type}'] = values
+
+        # Legacy fields for compatibility
+        df = df.drop(columns=[field for field in CAMPAIGN_ACTION_FIELDS if field in df.columns])
+        df['leads'] = wide['actions_lead'].fillna(0).astype(np.int64) if 'actions_lead' in wide else 0
+        df['cpl'] = wide['cost_per_lead'].fillna(0) if 'cost_per_lead' in wide else 0
+
+        return pd.concat([df, pd.DataFrame(wide, index=df.index)], axis=1)
+
+    @staticmethod
+    def _build_ad_frame(rows: List) -> pd.DataFrame:
+        """
+        Ingestion step for ad-level insights: one frame plus pre-parsed metrics
+
+        The nested action lists are exploded once (DataProcessor.build_actions_table)
+        and the numbers pages need are added as columns.
+
+        Args:
+            rows: AdsInsights objects (or dicts) returned by the Graph API
+
+        Returns:
+            DataFrame with all insight fields plus leads_extracted, video_plays_3s,
+            thru_plays, link_clicks_action, video_15s_views, video_30s_views,
+            cpl, hook_rate and hold_rate
+        """
+        # Speichere ALLE Daten vom Insight!
+        df = pd.DataFrame([dict(row) for row in rows])
+        if df.empty:
+            return df
+
+        df = DataProcessor.add_action_columns(df, DataProcessor.build_actions_table(df, id_column='ad_id'))
+
+        # Calculate convenience metrics
+        spend = extract_numeric_values(df['spend']).fillna(0) if 'spend' in df.columns else pd.Series(0.0, index=df.index)
+        impressions = pd.to_numeric(df['impressions'], errors='coerce').fillna(1) if 'impressions' in df.columns \
+            else pd.Series(1, index=df.index)
+        leads = df['leads_extracted']
+        video_plays_3s = df['video_plays_3s']
+
+        df['cpl'] = np.where(leads > 0, spend / leads.where(leads > 0, 1), 0)
+        df['hook_rate'] = np.where(impressions > 0, video_plays_3s / impressions.where(impressions > 0, 1) * 100, 0)
+        df['hold_rate'] = np.where(video_plays_3s > 0, df['thru_plays'] / video_plays_3s.where(video_plays_3s > 0, 1) * 100, 0)
+
+        return apply_schema(df)
+
+    def _fetch_ad_insights_account_level(self, time_range: Dict) -> List[Dict]:
+        """
+        Fetch ad-level insights for ALL ads with ONE paginated account query
+
+        Args:
+            time_range: Dict with 'since' and 'until' (YYYY-MM-DD)
+
+        Returns:
+            List of raw ad insight rows (see _build_ad_frame)
+        """
+        params = {
+            'time_range': time_range,
+            'level': 'ad',
+            'limit': ACCOUNT_INSIGHTS_PAGE_SIZE
+        }
+
+        # Big ranges run as async report job (synchronous requests time out)
+        if self._should_use_async('ad', time_range):
+            insights = self._run_async_insights(params, AD_INSIGHT_FIELDS)
+        else:
+            insights = self._get_account_insights(params, AD_INSIGHT_FIELDS)
+
+        ad_data = list(insights)
+        self._object_counts['ad'] = len(ad_data)
+        logger.info(f"🎯 Account-level query returned {len(ad_data)} ad rows")
+        return ad_data
+
+    def _fetch_ad_insights_per_ad(self, time_range: Dict) -> List[Dict]:
+        """
+        Fetch ad-level insights one ad at a time (1 + N requests)
+
+        Only used as fallback when the account-level query fails.
+
+        Args:
+            time_range: Dict with 'since' and 'until' (YYYY-MM-DD)
+
+        Returns:
+            List of raw ad insight rows (see _build_ad_frame)
+        """
+        ads = self.account.get_ads(fields=[
+            Ad.Field.name,
+            Ad.Field.status,
+        ])
+
+        ads_list = list(ads)
+        logger.info(f"🎯 Found {len(ads_list)} ads in account")
+
+        ad_data = []
+        for ad in ads_list:
+            logger.info(f"   📊 Fetching insights for ad: {ad.get('name', 'Unknown')}")
+            insights = ad.get_insights(
+                params={
+                    'time_range': time_range,
+                    'level': 'ad',
+                    'breakdowns': []
+                },
+                fields=AD_INSIGHT_FIELDS
+            )
+
+            ad_data.extend(insights)
+
+        return ad_data
+
+    def fetch_ad_performance(
+        self,
+        days: int = 7,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        force_refresh: bool = False,
+        mode: str = 'account',
+        incremental: Optional[bool] = None
+    ) -> pd.DataFrame:
         """
         Fetch ad-level performance data with video metrics and custom date range
 
@@ -340,6 +1045,11 @@ class MetaAdsClient:
             days: Number of days to look back (if start_date/end_date not provided)
             start_date: Start date in YYYY-MM-DD format (optional)
             end_date: End date in YYYY-MM-DD format (optional, defaults to TODAY)
+            force_refresh: Always fetch fresh data (ignore cache)
+            mode: 'account' = one paginated account-level insights query (default),
+                  'per_ad' = legacy loop with one insights request per ad
+            incremental: Serve the range from daily partitions (see sync_daily_ad_insights),
+                         defaults to META_INCREMENTAL_SYNC
 
         Returns:
             DataFrame with ad metrics including hook rate and hold rate
@@ -351,17 +1061,34 @@ class MetaAdsClient:
         if not start_date:
             start_date = (datetime.now() - timedelta(days=days-1)).strftime('%Y-%m-%d')
 
+        if incremental if incremental is not None else self.incremental_sync:
+            return self._coalesced(
+                f"ads_incremental_{start_date}_{end_date}",
+                partial(self._fetch_ad_performance_incremental, start_date, end_date, force_refresh)
+            )
+
         cache_key = f"ads_{start_date}_{end_date}"
+        fetch = partial(self._fetch_ad_performance_from_api, start_date, end_date, mode, cache_key)
+
+        def from_cache(revalidate=None):
+            cached_df = self._load_from_cache(cache_key, revalidate=revalidate)
+            if cached_df is None or cached_df.empty:
+                return cached_df
+            return DataProcessor.add_action_columns(apply_schema(cached_df))
 
         # Load from cache unless force refresh is requested
         if not force_refresh:
-            cached_data = self._load_from_cache(cache_key)
-            if cached_data is not None:
+            cached_df = from_cache(revalidate=fetch)
+            if cached_df is not None:
                 logger.info(f"📦 Returning cached data for {cache_key}")
-                return pd.DataFrame(cached_data)
+                return cached_df
         else:
             logger.info(f"⚡ Force refresh - skipping cache for {cache_key}")
 
+        return self._coalesced(cache_key, fetch, cached=from_cache)
+
+    def _fetch_ad_performance_from_api(self, start_date: str, end_date: str, mode: str, cache_key: str) -> pd.DataFrame:
+        """Fetch ad insights from the API and cache them (see fetch_ad_performance)"""
         if not self.api_initialized:
             logger.error("❌ Meta Ads API not initialized")
             logger.error("❌ Check if META_ACCESS_TOKEN and META_AD_ACCOUNT_ID are set correctly")
@@ -374,140 +1101,24 @@ class MetaAdsClient:
                 'until': end_date
             }
 
-            logger.info(f"📅 Fetching ad performance from {start_date} to {end_date}")
-
-            ads = self.account.get_ads(fields=[
-                Ad.Field.name,
-                Ad.Field.status,
-            ])
-
-            ads_list = list(ads)
-            logger.info(f"🎯 Found {len(ads_list)} ads in account")
-
-            ad_data = []
-            for ad in ads_list:
-                logger.info(f"   📊 Fetching insights for ad: {ad.get('name', 'Unknown')}")
-                # NUR die 67 VERIFIZIERTEN Fields die WIRKLICH funktionieren!
-                # (getestet mit test_ALL_meta_fields.py)
-                insights = ad.get_insights(
-                    params={
-                        'time_range': time_range,
-                        'level': 'ad',
-                        'breakdowns': []
-                    },
-                    fields=[
-                        # IDs & Names & Dates (13 fields)
-                        'account_id', 'account_name', 'account_currency',
-                        'ad_id', 'ad_name',
-                        'adset_id', 'adset_name',
-                        'campaign_id', 'campaign_name',
-                        'date_start', 'date_stop',
-                        'created_time', 'updated_time',
-
-                        # Basic Metrics (5 fields)
-                        'spend', 'impressions', 'reach', 'frequency', 'clicks',
-
-                        # CTR & Engagement (13 fields)
-                        'ctr', 'unique_ctr',
-                        'inline_link_clicks', 'inline_link_click_ctr',
-                        'unique_inline_link_clicks', 'unique_inline_link_click_ctr',
-                        'unique_link_clicks_ctr',
-                        'unique_clicks',
-                        'inline_post_engagement',
-                        'website_ctr',
-                        'unique_actions',
-                        'actions',
-                        'result_rate',
-
-                        # Costs (13 fields)
-                        'cpc', 'cpm', 'cpp',
-                        'cost_per_inline_link_click',
-                        'cost_per_inline_post_engagement',
-                        'cost_per_unique_click',
-                        'cost_per_unique_inline_link_click',
-                        'cost_per_action_type',
-                        'cost_per_unique_action_type',
-                        'cost_per_result',
-                        'cost_per_thruplay',
-                        'cost_per_15_sec_video_view',
-                        'link_clicks_per_results',
-
-                        # Results & Performance (2 fields)
-                        'results',
-                        'result_values_performance_indicator',
-
-                        # Video Metrics (13 fields)
-                        'video_play_actions',
-                        'video_play_curve_actions',
-                        'video_avg_time_watched_actions',
-                        'video_15_sec_watched_actions',
-                        'video_30_sec_watched_actions',
-                        'video_p25_watched_actions',
-                        'video_p50_watched_actions',
-                        'video_p75_watched_actions',
-                        'video_p95_watched_actions',
-                        'video_p100_watched_actions',
-                        'video_thruplay_watched_actions',
-                        'video_view_per_impression',
-                        'unique_video_view_15_sec',
-
-                        # Quality & Rankings (3 fields)
-                        'quality_ranking',
-                        'engagement_rate_ranking',
-                        'conversion_rate_ranking',
-
-                        # Attribution & Config (5 fields)
-                        'attribution_setting',
-                        'buying_type',
-                        'objective',
-                        'optimization_goal',
-                        'creative_media_type',
-                    ]
-                )
-
-                for insight in insights:
-                    # Speichere ALLE Daten vom Insight!
-                    data = dict(insight)
-
-                    # Extract leads für einfachen Zugriff
-                    leads = 0
-                    if 'actions' in insight:
-                        for action in insight['actions']:
-                            if action['action_type'] == 'lead':
-                                leads = int(action['value'])
+            logger.info(f"📅 Fetching ad performance from {start_date} to {end_date} (mode: {mode})")
 
-                    data['leads_extracted'] = leads
-
-                    # Extract video metrics für einfachen Zugriff
-                    video_plays_3s = 0
-                    if 'video_play_actions' in insight:
-                        for action in insight['video_play_actions']:
-                            if action['action_type'] == 'video_view':
-                                video_plays_3s = int(action['value'])
-
-                    data['video_plays_3s'] = video_plays_3s
-
-                    thru_plays = 0
-                    if 'video_thruplay_watched_actions' in insight:
-                        for action in insight['video_thruplay_watched_actions']:
-                            if action['action_type'] == 'video_view':
-                                thru_plays = int(action['value'])
-
-                    data['thru_plays'] = thru_plays
-
-                    # Calculate convenience metrics
-                    spend = float(insight.get('spend', 0))
-                    impressions = int(insight.get('impressions', 1))
-
-                    data['cpl'] = spend / leads if leads > 0 else 0
-                    data['hook_rate'] = (video_plays_3s / impressions * 100) if impressions > 0 else 0
-                    data['hold_rate'] = (thru_plays / video_plays_3s * 100) if video_plays_3s > 0 else 0
-
-                    ad_data.append(data)
+            if mode == 'account':
+                try:
+                    ad_data = self._fetch_ad_insights_account_level(time_range)
+                except Exception as e:
+                    # Still throttled after the retries - N per-ad requests would only make it worse
+                    if is_throttling_error(e):
+                        raise
+                    logger.warning(f"⚠️ Account-level insights query failed: {str(e)}")
+                    logger.warning("⚠️ Falling back to per-ad insights loop")
+                    ad_data = self._fetch_ad_insights_per_ad(time_range)
+            else:
+                ad_data = self._fetch_ad_insights_per_ad(time_range)
 
             logger.info(f"✅ Successfully fetched {len(ad_data)} data points from ads")
 
-            df = pd.DataFrame(ad_data)
+            df = self._build_ad_frame(ad_data)
 
             if not df.empty:
                 logger.info(f"✅ DataFrame created with {len(df)} rows and {len(df.columns)} columns")
@@ -515,7 +1126,7 @@ class MetaAdsClient:
             else:
                 logger.warning("⚠️ DataFrame is EMPTY - no insights returned from API")
 
-            self._save_to_cache(cache_key, df.to_dict('records'))
+            self._save_to_cache(cache_key, df)
             return df
 
         except Exception as e:
@@ -525,106 +1136,509 @@ class MetaAdsClient:
             return pd.DataFrame()
 
 
-    def fetch_leads_data(self, days: int = 7, force_refresh: bool = False) -> pd.DataFrame:
+    def iter_ad_insights(
+        self,
+        start_date: str,
+        end_date: str,
+        time_increment: Optional[int] = None,
+        batch_size: int = ACCOUNT_INSIGHTS_PAGE_SIZE
+    ) -> Iterator[pd.DataFrame]:
         """
-        Fetch LIVE lead form data via Pages API (works with Instant Forms)
+        Stream ad-level insights as typed record batches, page by page
+
+        The Graph cursor is consumed lazily, so only one page of raw rows and
+        one batch frame are held at a time (memory stays flat for any range).
 
         Args:
-            days: Number of days to look back
-            force_refresh: Always fetch fresh data (ignore cache)
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            time_increment: 1 = one row per ad and day, None = one row per ad
+            batch_size: Rows per batch (one Graph page at the default)
+
+        Yields:
+            DataFrames with the columns of _build_ad_frame
+        """
+        time_range = {'since': start_date, 'until': end_date}
+        params = {
+            'time_range': time_range,
+            'level': 'ad',
+            'limit': min(batch_size, ACCOUNT_INSIGHTS_PAGE_SIZE)
+        }
+        if time_increment:
+            params['time_increment'] = time_increment
+
+        if self._should_use_async('ad', time_range, time_increment=time_increment):
+            insights = self._run_async_insights(params, AD_INSIGHT_FIELDS)
+        else:
+            insights = self._get_account_insights(params, AD_INSIGHT_FIELDS)
+
+        batch = []
+        for insight in insights:
+            batch.append(insight)
+            if len(batch) >= batch_size:
+                yield self._build_ad_frame(batch)
+                batch = []
+        if batch:
+            yield self._build_ad_frame(batch)
+
+    def stream_ad_insights_to_cache(
+        self,
+        start_date: str,
+        end_date: str,
+        time_increment: Optional[int] = None,
+        cache_key: Optional[str] = None
+    ) -> int:
+        """
+        Pull ad-level insights straight into the cache without building one big frame
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            time_increment: 1 = one row per ad and day, None = one row per ad
+            cache_key: Cache key (default: the fetch_ad_performance key, or
+                       ads_daily_<start>_<end> for daily rows)
 
         Returns:
-            DataFrame with lead details
+            Number of rows stored (0 on error)
         """
+        if not cache_key:
+            prefix = 'ads_daily' if time_increment else 'ads'
+            cache_key = f"{prefix}_{start_date}_{end_date}"
+
         if not self.api_initialized:
-            logger.warning("API not initialized - cannot fetch leads")
+            logger.error("❌ Meta Ads API not initialized")
+            return 0
+
+        try:
+            logger.info(f"🌊 Streaming ad insights {start_date} - {end_date} into {cache_key}")
+            rows = self.cache.put_batches(cache_key, self.iter_ad_insights(start_date, end_date, time_increment))
+            logger.info(f"✅ Streamed {rows} ad rows into cache")
+            return rows
+        except Exception as e:
+            logger.error(f"❌ Error streaming ad insights: {str(e)}")
+            return 0
+
+    def sync_daily_ad_insights(self, start_date: str, end_date: str, force_refresh: bool = False) -> int:
+        """
+        Incrementally sync daily ad insights (time_increment=1) into the daily store
+
+        Only days without a final partition are fetched: missing days and the
+        trailing attribution window (last attribution_window_days days plus today),
+        which Meta may still update. Contiguous days are fetched with one query.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            force_refresh: Re-pull every day of the range
+
+        Returns:
+            Number of days fetched from the API
+        """
+        days_to_fetch = [
+            day for day in DailyInsightsStore.days_between(start_date, end_date)
+            if force_refresh or not self.daily_store.is_final(day, self.attribution_window_days)
+        ]
+
+        if not days_to_fetch:
+            logger.info(f"📦 All daily partitions {start_date} - {end_date} are final")
+            return 0
+
+        # Group into contiguous runs -> one query per run
+        runs = []
+        for day in days_to_fetch:
+            previous = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+            if runs and runs[-1][-1] == previous:
+                runs[-1].append(day)
+            else:
+                runs.append([day])
+
+        for run in runs:
+            time_range = {'since': run[0], 'until': run[-1]}
+            logger.info(f"🔄 Syncing daily ad insights {run[0]} - {run[-1]} ({len(run)} days)")
+
+            params = {
+                'time_range': time_range,
+                'level': 'ad',
+                'time_increment': 1,
+                'limit': ACCOUNT_INSIGHTS_PAGE_SIZE
+            }
+            if self._should_use_async('ad', time_range, time_increment=1):
+                insights = self._run_async_insights(params, AD_INSIGHT_FIELDS)
+            else:
+                insights = self._get_account_insights(params, AD_INSIGHT_FIELDS)
+
+            rows_by_day = {day: [] for day in run}
+            for insight in insights:
+                row = dict(insight)
+                rows_by_day.setdefault(row.get('date_start'), []).append(row)
+
+            for day in run:
+                self.daily_store.save_day(day, rows_by_day[day])
+
+        logger.info(f"✅ Synced {len(days_to_fetch)} daily partitions")
+        return len(days_to_fetch)
+
+    def _fetch_ad_performance_incremental(self, start_date: str, end_date: str, force_refresh: bool = False) -> pd.DataFrame:
+        """
+        Serve ad performance for any range by aggregating daily partitions
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            force_refresh: Re-pull every day of the range
+
+        Returns:
+            DataFrame with one row per ad (same columns as fetch_ad_performance)
+        """
+        if not self.api_initialized:
+            logger.error("❌ Meta Ads API not initialized")
+            logger.error("❌ Check if META_ACCESS_TOKEN and META_AD_ACCOUNT_ID are set correctly")
             return pd.DataFrame()
 
         try:
-            import requests
+            self.sync_daily_ad_insights(start_date, end_date, force_refresh=force_refresh)
+
+            daily_df = self.daily_store.load_range(start_date, end_date)
+            if daily_df.empty:
+                logger.warning("⚠️ No daily insights stored for this range")
+                return pd.DataFrame()
+
+            ad_df = DataProcessor.aggregate_daily_insights(daily_df, group_by='ad_id')
+            logger.info(f"✅ Aggregated {len(daily_df)} daily rows into {len(ad_df)} ads")
+            return self._build_ad_frame(ad_df.to_dict('records'))
+
+        except Exception as e:
+            logger.error(f"❌ Error during incremental ad sync: {str(e)}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return pd.DataFrame()
 
-            # Calculate date range
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
+    def fetch_level_reach(self, level: str, start_date: str, end_date: str) -> Dict[str, float]:
+        """
+        Exact reach per adset, campaign or account with ONE small account-level query
+
+        Reach is not additive across ads, so rollups with reach_strategy='exact'
+        take it from here (only the ID and reach fields are requested).
 
-            # Get pages user has access to
-            response = requests.get(
-                'https://graph.facebook.com/v21.0/me/accounts',
-                params={'access_token': self.access_token, 'fields': 'id,name,access_token'}
+        Args:
+            level: 'adset', 'campaign' or 'account'
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+
+        Returns:
+            Dict of object ID -> reach (empty if the query fails)
+        """
+        id_field = ROLLUP_LEVELS[level][0]
+        cache_key = f"campaigns_reach_{level}_{start_date}_{end_date}"
+
+        cached_df = self._load_from_cache(cache_key)
+        if cached_df is not None:
+            return dict(zip(cached_df['id'].astype(str), cached_df['reach'].astype(float))) if not cached_df.empty else {}
+
+        try:
+            insights = self._get_account_insights(
+                params={
+                    'time_range': {'since': start_date, 'until': end_date},
+                    'level': level,
+                    'limit': ACCOUNT_INSIGHTS_PAGE_SIZE
+                },
+                fields=[id_field, 'reach']
             )
+            reach = {str(row[id_field]): float(row.get('reach', 0)) for row in insights}
+        except Exception as e:
+            logger.warning(f"⚠️ Reach query for level '{level}' failed: {str(e)}")
+            return {}
 
-            if response.status_code != 200:
-                logger.error(f"Failed to get pages: {response.status_code}")
-                return pd.DataFrame()
+        logger.info(f"👥 Exact reach for {len(reach)} {level}s")
+        self._save_to_cache(cache_key, pd.DataFrame({'id': list(reach), 'reach': list(reach.values())}))
+        return reach
 
-            pages = response.json().get('data', [])
-            logger.info(f"Found {len(pages)} pages")
+    def fetch_rollups(
+        self,
+        days: int = 7,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        levels: Optional[List[str]] = None,
+        reach_strategy: Optional[str] = None,
+        force_refresh: bool = False
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Ad-level data plus adset/campaign/account views rolled up from it
 
-            all_leads = []
+        Replaces separate fetch_campaign_data calls: all levels come from ONE
+        ad-level fetch (see DataProcessor.rollup).
 
-            for page in pages:
-                page_id = page.get('id')
-                page_name = page.get('name')
-                page_token = page.get('access_token')
+        Args:
+            days: Number of days to look back (if start_date/end_date not provided)
+            start_date: Start date in YYYY-MM-DD format (optional)
+            end_date: End date in YYYY-MM-DD format (optional, defaults to TODAY)
+            levels: Rollup levels (default: ['campaign'])
+            reach_strategy: 'upper_bound', 'lower_bound' or 'exact' (one extra
+                            reach-only query per level), defaults to META_REACH_STRATEGY
+            force_refresh: Always fetch fresh ad data (ignore cache)
 
-                # Get leadgen forms from this page
-                forms_resp = requests.get(
-                    f'https://graph.facebook.com/v21.0/{page_id}/leadgen_forms',
-                    params={'access_token': page_token, 'fields': 'id,name,status'}
-                )
+        Returns:
+            {'ad': ad-level DataFrame, '<level>': rolled up DataFrame, ...}
+        """
+        if not end_date:
+            end_date = datetime.now().strftime('%Y-%m-%d')
+        if not start_date:
+            start_date = (datetime.now() - timedelta(days=days-1)).strftime('%Y-%m-%d')
 
-                if forms_resp.status_code != 200:
-                    logger.warning(f"Failed to get forms for page {page_name}")
-                    continue
+        reach_strategy = reach_strategy or Config.get('META_REACH_STRATEGY', 'upper_bound')
+        ad_df = self.fetch_ad_performance(start_date=start_date, end_date=end_date, force_refresh=force_refresh)
 
-                forms = forms_resp.json().get('data', [])
-                logger.info(f"Page '{page_name}': Found {len(forms)} forms")
+        results = {'ad': ad_df}
+        for level in levels or ['campaign']:
+            exact_reach = None
+            if reach_strategy == 'exact' and not ad_df.empty:
+                exact_reach = self.fetch_level_reach(level, start_date, end_date)
+            results[level] = DataProcessor.rollup(ad_df, level, reach_strategy, exact_reach)
+            logger.info(f"🧮 Rolled up {len(ad_df)} ads into {len(results[level])} {level} rows ({reach_strategy} reach)")
 
-                for form in forms:
-                    form_id = form.get('id')
-                    form_name = form.get('name')
+        return results
 
-                    # Get leads from this form
-                    leads_resp = requests.get(
-                        f'https://graph.facebook.com/v21.0/{form_id}/leads',
-                        params={'access_token': page_token, 'fields': 'id,created_time,field_data'}
-                    )
+    def _fetch_form_leads(self, page: Dict, form: Dict, since: datetime, until: datetime) -> List[Dict]:
+        """
+        All leads of one lead form created in a time window (every page of the edge)
 
-                    if leads_resp.status_code != 200:
-                        logger.warning(f"Failed to get leads for form {form_name}")
-                        continue
+        Args:
+            page: Facebook page dict (id, name, access_token)
+            form: Lead form dict (id, name)
+            since: Window start (timezone-aware)
+            until: Window end (timezone-aware)
+
+        Returns:
+            Lead dicts for the lead store (lead_id, created_time in UTC, form_name,
+            page_id, page_name, fields)
+
+        Raises:
+            FacebookRequestError: If a page of the edge could not be fetched
+        """
+        params = {
+            # Time window filtered by Meta - only leads in range are downloaded
+            'filtering': [
+                {'field': 'time_created', 'operator': 'GREATER_THAN', 'value': int(since.timestamp()) - 1},
+                {'field': 'time_created', 'operator': 'LESS_THAN', 'value': int(until.timestamp()) + 1},
+            ],
+            'limit': LEADS_PAGE_SIZE
+        }
+
+        leads = []
+        for lead in self.pages_http.iter_edge(f"{form.get('id')}/leads", params, LEAD_FIELDS, access_token=page.get('access_token')):
+            created_time = self._parse_lead_time(lead.get('created_time', ''))
+            if created_time is None:
+                continue
+
+            # Safety net in case the filtering is ignored
+            if not since <= created_time <= until:
+                continue
+
+            leads.append(self._lead_record(lead, created_time, form, page))
+
+        return leads
+
+    @staticmethod
+    def _parse_lead_time(created_time_str: str) -> Optional[datetime]:
+        """Graph created_time ('2024-10-01T12:00:00+0000') -> aware datetime (None if missing)"""
+        if not created_time_str:
+            return None
+        try:
+            return datetime.strptime(created_time_str, '%Y-%m-%dT%H:%M:%S%z')
+        except Exception:
+            return datetime.now().astimezone()
+
+    @staticmethod
+    def _lead_record(lead: Dict, created_time: datetime, form: Dict, page: Dict) -> Dict:
+        """Graph lead -> lead store dict (field_data flattened to {name: first value})"""
+        field_data = {}
+        for field in lead.get('field_data', []):
+            field_name = field.get('name', 'unknown')
+            field_value = (field.get('values') or [''])[0]
+            field_data[field_name] = field_value
+
+        return {
+            'lead_id': lead.get('id'),
+            'created_time': created_time.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+            'form_id': form.get('id'),
+            'form_name': form.get('name'),
+            'page_id': page.get('id'),
+            'page_name': page.get('name'),
+            'fields': field_data
+        }
+
+    def _lead_page(self, page_id: str) -> Optional[Dict]:
+        """Page dict (id, name, access_token) of a page ID - me/accounts is re-read for unknown pages only"""
+        with self._lead_lookup_lock:
+            if page_id not in self._lead_pages:
+                pages = self.pages_http.iter_edge('me/accounts', {'limit': LEADS_PAGE_SIZE}, ['id', 'name', 'access_token'])
+                self._lead_pages = {page.get('id'): page for page in pages}
+            return self._lead_pages.get(page_id)
+
+    def _lead_form_name(self, form_id: str, page: Dict) -> Optional[str]:
+        """Name of a lead form (cached per form)"""
+        with self._lead_lookup_lock:
+            if form_id not in self._lead_form_names:
+                form = self.pages_http.get_node(form_id, ['name'], access_token=page.get('access_token'))
+                self._lead_form_names[form_id] = form.get('name')
+            return self._lead_form_names[form_id]
+
+    def fetch_lead(self, lead_id: str, page_id: str, form_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        One lead by ID (e.g. from a leadgen webhook notification)
 
-                    leads = leads_resp.json().get('data', [])
-                    logger.info(f"Form '{form_name}': Retrieved {len(leads)} leads")
-
-                    for lead in leads:
-                        created_time_str = lead.get('created_time', '')
-                        if created_time_str:
-                            try:
-                                created_time = datetime.strptime(created_time_str, '%Y-%m-%dT%H:%M:%S%z')
-                            except:
-                                created_time = datetime.now()
-
-                            # Filter by date range
-                            if start_date <= created_time.replace(tzinfo=None) <= end_date:
-                                # Extract field data
-                                field_data = {}
-                                if 'field_data' in lead:
-                                    for field in lead['field_data']:
-                                        field_name = field.get('name', 'unknown')
-                                        field_value = field.get('values', [''])[0]
-                                        field_data[field_name] = field_value
-
-                                all_leads.append({
-                                    'lead_id': lead.get('id'),
-                                    'created_time': created_time.strftime('%Y-%m-%d %H:%M:%S'),
-                                    'form_name': form_name,
-                                    'page_name': page_name,
-                                    **field_data  # Add all form fields
-                                })
-
-            df = pd.DataFrame(all_leads)
-            logger.info(f"✅ Fetched {len(all_leads)} leads from last {days} days")
+        Args:
+            lead_id: Lead ID (leadgen_id of the notification)
+            page_id: Facebook page the lead form belongs to
+            form_id: Lead form ID (fallback if the lead does not return one)
+
+        Returns:
+            Lead dict for the lead store, None if the token has no access to the page
+
+        Raises:
+            FacebookRequestError: If the lead or its form could not be fetched
+        """
+        page = self._lead_page(page_id)
+        if page is None:
+            logger.warning(f"⚠️ Page {page_id} not accessible with this token - lead {lead_id} skipped")
+            return None
+
+        lead = self.pages_http.get_node(lead_id, LEAD_FIELDS + ['form_id'], access_token=page.get('access_token'))
+        form_id = lead.get('form_id') or form_id
+        form = {'id': form_id, 'name': self._lead_form_name(form_id, page) if form_id else None}
+        created_time = self._parse_lead_time(lead.get('created_time', '')) or datetime.now().astimezone()
+        return self._lead_record(lead, created_time, form, page)
+
+    def _fetch_page_forms(self, page: Dict) -> Optional[List[Dict]]:
+        """Lead forms of one Facebook page (every page of the edge, None on error)"""
+        try:
+            forms = list(self.pages_http.iter_edge(
+                f"{page.get('id')}/leadgen_forms", {'limit': LEADS_PAGE_SIZE}, ['id', 'name', 'status'],
+                access_token=page.get('access_token')
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to get forms for page {page.get('name')}: {redact_text(str(e))}")
+            return None
+
+        logger.info(f"Page '{page.get('name')}': Found {len(forms)} forms")
+        return forms
+
+    def _sync_form_leads(self, page: Dict, form: Dict, since: datetime, until: datetime) -> Optional[int]:
+        """
+        Pull the leads of one form newer than its watermark into the lead store
+
+        Args:
+            page: Facebook page dict (id, name, access_token)
+            form: Lead form dict (id, name)
+            since: Oldest time the store has to cover (timezone-aware)
+            until: Sync end (timezone-aware)
+
+        Returns:
+            Number of new leads (None if the form failed - its watermark stays)
+        """
+        form_name = form.get('name')
+        window_ts = self.lead_store.sync_window(form.get('id'), int(since.timestamp()))
+
+        try:
+            leads = self._fetch_form_leads(page, form, datetime.fromtimestamp(window_ts, timezone.utc), until)
+        except Exception as e:
+            logger.warning(f"Failed to get leads for form {form_name}: {redact_text(str(e))}")
+            return None
+
+        new_leads = self.lead_store.add_form_leads(form.get('id'), leads, window_ts)
+        logger.info(f"Form '{form_name}': Retrieved {len(leads)} leads, {new_leads} new")
+        return new_leads
+
+    def sync_leads(self, days: int = 7, since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+        """
+        Incrementally sync the leads of all forms of all pages into the lead store
+
+        Each form only requests leads newer than its watermark (or the part of
+        the last days it was never synced for). The forms of all pages are
+        fetched concurrently and every page of the edges is followed.
+
+        Args:
+            days: How far back the store has to be complete
+            since: Start of the window (default: until - days). Pass the caller's
+                   own start so the store is marked fresh for exactly that window
+            until: End of the window (default: now)
+
+        Returns:
+            Number of new leads
+        """
+        until = until or datetime.now().astimezone()
+        since = since or until - timedelta(days=days)
+
+        try:
+            pages = list(self.pages_http.iter_edge('me/accounts', {'limit': LEADS_PAGE_SIZE}, ['id', 'name', 'access_token']))
+        except Exception as e:
+            logger.error(f"Failed to get pages: {redact_text(str(e))}")
+            return 0
+
+        logger.info(f"Found {len(pages)} pages")
+        with self._lead_lookup_lock:
+            self._lead_pages = {page.get('id'): page for page in pages}
+
+        with ThreadPoolExecutor(max_workers=max(1, self.lead_form_workers)) as executor:
+            forms_per_page = list(executor.map(self._fetch_page_forms, pages))
+            form_jobs = [
+                executor.submit(self._sync_form_leads, page, form, since, until)
+                for page, forms in zip(pages, forms_per_page)
+                for form in forms or []
+            ]
+            results = [job.result() for job in form_jobs]
+
+        new_leads = sum(result for result in results if result is not None)
+        failed_pages = sum(1 for forms in forms_per_page if forms is None)
+        failed_forms = sum(1 for result in results if result is None)
+        if failed_pages or failed_forms:
+            # Keep the previous sync state - the next read syncs again and retries the failed ones
+            logger.warning(
+                f"⚠️ Lead sync incomplete: {failed_pages} pages and {failed_forms} forms failed, "
+                f"{new_leads} new leads stored"
+            )
+            return new_leads
+
+        self.lead_store.mark_synced(int(since.timestamp()))
+        logger.info(f"✅ Lead sync: {new_leads} new leads from {len(form_jobs)} forms ({self.lead_store.count()} stored)")
+        return new_leads
+
+    def fetch_leads_data(self, days: int = 7, force_refresh: bool = False) -> pd.DataFrame:
+        """
+        Fetch LIVE lead form data via Pages API (works with Instant Forms)
+
+        Leads are served from the local lead store. The store is synced
+        incrementally first (see sync_leads) if its last sync is older than the
+        leads cache TTL or did not reach back far enough. With META_LEAD_WEBHOOK
+        the webhook receiver keeps the store current and the sync only runs
+        every LEAD_WEBHOOK_RESYNC_HOURS.
+
+        Args:
+            days: Number of days to look back
+            force_refresh: Sync before reading even if the store is fresh
+
+        Returns:
+            DataFrame with lead details
+        """
+        until = datetime.now().astimezone()
+        since = until - timedelta(days=days)
+
+        if not self.api_initialized:
+            logger.warning("API not initialized - cannot fetch leads")
+            return self.lead_store.query(since)
+
+        try:
+            max_age_hours = LEAD_WEBHOOK_RESYNC_HOURS if self.lead_webhook else self.cache.ttl_for('leads')
+            if force_refresh or not self.lead_store.is_fresh(int(since.timestamp()), max_age_hours):
+                self._coalesced(
+                    f"leads_sync_{days}", partial(self.sync_leads, days, since, until),
+                    cached=lambda: 0 if self.lead_store.is_fresh(int(since.timestamp()), max_age_hours) else None
+                )
+            else:
+                logger.info("📦 Serving leads from lead store")
+
+            df = self.lead_store.query(since)
+            logger.info(f"✅ Fetched {len(df)} leads from last {days} days")
             return df
 
         except Exception as e:
@@ -670,22 +1684,89 @@ class MetaAdsClient:
 
     def clear_cache(self):
         """Clear all cached data"""
-        cache_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'cache')
-        if os.path.exists(cache_dir):
-            for file in os.listdir(cache_dir):
-                if file.endswith('.json'):
-                    try:
-                        os.remove(os.path.join(cache_dir, file))
-                        logger.info(f"Cleared cache: {file}")
-                    except:
-                        pass
+        self.cache.clear()
+        self.lead_store.mark_stale()
+
+    def _get_level_objects(self, level: str):
+        """Get fresh ads, adsets or campaigns of the account"""
+        if level == 'ad':
+            return self.account.get_ads(fields=[Ad.Field.name, Ad.Field.status])
+        elif level == 'adset':
+            return self.account.get_ad_sets(fields=['name', 'status'])
+        else:
+            return self.account.get_campaigns(fields=[Campaign.Field.name, Campaign.Field.status])
+
+    def _fetch_breakdown_pass(
+        self,
+        level: str,
+        time_range: Dict,
+        breakdowns: List[str],
+        fields: List[str],
+        get_objects: Optional[Callable[[], List]] = None
+    ) -> List[Dict]:
+        """
+        Fetch one breakdown pass of fetch_comprehensive_insights
+
+        Big passes run as ONE account-level async report job, all others
+        with one insights request per object.
+
+        Args:
+            level: 'ad', 'adset', or 'campaign'
+            time_range: Dict with 'since' and 'until' (YYYY-MM-DD)
+            breakdowns: Breakdown dimensions ([] for base insights)
+            fields: Insights fields
+            get_objects: Returns the objects of the level (shared between passes),
+                         defaults to listing them fresh
+
+        Returns:
+            List of insight dicts
+        """
+        params = {'time_range': time_range}
+        if breakdowns:
+            params['breakdowns'] = breakdowns
+
+        if self._should_use_async(level, time_range, breakdowns):
+            try:
+                insights = self._run_async_insights({**params, 'level': level}, fields)
+                return [dict(insight) for insight in insights]
+            except Exception as e:
+                if is_throttling_error(e):
+                    raise
+                logger.warning(f"⚠️ Async report job failed ({str(e)}) - falling back to per-object requests")
+
+        objects = get_objects() if get_objects else list(self._get_level_objects(level))
+        self._object_counts[level] = len(objects)
+
+        rows = []
+        for insights in self._fetch_object_insights(objects, params, fields):
+            if isinstance(insights, Exception):
+                raise insights
+            for insight in insights:
+                rows.append(dict(insight))
+
+        return rows
+
+    @staticmethod
+    def _breakdown_cache_key(
+        level: str,
+        result_key: str,
+        breakdowns: List[str],
+        fields: List[str],
+        start_date: str,
+        end_date: str
+    ) -> str:
+        """Cache key of one breakdown pass (field set hashed so a changed field list misses)"""
+        field_hash = hashlib.md5(','.join(list(fields) + list(breakdowns)).encode()).hexdigest()[:8]
+        return f"breakdowns_{level}_{result_key}_{start_date}_{end_date}_{field_hash}"
 
     def fetch_comprehensive_insights(
         self,
         days: int = 7,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        level: str = 'ad'
+        level: str = 'ad',
+        force_refresh: bool = False,
+        demographics: Optional[str] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         🔥 ULTIMATE FUNCTION - ALLE verfügbaren Meta Ads Insights mit Breakdowns!
@@ -706,9 +1787,13 @@ class MetaAdsClient:
             start_date: Start date in YYYY-MM-DD format (optional)
             end_date: End date in YYYY-MM-DD format (optional, defaults to TODAY)
             level: 'ad', 'adset', or 'campaign'
+            force_refresh: Always fetch fresh data (ignore cache)
+            demographics: How age-only and gender-only frames are built (see
+                          DEMOGRAPHICS_MODES), defaults to META_DEMOGRAPHICS_MODE
 
         Returns:
-            Dictionary mit allen Breakdowns:
+            Dictionary mit allen Breakdowns (ein Cache-Eintrag pro Breakdown,
+            fehlgeschlagene Breakdowns kommen als leeres DataFrame):
             {
                 'base': DataFrame mit Basis-Metriken,
                 'demographics_age': DataFrame mit Age-Breakdown,
@@ -809,165 +1894,119 @@ class MetaAdsClient:
             'website_ctr',
         ]
 
-        results = {}
+        demographics = (demographics or Config.get('META_DEMOGRAPHICS_MODE', 'derive')).lower()
+        if demographics not in DEMOGRAPHICS_MODES:
+            logger.warning(f"⚠️ Unknown demographics mode '{demographics}' - using 'derive'")
+            demographics = 'derive'
 
-        try:
-            # Helper function to get fresh objects for each breakdown
-            def get_objects():
-                if level == 'ad':
-                    return self.account.get_ads(fields=[Ad.Field.name, Ad.Field.status])
-                elif level == 'adset':
-                    return self.account.get_ad_sets(fields=['name', 'status'])
-                else:
-                    return self.account.get_campaigns(fields=[Campaign.Field.name, Campaign.Field.status])
-
-            # 1. BASE INSIGHTS (keine Breakdowns)
-            logger.info("📊 Fetching base insights...")
-            base_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    base_data.append(dict(insight))
-
-            results['base'] = pd.DataFrame(base_data)
-            logger.info(f"✅ Base insights: {len(base_data)} entries")
-
-            # 2. DEMOGRAPHICS - AGE
-            logger.info("👥 Fetching age demographics...")
-            age_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['age']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    age_data.append(dict(insight))
-
-            results['demographics_age'] = pd.DataFrame(age_data)
-            logger.info(f"✅ Age demographics: {len(age_data)} entries")
-
-            # 3. DEMOGRAPHICS - GENDER
-            logger.info("👥 Fetching gender demographics...")
-            gender_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['gender']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    gender_data.append(dict(insight))
-
-            results['demographics_gender'] = pd.DataFrame(gender_data)
-            logger.info(f"✅ Gender demographics: {len(gender_data)} entries")
-
-            # 4. DEMOGRAPHICS - AGE + GENDER (kombiniert!)
-            logger.info("👥 Fetching age+gender demographics...")
-            age_gender_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['age', 'gender']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    age_gender_data.append(dict(insight))
-
-            results['demographics_age_gender'] = pd.DataFrame(age_gender_data)
-            logger.info(f"✅ Age+Gender demographics: {len(age_gender_data)} entries")
-
-            # 5. GEOGRAPHIC - COUNTRY
-            logger.info("🌍 Fetching country breakdown...")
-            country_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['country']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    country_data.append(dict(insight))
-
-            results['geographic_country'] = pd.DataFrame(country_data)
-            logger.info(f"✅ Country breakdown: {len(country_data)} entries")
-
-            # 6. GEOGRAPHIC - REGION
-            logger.info("🌍 Fetching region breakdown...")
-            region_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['region']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    region_data.append(dict(insight))
-
-            results['geographic_region'] = pd.DataFrame(region_data)
-            logger.info(f"✅ Region breakdown: {len(region_data)} entries")
-
-            # 7. PLACEMENTS - Publisher Platform + Platform Position
-            logger.info("📱 Fetching placement breakdown...")
-            placement_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['publisher_platform', 'platform_position']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    placement_data.append(dict(insight))
-
-            results['placements'] = pd.DataFrame(placement_data)
-            logger.info(f"✅ Placement breakdown: {len(placement_data)} entries")
-
-            # 8. DEVICES - Impression Device (besser als device_platform)
-            logger.info("💻 Fetching device breakdown...")
-            device_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['impression_device']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    device_data.append(dict(insight))
-
-            results['devices'] = pd.DataFrame(device_data)
-            logger.info(f"✅ Device breakdown: {len(device_data)} entries")
-
-            # 9. HOURLY STATS
-            logger.info("🕐 Fetching hourly breakdown...")
-            hourly_data = []
-            for obj in get_objects():
-                insights = obj.get_insights(
-                    params={'time_range': time_range, 'breakdowns': ['hourly_stats_aggregated_by_advertiser_time_zone']},
-                    fields=standard_fields
-                )
-                for insight in insights:
-                    hourly_data.append(dict(insight))
-
-            results['hourly'] = pd.DataFrame(hourly_data)
-            logger.info(f"✅ Hourly breakdown: {len(hourly_data)} entries")
-
-            # CONVERT ALL STRINGS TO NUMBERS (Meta API returns everything as strings!)
-            logger.info("🔄 Converting Meta API strings to numbers...")
-            numeric_fields = [
-                'spend', 'impressions', 'reach', 'frequency', 'clicks',
-                'ctr', 'unique_ctr', 'inline_link_clicks', 'inline_link_click_ctr',
-                'unique_inline_link_clicks', 'unique_inline_link_click_ctr',
-                'unique_link_clicks_ctr', 'unique_clicks', 'inline_post_engagement',
-                'cpc', 'cpm', 'cpp', 'cost_per_inline_link_click',
-                'cost_per_inline_post_engagement', 'cost_per_unique_click',
-                'cost_per_unique_inline_link_click', 'cost_per_result',
-                'cost_per_thruplay', 'cost_per_15_sec_video_view',
-                'result_rate', 'link_clicks_per_results', 'video_view_per_impression',
-                'website_ctr'
+        # Derived breakdowns skip their own full pass (reach-only pass for 'derive_exact')
+        passes = [
+            (result_key, breakdowns, icon, label, standard_fields)
+            for result_key, breakdowns, icon, label in COMPREHENSIVE_BREAKDOWNS
+            if demographics == 'fetch' or result_key not in DERIVED_BREAKDOWNS
+        ]
+        if demographics == 'derive_exact':
+            passes += [
+                (f'{result_key}_reach', dimensions, '👥', f'{result_key} reach', REACH_PASS_FIELDS)
+                for result_key, (_, dimensions) in DERIVED_BREAKDOWNS.items()
             ]
 
-            for dataset_name, df in results.items():
+        results = {}
+
+        timings = {}
+
+        # List the objects ONCE (lazily, only if a pass needs them) and share them across passes
+        objects_lock = threading.Lock()
+        shared_objects = []
+
+        def get_objects():
+            with objects_lock:
+                if not shared_objects:
+                    shared_objects.append(list(self._get_level_objects(level)))
+                return shared_objects[0]
+
+        # Per-account cap so parallel sessions don't multiply the load on one account
+        account_semaphore = _get_account_semaphore(self.account_id, self.max_concurrent_per_account)
+
+        def run_pass(result_key, breakdowns, icon, label, fields):
+            # One cache entry per breakdown so a failed pass doesn't invalidate the others
+            cache_key = self._breakdown_cache_key(level, result_key, breakdowns, fields, start_date, end_date)
+            started = time.perf_counter()
+
+            def fetch_pass():
+                with account_semaphore:
+                    logger.info(f"{icon} Fetching {label}...")
+                    rows = self._fetch_breakdown_pass(level, time_range, breakdowns, fields, get_objects)
+                df = apply_schema(pd.DataFrame(rows))
                 if not df.empty:
-                    for field in numeric_fields:
-                        if field in df.columns:
-                            df[field] = pd.to_numeric(df[field], errors='coerce').fillna(0)
-                    logger.info(f"✅ Converted {dataset_name}: {len(df)} rows")
+                    df = DataProcessor.add_action_columns(df)
+                self._save_to_cache(cache_key, df)
+                return df
+
+            def from_cache(revalidate=None):
+                cached_df = self._load_from_cache(cache_key, revalidate=revalidate)
+                if cached_df is None or cached_df.empty:
+                    return cached_df
+                return DataProcessor.add_action_columns(apply_schema(cached_df))
+
+            if not force_refresh:
+                cached_df = from_cache(revalidate=fetch_pass)
+                if cached_df is not None:
+                    elapsed = time.perf_counter() - started
+                    logger.info(f"📦 {label}: {len(cached_df)} entries from cache")
+                    return cached_df, elapsed
+
+            try:
+                started = time.perf_counter()
+                df = self._coalesced(cache_key, fetch_pass, cached=from_cache)
+                elapsed = time.perf_counter() - started
+            except Exception as e:
+                logger.error(f"❌ {label} failed: {str(e)}")
+                return None, time.perf_counter() - started
+
+            logger.info(f"✅ {label}: {len(df)} entries ({elapsed:.1f}s)")
+            return df, elapsed
+
+        try:
+            started = time.perf_counter()
+
+            # Run all breakdown passes concurrently on a bounded worker pool
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    breakdown[0]: executor.submit(run_pass, *breakdown)
+                    for breakdown in passes
+                }
+                for result_key, future in futures.items():
+                    results[result_key], timings[result_key] = future.result()
+
+            if demographics != 'fetch':
+                for result_key, (source_key, dimensions) in DERIVED_BREAKDOWNS.items():
+                    source = results[source_key]
+                    reach_df = results.pop(f'{result_key}_reach', None)
+                    if source is None:
+                        results[result_key] = None
+                        continue
+                    results[result_key] = apply_schema(
+                        DataProcessor.derive_breakdown(source, dimensions, f'{level}_id', reach_df)
+                    )
+                    logger.info(f"🧮 {result_key}: {len(results[result_key])} entries derived from {source_key}")
+                results = {breakdown[0]: results[breakdown[0]] for breakdown in COMPREHENSIVE_BREAKDOWNS}
+
+            timings['total'] = time.perf_counter() - started
+            self.last_insights_timings = timings
+            logger.info(
+                f"⏱️ Breakdown passes finished in {timings['total']:.1f}s "
+                f"(slowest pass: {max(timings[key] for key in futures):.1f}s)"
+            )
+
+            failed = [key for key, df in results.items() if df is None]
+            if len(failed) == len(results):
+                logger.error("❌ All breakdown passes failed")
+                return {}
+            if failed:
+                logger.warning(f"⚠️ Failed breakdowns (returned empty): {', '.join(failed)}")
+                for key in failed:
+                    results[key] = pd.DataFrame()
 
             logger.info(f"🎉 COMPREHENSIVE INSIGHTS COMPLETE! Total datasets: {len(results)}")
 
@@ -0,0 +1,253 @@
+"""
+Rate Limiter
+Paces Graph API calls by Meta's usage headers and retries throttled calls
+"""
+import json
+import random
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Mapping, Optional
+from facebook_business.exceptions import FacebookRequestError
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Graph error codes meaning "slow down" (17 = user/account limit, 80000-80014 = business use case limits)
+THROTTLE_ERROR_CODES = {4, 17, 32, 613, 80000, 80003, 80004, 80014}
+
+# Response headers with usage in percent of the limit
+# x-business-use-case-usage: {"<business_id>": [{"type": ..., "call_count": 28, "total_cputime": 25,
+#                             "total_time": 25, "estimated_time_to_regain_access": 0}]}
+# x-ad-account-usage:        {"acc_id_util_pct": 9.67, "reset_time_duration": 0}
+# x-app-usage:               {"call_count": 1, "total_cputime": 1, "total_time": 1}
+# x-fb-ads-insights-throttle: {"app_id_util_pct": 0, "acc_id_util_pct": 0}
+USAGE_HEADERS = ('x-business-use-case-usage', 'x-ad-account-usage', 'x-app-usage', 'x-fb-ads-insights-throttle')
+USAGE_PERCENT_KEYS = ('call_count', 'total_cputime', 'total_time', 'acc_id_util_pct', 'app_id_util_pct')
+
+# Concurrency shrinks linearly from max at CONCURRENCY_START_PCT to 1 at CONCURRENCY_MIN_PCT
+DEFAULT_MAX_CONCURRENCY = 10
+CONCURRENCY_START_PCT = 50
+CONCURRENCY_MIN_PCT = 90
+
+# Delay before each call grows linearly from 0 at PACING_START_PCT to MAX_PACING_DELAY_SECONDS at 100%
+PACING_START_PCT = 75
+MAX_PACING_DELAY_SECONDS = 5.0
+
+# Retries of throttled calls: exponential backoff with jitter
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 120.0
+
+# Process-wide schedulers per ad account (all sessions share the account's limit)
+_rate_limiters: Dict[str, 'RateLimitScheduler'] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(account_id: str, **kwargs) -> 'RateLimitScheduler':
+    """Get (or create) the process-wide scheduler of an ad account"""
+    with _rate_limiters_lock:
+        if account_id not in _rate_limiters:
+            _rate_limiters[account_id] = RateLimitScheduler(**kwargs)
+        return _rate_limiters[account_id]
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """True for Graph errors that mean the rate limit was hit"""
+    return isinstance(error, FacebookRequestError) and error.api_error_code() in THROTTLE_ERROR_CODES
+
+
+class RateLimitScheduler:
+    """
+    Gate for Graph API calls of one ad account
+
+    Every call waits for a free slot (the number of slots shrinks as usage
+    rises), sleeps a pacing delay near the limit and is retried with
+    exponential backoff and jitter if Meta throttles it anyway. Usage is
+    read from the response headers of every call.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE_SECONDS,
+        backoff_max: float = BACKOFF_MAX_SECONDS,
+        max_pacing_delay: float = MAX_PACING_DELAY_SECONDS,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            max_concurrency: Concurrent calls while usage is low
+            max_retries: Retries of a throttled call before the error is raised
+            backoff_base: First backoff delay in seconds (doubles per retry)
+            backoff_max: Cap of the backoff delay in seconds
+            max_pacing_delay: Delay before each call at 100% usage
+            sleep: Sleep function (replaced in tests)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_pacing_delay = max_pacing_delay
+        self._sleep = sleep
+
+        self._cond = threading.Condition()
+        self._in_flight = 0
+
+        self.usage_pct = 0.0
+        self.usage: Dict[str, Dict] = {}
+        self.updated_at: Optional[datetime] = None
+        self.blocked_until = 0.0  # time.monotonic() until which no call is sent
+
+        self.calls = 0
+        self.throttled = 0
+        self.retries = 0
+
+    def concurrency_limit(self) -> int:
+        """Allowed concurrent calls at the current usage"""
+        if self.usage_pct <= CONCURRENCY_START_PCT:
+            return self.max_concurrency
+        if self.usage_pct >= CONCURRENCY_MIN_PCT:
+            return 1
+        share = (CONCURRENCY_MIN_PCT - self.usage_pct) / (CONCURRENCY_MIN_PCT - CONCURRENCY_START_PCT)
+        return max(1, round(1 + share * (self.max_concurrency - 1)))
+
+    def pacing_delay(self) -> float:
+        """Seconds to wait before the next call at the current usage"""
+        if self.usage_pct <= PACING_START_PCT:
+            return 0.0
+        share = min(1.0, (self.usage_pct - PACING_START_PCT) / (100 - PACING_START_PCT))
+        return share * self.max_pacing_delay
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for retry number attempt (0-based)"""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def update(self, headers: Optional[Mapping]) -> None:
+        """
+        Read usage from the response headers of a call
+
+        Args:
+            headers: Response headers (case-insensitive names)
+        """
+        if not headers:
+            return
+
+        headers = {str(name).lower(): value for name, value in headers.items()}
+        usage = {}
+        regain_seconds = 0.0
+        for name in USAGE_HEADERS:
+            if name not in headers:
+                continue
+            try:
+                value = json.loads(headers[name])
+            except (TypeError, ValueError):
+                continue
+
+            # x-business-use-case-usage nests one list of entries per business ID
+            entries = [entry for values in value.values() for entry in values] \
+                if name == 'x-business-use-case-usage' and isinstance(value, dict) else [value]
+            for entry in entries:
+                if not isinstance(entry, dict):
+                    continue
+                for key in USAGE_PERCENT_KEYS:
+                    if isinstance(entry.get(key), (int, float)):
+                        usage.setdefault(name, {})[key] = max(usage.get(name, {}).get(key, 0), float(entry[key]))
+                regain_seconds = max(regain_seconds, float(entry.get('estimated_time_to_regain_access') or 0) * 60)
+                if float(entry.get('acc_id_util_pct') or 0) >= 100:
+                    regain_seconds = max(regain_seconds, float(entry.get('reset_time_duration') or 0))
+
+        if not usage:
+            return
+
+        with self._cond:
+            self.usage = usage
+            self.usage_pct = max(value for values in usage.values() for value in values.values())
+            self.updated_at = datetime.now()
+            if regain_seconds:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + regain_seconds)
+            self._cond.notify_all()
+
+    def _acquire(self) -> None:
+        with self._cond:
+            while True:
+                wait = self.blocked_until - time.monotonic()
+                if wait <= 0 and self._in_flight < self.concurrency_limit():
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self._in_flight += 1
+            self.calls += 1
+
+        delay = self.pacing_delay()
+        if delay:
+            self._sleep(delay)
+
+    def _release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """
+        Run one Graph call through the scheduler
+
+        Args:
+            func: Call returning a FacebookResponse (e.g. FacebookAdsApi.call)
+
+        Returns:
+            Result of func
+
+        Raises:
+            FacebookRequestError: Still throttled after max_retries, or any other error
+        """
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                response = func(*args, **kwargs)
+            except FacebookRequestError as e:
+                self.update(e.http_headers())
+                if not is_throttling_error(e) or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                with self._cond:
+                    self.throttled += 1
+                    self.retries += 1
+                logger.warning(
+                    f"⏳ Rate limit hit (code {e.api_error_code()}) - retry {attempt + 1}/{self.max_retries} in {delay:.1f}s"
+                )
+            else:
+                self.update(response.headers() if hasattr(response, 'headers') else None)
+                return response
+            finally:
+                self._release()
+
+            self._sleep(delay)
+            attempt += 1
+
+    def install(self, api) -> None:
+        """Route every call of a FacebookAdsApi instance through this scheduler (replaces an earlier one)"""
+        if not hasattr(api, '_unscheduled_call'):
+            api._unscheduled_call = api.call
+        api.call = lambda *args, **kwargs: self.call(api._unscheduled_call, *args, **kwargs)
+
+    def status(self) -> Dict:
+        """Current usage, limits and counters (for the Settings page)"""
+        with self._cond:
+            return {
+                'usage_pct': self.usage_pct,
+                'usage': {name: dict(values) for name, values in self.usage.items()},
+                'updated_at': self.updated_at,
+                'concurrency_limit': self.concurrency_limit(),
+                'max_concurrency': self.max_concurrency,
+                'pacing_delay': self.pacing_delay(),
+                'blocked_seconds': max(0.0, self.blocked_until - time.monotonic()),
+                'in_flight': self._in_flight,
+                'calls': self.calls,
+                'throttled': self.throttled,
+                'retries': self.retries,
+            }
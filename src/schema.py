@@ -0,0 +1,192 @@
+"""
+Insight Schema
+Central dtype registry for Meta insight fields, applied once when frames are built
+"""
+import logging
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+from src.data_processor import extract_numeric_values
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Compact dtypes:
+# 'category' = IDs, names, dates and enums (few distinct values, repeated on every row)
+# 'int32'    = counts (falls back to int64 if a value does not fit)
+# 'float64'  = currency amounts (summed and shown to the cent)
+# 'float32'  = rates and ratios (display precision only)
+# 'object'   = nested [{"action_type": ..., "value": ...}] lists, left untouched
+INSIGHT_SCHEMA = {
+    # IDs & Names & Dates
+    'account_id': 'category',
+    'account_name': 'category',
+    'account_currency': 'category',
+    'ad_id': 'category',
+    'ad_name': 'category',
+    'adset_id': 'category',
+    'adset_name': 'category',
+    'campaign_id': 'category',
+    'campaign_name': 'category',
+    'date_start': 'category',
+    'date_stop': 'category',
+    'created_time': 'category',
+    'updated_time': 'category',
+
+    # Basic Metrics
+    'spend': 'float64',
+    'impressions': 'int32',
+    'reach': 'int32',
+    'frequency': 'float32',
+    'clicks': 'int32',
+
+    # CTR & Engagement
+    'ctr': 'float32',
+    'unique_ctr': 'float32',
+    'inline_link_clicks': 'int32',
+    'inline_link_click_ctr': 'float32',
+    'unique_inline_link_clicks': 'int32',
+    'unique_inline_link_click_ctr': 'float32',
+    'unique_link_clicks_ctr': 'float32',
+    'unique_clicks': 'int32',
+    'inline_post_engagement': 'int32',
+    'website_ctr': 'object',
+    'unique_actions': 'object',
+    'actions': 'object',
+    'result_rate': 'object',
+
+    # Costs
+    'cpc': 'float64',
+    'cpm': 'float64',
+    'cpp': 'float64',
+    'cost_per_inline_link_click': 'float64',
+    'cost_per_inline_post_engagement': 'float64',
+    'cost_per_unique_click': 'float64',
+    'cost_per_unique_inline_link_click': 'float64',
+    'cost_per_action_type': 'object',
+    'cost_per_unique_action_type': 'object',
+    'cost_per_result': 'object',
+    'cost_per_thruplay': 'object',
+    'cost_per_15_sec_video_view': 'object',
+    'link_clicks_per_results': 'object',
+
+    # Results & Performance
+    'results': 'object',
+    'result_values_performance_indicator': 'object',
+
+    # Video Metrics
+    'video_play_actions': 'object',
+    'video_play_curve_actions': 'object',
+    'video_avg_time_watched_actions': 'object',
+    'video_15_sec_watched_actions': 'object',
+    'video_30_sec_watched_actions': 'object',
+    'video_p25_watched_actions': 'object',
+    'video_p50_watched_actions': 'object',
+    'video_p75_watched_actions': 'object',
+    'video_p95_watched_actions': 'object',
+    'video_p100_watched_actions': 'object',
+    'video_thruplay_watched_actions': 'object',
+    'video_view_per_impression': 'object',
+    'unique_video_view_15_sec': 'object',
+
+    # Quality & Rankings
+    'quality_ranking': 'category',
+    'engagement_rate_ranking': 'category',
+    'conversion_rate_ranking': 'category',
+
+    # Attribution & Config
+    'attribution_setting': 'category',
+    'buying_type': 'category',
+    'objective': 'category',
+    'optimization_goal': 'category',
+    'creative_media_type': 'category',
+
+    # Breakdown dimensions
+    'age': 'category',
+    'gender': 'category',
+    'country': 'category',
+    'region': 'category',
+    'publisher_platform': 'category',
+    'platform_position': 'category',
+    'impression_device': 'category',
+    'hourly_stats_aggregated_by_advertiser_time_zone': 'category',
+}
+
+_INT32_MIN, _INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+
+def apply_schema(df: pd.DataFrame, schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Convert the known insight columns of a frame to their compact dtype
+
+    Numeric fields accept Meta strings, numbers and [{"value": ...}] lists
+    (missing/invalid values become 0). Columns already in their target dtype
+    are skipped, so applying the schema to a cached frame again is cheap.
+
+    Args:
+        df: Insights DataFrame (modified in place)
+        schema: Field -> dtype mapping (default: INSIGHT_SCHEMA)
+
+    Returns:
+        The same DataFrame
+    """
+    if df.empty:
+        return df
+
+    for column, dtype in (schema or INSIGHT_SCHEMA).items():
+        if column not in df.columns or dtype == 'object':
+            continue
+
+        series = df[column]
+        if dtype == 'category':
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                try:
+                    df[column] = series.astype('category')
+                except TypeError:
+                    # Unhashable values (e.g. lists) - keep the column as it is
+                    logger.warning(f"⚠️ Schema: {column} has unhashable values, kept as {series.dtype}")
+            continue
+
+        if series.dtype == dtype:
+            continue
+
+        values = extract_numeric_values(series).fillna(0).to_numpy()
+        if dtype == 'int32':
+            values = np.rint(values)
+            if len(values) and (values.min() < _INT32_MIN or values.max() > _INT32_MAX):
+                dtype = 'int64'
+        df[column] = values.astype(dtype)
+
+    return df
+
+
+def frame_memory_bytes(df: pd.DataFrame) -> int:
+    """Deep memory footprint of a frame in bytes (object/string contents included)"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def memory_report(frames: Dict[str, pd.DataFrame], schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Per-frame memory footprint before and after applying the schema
+
+    Args:
+        frames: Name -> DataFrame as built without the schema (left unchanged)
+        schema: Field -> dtype mapping (default: INSIGHT_SCHEMA)
+
+    Returns:
+        DataFrame with columns frame, rows, columns, before_mb, after_mb, saved_pct
+    """
+    records = []
+    for name, df in frames.items():
+        before = frame_memory_bytes(df)
+        after = frame_memory_bytes(apply_schema(df.copy(), schema))
+        records.append({
+            'frame': name,
+            'rows': len(df),
+            'columns': len(df.columns),
+            'before_mb': round(before / 1024 / 1024, 2),
+            'after_mb': round(after / 1024 / 1024, 2),
+            'saved_pct': round((1 - after / before) * 100, 1) if before else 0.0,
+        })
+    return pd.DataFrame(records, columns=['frame', 'rows', 'columns', 'before_mb', 'after_mb', 'saved_pct'])
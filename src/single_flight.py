@@ -0,0 +1,106 @@
+"""
+Single Flight
+Coalesces concurrent identical fetches (same key) into one in-flight call
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_single_flight: Optional['SingleFlight'] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> 'SingleFlight':
+    """Process-wide single-flight group (shared by the clients of all Streamlit sessions)"""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
+
+
+class _Call:
+    """One in-flight call and the callers waiting for it"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Duplicate call suppression per key
+
+    The first caller of a key runs the function, every caller arriving while
+    it is in flight waits and gets the same result (or exception). The key is
+    forgotten as soon as the call returns - results are not cached here.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run func once for all concurrent callers of key
+
+        Args:
+            key: Identity of the call (e.g. account and cache key)
+            func: Function to run
+            *args, **kwargs: Arguments of func
+
+        Returns:
+            (result, shared) - shared is True if the result came from another
+            caller's call (callers must not mutate it)
+
+        Raises:
+            Whatever func raised, in every caller of that flight
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            logger.info(f"🔗 Waiting for in-flight fetch of {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, call.waiters > 0
+
+    def stats(self) -> Dict:
+        """Executed and coalesced calls (for the Settings page)"""
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'in_flight': len(self._calls),
+            }
@@ -0,0 +1,206 @@
+"""
+Cache Warm-up
+Pre-fetches the date ranges the dashboard uses so the first visit finds warm
+cache entries instead of paying the full Meta API cost
+
+Run once (e.g. from cron) or let it repeat on its own schedule:
+
+    python -m src.warmup
+    python -m src.warmup --every 30
+"""
+import argparse
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from src.rate_limiter import PACING_START_PCT
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (target, days) in priority order: what the Home page renders first, the other
+# selectable ranges, leads, and last the expensive comprehensive breakdown passes.
+# One leads sync over 60 days covers every range of the Leads page.
+WARMUP_PLAN: List[Tuple[str, int]] = [
+    ('ads', 30), ('campaigns', 30),
+    ('ads', 7), ('ads', 14), ('ads', 60), ('ads', 90),
+    ('campaigns', 7), ('campaigns', 14), ('campaigns', 60), ('campaigns', 90),
+    ('leads', 60),
+    ('comprehensive', 7), ('comprehensive', 30),
+]
+
+WARMUP_TARGETS = ('ads', 'campaigns', 'leads', 'comprehensive')
+
+# Stop the run above this API usage and leave the budget to dashboard users
+# (the remaining keys are warmed by the next run)
+DEFAULT_MAX_USAGE_PCT = PACING_START_PCT
+
+# Repeat interval of the scheduler - keep it below the shortest cache TTL (ads: 1h)
+DEFAULT_INTERVAL_MINUTES = 30
+
+
+def _fetch(client, target: str, days: int) -> int:
+    """Fetch one plan entry through the client's cached methods, returns the number of rows"""
+    if target == 'ads':
+        return len(client.fetch_ad_performance(days=days))
+    if target == 'campaigns':
+        return len(client.fetch_campaign_data(days=days))
+    if target == 'leads':
+        return len(client.fetch_leads_data(days=days))
+    if target == 'comprehensive':
+        return sum(len(df) for df in client.fetch_comprehensive_insights(days=days, level='ad').values())
+    raise ValueError(f"Unknown warm-up target '{target}' (use one of {', '.join(WARMUP_TARGETS)})")
+
+
+def _api_calls(client) -> int:
+    """Graph calls sent so far (ad account scheduler + Pages API transport of the leads)"""
+    return client.rate_limit_status()['calls'] + client.pages_http.requests_sent
+
+
+def run_warmup(
+    client,
+    plan: Optional[List[Tuple[str, int]]] = None,
+    max_usage_pct: Optional[float] = None
+) -> List[Dict]:
+    """
+    Warm the cache for every plan entry in order
+
+    Entries that are still fresh are served from the cache (no API calls),
+    expired or missing ones are fetched and stored. Every Graph call goes
+    through the client's rate limiter; above max_usage_pct the run stops.
+
+    Args:
+        client: MetaAdsClient
+        plan: (target, days) entries, defaults to WARMUP_PLAN
+        max_usage_pct: API usage at which the run stops, defaults to META_WARMUP_MAX_USAGE_PCT
+
+    Returns:
+        One dict per processed entry: target, days, seconds, api_calls, rows, error
+    """
+    if not client.api_initialized:
+        logger.error("❌ API not initialized - nothing to warm up")
+        return []
+
+    plan = WARMUP_PLAN if plan is None else plan
+    if max_usage_pct is None:
+        max_usage_pct = float(Config.get('META_WARMUP_MAX_USAGE_PCT', DEFAULT_MAX_USAGE_PCT))
+
+    # Background refreshes would die with this process - fetch expired entries in the foreground
+    stale_while_revalidate = client.stale_while_revalidate
+    client.stale_while_revalidate = False
+
+    results = []
+    started = time.perf_counter()
+    try:
+        for index, (target, days) in enumerate(plan):
+            status = client.rate_limit_status()
+            if status['usage_pct'] >= max_usage_pct or status['blocked_seconds'] > 0:
+                logger.warning(
+                    f"⏸️ API usage at {status['usage_pct']:.0f}% - leaving {len(plan) - index} "
+                    f"entries for the next run"
+                )
+                break
+
+            calls_before = _api_calls(client)
+            task_started = time.perf_counter()
+            result = {'target': target, 'days': days, 'rows': 0, 'error': None}
+            try:
+                result['rows'] = _fetch(client, target, days)
+            except Exception as e:
+                result['error'] = str(e)
+            result['seconds'] = time.perf_counter() - task_started
+            result['api_calls'] = _api_calls(client) - calls_before
+            results.append(result)
+
+            label = f"{target} {days}d"
+            if result['error']:
+                logger.warning(f"⚠️ {label}: failed after {result['seconds']:.2f}s - {result['error']}")
+            else:
+                source = f"{result['api_calls']} API calls" if result['api_calls'] else 'cache'
+                logger.info(f"⏱️ {label}: {result['seconds']:.2f}s ({source}, {result['rows']} rows)")
+    finally:
+        client.stale_while_revalidate = stale_while_revalidate
+
+    fetched = sum(1 for result in results if result['api_calls'] and not result['error'])
+    failed = sum(1 for result in results if result['error'])
+    logger.info(
+        f"🔥 Warm-up done in {time.perf_counter() - started:.1f}s: {len(results)}/{len(plan)} entries, "
+        f"{fetched} fetched, {len(results) - fetched - failed} already warm, {failed} failed"
+    )
+    return results
+
+
+def run_scheduled(
+    client,
+    interval_minutes: float,
+    plan: Optional[List[Tuple[str, int]]] = None,
+    stop: Optional[threading.Event] = None,
+    runs: Optional[int] = None
+) -> int:
+    """
+    Run the warm-up every interval_minutes (measured from the start of each run)
+
+    Args:
+        client: MetaAdsClient
+        interval_minutes: Minutes between the starts of two runs
+        plan: (target, days) entries, defaults to WARMUP_PLAN
+        stop: Event ending the schedule (e.g. set from a signal handler)
+        runs: Stop after this many runs (None = until stopped)
+
+    Returns:
+        Number of runs
+    """
+    stop = stop or threading.Event()
+    count = 0
+    while not stop.is_set():
+        run_started = time.monotonic()
+        run_warmup(client, plan)
+        count += 1
+        if runs is not None and count >= runs:
+            break
+
+        wait = max(0.0, interval_minutes * 60 - (time.monotonic() - run_started))
+        logger.info(f"💤 Next warm-up in {wait / 60:.1f} min")
+        stop.wait(wait)
+    return count
+
+
+def _parse_plan(only: Optional[str]) -> List[Tuple[str, int]]:
+    """WARMUP_PLAN restricted to comma-separated targets (e.g. 'ads,campaigns')"""
+    if not only:
+        return WARMUP_PLAN
+    targets = {target.strip() for target in only.split(',') if target.strip()}
+    unknown = targets - set(WARMUP_TARGETS)
+    if unknown:
+        raise ValueError(f"Unknown warm-up target(s) {', '.join(sorted(unknown))} (use {', '.join(WARMUP_TARGETS)})")
+    return [(target, days) for target, days in WARMUP_PLAN if target in targets]
+
+
+if __name__ == '__main__':
+    from src.meta_ads_client import MetaAdsClient
+
+    parser = argparse.ArgumentParser(description='Pre-fetch the dashboard date ranges into the cache')
+    parser.add_argument(
+        '--every', type=float, metavar='MINUTES',
+        default=float(Config.get('META_WARMUP_INTERVAL_MINUTES', 0)),
+        help=f'Repeat every MINUTES (0 = run once, suggested: {DEFAULT_INTERVAL_MINUTES})'
+    )
+    parser.add_argument('--only', metavar='TARGETS', help=f"Comma-separated subset of {','.join(WARMUP_TARGETS)}")
+    args = parser.parse_args()
+
+    try:
+        plan = _parse_plan(args.only)
+    except ValueError as e:
+        parser.error(str(e))
+
+    client = MetaAdsClient()
+    if args.every > 0:
+        try:
+            run_scheduled(client, args.every, plan)
+        except KeyboardInterrupt:
+            pass
+    else:
+        results = run_warmup(client, plan)
+        raise SystemExit(1 if not results or any(result['error'] for result in results) else 0)
@@ -0,0 +1,119 @@
+"""
+Test: Prozessweite Obergrenze paralleler Breakdown-Passes pro Ad Account -
+mehrere Sessions (Clients) teilen sich die Grenze, Laufzeiten pro Pass
+werden festgehalten (lokaler Fake Graph Server, kein Meta Account nötig)
+
+Usage:
+    python test_account_concurrency.py
+    python -m pytest -q test_account_concurrency.py
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import (
+    MetaAdsClient, COMPREHENSIVE_BREAKDOWNS, DERIVED_BREAKDOWNS,
+    MAX_BREAKDOWN_WORKERS, MAX_CONCURRENT_PASSES_PER_ACCOUNT, _get_account_semaphore
+)
+from fake_graph_server import FakeGraphServer
+
+PASS_SECONDS = 0.2
+
+
+class SlowPasses:
+    """Wraps _fetch_breakdown_pass of clients: every pass takes PASS_SECONDS, peak concurrency is recorded"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def wrap(self, client: MetaAdsClient) -> None:
+        fetch_pass = client._fetch_breakdown_pass
+
+        def slow_pass(*args, **kwargs):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            try:
+                time.sleep(PASS_SECONDS)
+                return fetch_pass(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+        client._fetch_breakdown_pass = slow_pass
+
+
+def test_cap_is_shared_by_clients_of_one_account():
+    assert MAX_CONCURRENT_PASSES_PER_ACCOUNT < MAX_BREAKDOWN_WORKERS
+
+    # Own account id: the semaphore is shared per account in the process
+    server = FakeGraphServer(n_ads=3, account_id='act_cap').start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            slow = SlowPasses()
+            clients = []
+            for session in range(2):
+                client = MetaAdsClient(
+                    access_token='test-token', account_id=server.account_id, graph_url=server.url,
+                    cache_dir=os.path.join(cache_dir, str(session))  # no shared cache entries
+                )
+                slow.wrap(client)
+                clients.append(client)
+
+            results = [None, None]
+            threads = [
+                threading.Thread(target=lambda i=i: results.__setitem__(i, clients[i].fetch_comprehensive_insights(days=7)))
+                for i in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert slow.peak == MAX_CONCURRENT_PASSES_PER_ACCOUNT, f"peak {slow.peak}"
+            fetched = [key for key, *_ in COMPREHENSIVE_BREAKDOWNS if key not in DERIVED_BREAKDOWNS]
+            for client, result in zip(clients, results):
+                assert set(result) == {key for key, *_ in COMPREHENSIVE_BREAKDOWNS}
+                assert set(client.last_insights_timings) == set(fetched) | {'total'}
+                assert all(client.last_insights_timings[key] >= PASS_SECONDS for key in fetched)
+                assert client.last_insights_timings['total'] >= max(client.last_insights_timings[key] for key in fetched)
+    finally:
+        server.stop()
+
+
+def test_first_limit_wins_per_account():
+    semaphore = _get_account_semaphore('act_limit', 2)
+    assert _get_account_semaphore('act_limit', 5) is semaphore
+    assert semaphore.acquire(blocking=False) and semaphore.acquire(blocking=False)
+    assert not semaphore.acquire(blocking=False)
+    semaphore.release()
+    semaphore.release()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 ACCOUNT CONCURRENCY TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_cap_is_shared_by_clients_of_one_account,
+        test_first_limit_wins_per_account,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,101 @@
+"""
+Test: Normalisierte Actions-Tabelle (Long-Format) und vorab geparste Action-Spalten
+
+Usage:
+    python test_actions_table.py
+    python -m pytest -q test_actions_table.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor, ACTION_VALUE_COLUMNS
+
+
+def make_insights() -> pd.DataFrame:
+    return pd.DataFrame({
+        'ad_id': ['1', '2', '3'],
+        'date_start': ['2025-01-01'] * 3,
+        'actions': [
+            [{'action_type': 'lead', 'value': '4'}, {'action_type': 'link_click', 'value': '20'}],
+            [{'action_type': 'link_click', 'value': '7'}, {'action_type': 'lead', 'value': '1'},
+             {'action_type': 'lead', 'value': '2'}],
+            None,
+        ],
+        'cost_per_action_type': [[{'action_type': 'lead', 'value': '12.5'}], [], np.nan],
+        'video_play_actions': [[{'action_type': 'video_view', 'value': '300'}], None, None],
+    }, index=[10, 20, 30])
+
+
+def test_build_actions_table():
+    table = DataProcessor.build_actions_table(make_insights(), 'ad_id')
+
+    assert list(table.columns) == ['row', 'object_id', 'date_start', 'field', 'action_type', 'value']
+    assert len(table) == 7
+    assert table['value'].dtype == np.float64
+    assert table['action_type'].dtype == 'category'
+
+    cost = table[table['field'] == 'cost_per_action_type']
+    assert cost['row'].tolist() == [10]
+    assert cost['object_id'].tolist() == ['1']
+    assert cost['value'].tolist() == [12.5]
+
+    empty = DataProcessor.build_actions_table(pd.DataFrame({'ad_id': ['1']}), 'ad_id')
+    assert empty.empty
+
+
+def test_pivot_actions():
+    df = make_insights()
+    table = DataProcessor.build_actions_table(df, 'ad_id')
+
+    wide = DataProcessor.pivot_actions(table, 'actions', index=df.index)
+    # Duplicate action types of one row are summed
+    assert wide.loc[20, 'lead'] == 3
+    assert wide.loc[30].tolist() == [0, 0]
+
+    wide = DataProcessor.pivot_actions(table, 'actions', ['lead', 'purchase'], index=df.index, fill_value=None)
+    assert list(wide.columns) == ['lead', 'purchase']
+    assert wide['lead'].tolist()[:2] == [4, 3]
+    assert wide['purchase'].isna().all()
+
+
+def test_add_action_columns():
+    df = DataProcessor.add_action_columns(make_insights())
+
+    for column in ACTION_VALUE_COLUMNS:
+        assert df[column].dtype == np.int64, column
+    assert df['leads_extracted'].tolist() == [4, 3, 0]
+    assert df['link_clicks_action'].tolist() == [20, 7, 0]
+    assert df['video_plays_3s'].tolist() == [300, 0, 0]
+    assert df['thru_plays'].tolist() == [0, 0, 0]
+
+    # Existing columns (e.g. from a cached frame) are kept
+    cached = pd.DataFrame({'actions': [[{'action_type': 'lead', 'value': '9'}]], 'leads_extracted': [5]})
+    assert DataProcessor.add_action_columns(cached)['leads_extracted'].tolist() == [5]
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 ACTIONS TABLE TEST")
+    print("=" * 80)
+
+    tests = [
+        test_build_actions_table,
+        test_pivot_actions,
+        test_add_action_columns,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
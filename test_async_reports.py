@@ -0,0 +1,111 @@
+"""
+Test: Async insights report jobs gegen lokalen Fake Graph Server
+(kein Meta Account nötig)
+
+Usage:
+    python test_async_reports.py
+    python -m pytest -q test_async_reports.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient
+from fake_graph_server import FakeGraphServer
+
+
+def make_client(server, cache_dir):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+    client.async_poll_initial = 0.01
+    client.async_poll_max = 0.05
+    client._save_to_cache = lambda *args, **kwargs: None
+    return client
+
+
+def test_large_range_uses_async_job():
+    server = FakeGraphServer(n_ads=120, page_size=50).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            df = client.fetch_ad_performance(days=90, force_refresh=True)
+
+            assert len(df) == 120
+            assert int(df['leads_extracted'].sum()) == 240
+            assert server.count('POST', r'/act_123/insights$') == 1
+            # Job polled until 'Job Completed' (3 states), result streamed in pages of 500
+            assert server.count('GET', r'/9\d{5}/?$') == 3
+            assert server.count('GET', r'/9\d{5}/insights$') == 1
+    finally:
+        server.stop()
+
+
+def test_small_range_stays_synchronous():
+    server = FakeGraphServer(n_ads=30).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            df = client.fetch_ad_performance(days=7, force_refresh=True)
+
+            assert len(df) == 30
+            assert server.count('POST') == 0
+            assert server.count('GET', r'/act_123/insights$') == 1
+    finally:
+        server.stop()
+
+
+def test_failed_job_falls_back_to_per_object_requests():
+    server = FakeGraphServer(n_ads=5, job_states=['Job Running', 'Job Failed']).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            rows = client._fetch_breakdown_pass(
+                'ad', {'since': '2024-08-01', 'until': '2024-10-29'}, ['age'], ['spend', 'impressions']
+            )
+
+            # 5 ads x 4 age groups, fetched per ad after the job failed
+            assert len(rows) == 20
+            assert server.count('POST') == 1
+            assert server.count('GET', r'/10\d\d/insights$') == 5
+    finally:
+        server.stop()
+
+
+def test_row_estimate_triggers_async_for_breakdowns():
+    server = FakeGraphServer(n_ads=3).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            time_range = {'since': '2024-10-01', 'until': '2024-10-07'}
+            client._object_counts['ad'] = 1000
+
+            assert not client._should_use_async('ad', time_range, ['age'])
+            assert client._should_use_async('ad', time_range, ['hourly_stats_aggregated_by_advertiser_time_zone'])
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 ASYNC REPORT JOBS TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_large_range_uses_async_job,
+        test_small_range_stays_synchronous,
+        test_failed_job_falls_back_to_per_object_requests,
+        test_row_estimate_triggers_async_for_breakdowns,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
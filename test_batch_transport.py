@@ -0,0 +1,95 @@
+"""
+Test: Graph Batch API transport gegen lokalen Fake Graph Server
+(kein Meta Account nötig)
+
+Usage:
+    python test_batch_transport.py
+    python -m pytest -q test_batch_transport.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient
+from fake_graph_server import FakeGraphServer
+
+TIME_RANGE = {'since': '2024-10-01', 'until': '2024-10-07'}
+FIELDS = ['ad_id', 'spend', 'impressions']
+
+
+def make_client(server, cache_dir, transport='batch'):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, transport=transport, cache_dir=cache_dir)
+    client._load_from_cache = lambda *args, **kwargs: None
+    client._save_to_cache = lambda *args, **kwargs: None
+    return client
+
+
+def test_batch_groups_50_objects_per_call():
+    server = FakeGraphServer(n_ads=120).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            rows = client._fetch_breakdown_pass('ad', TIME_RANGE, [], FIELDS)
+
+            assert len(rows) == 120
+            assert server.count('POST', r'^/v\d+\.\d+/?$') == 3  # 50 + 50 + 20
+            assert server.count('GET', r'/insights$') == 0
+    finally:
+        server.stop()
+
+
+def test_failed_sub_request_is_retried_alone():
+    server = FakeGraphServer(n_ads=10, n_campaigns=10, failing_objects=['5003']).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            df = client.fetch_campaign_data(days=7)
+
+            # Failing campaign is retried once as single call and then skipped
+            assert len(df) == 9
+            assert server.count('GET', r'/5003/insights$') == 1
+            assert server.count('GET', r'/50(0[0-2]|0[4-9])/insights$') == 0
+    finally:
+        server.stop()
+
+
+def test_failed_batch_falls_back_to_single_calls():
+    server = FakeGraphServer(n_ads=8, fail_batches=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            rows = client._fetch_breakdown_pass('ad', TIME_RANGE, ['gender'], FIELDS)
+
+            assert len(rows) == 24
+            assert server.count('POST') == 1
+            assert server.count('GET', r'/10\d\d/insights$') == 8
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    import warnings
+    logging.disable(logging.INFO)
+    warnings.simplefilter('ignore')
+
+    print("=" * 80)
+    print("🔍 BATCH TRANSPORT TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_batch_groups_50_objects_per_call,
+        test_failed_sub_request_is_retried_alone,
+        test_failed_batch_falls_back_to_single_calls,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
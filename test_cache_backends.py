@@ -0,0 +1,177 @@
+"""
+Test: Parquet Cache Backend - Round-Trip von save/load/save_batches (verschachtelte
+Action-Listen, Kategorien, Integer, gemischte Spalten) und Migration alter
+JSON-Einträge (kein Meta Account nötig)
+
+Usage:
+    python test_cache_backends.py
+    python -m pytest -q test_cache_backends.py
+"""
+import sys
+import os
+import tempfile
+from datetime import datetime
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+from src.cache_backends import JsonCacheBackend, ParquetCacheBackend, load_legacy_entry, migrate_json_cache
+
+TIMESTAMP = datetime(2024, 10, 1, 12, 30)
+
+
+def sample_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'ad_id': ['1', '2', '3'],
+        'impressions': [1000, 250, 0],
+        'spend': [12.5, 3.0, 0.0],
+        'placement': pd.Categorical(['feed', 'story', 'feed']),
+        # Meta omits struct fields per entry (attribution windows, 1d_click, ...)
+        'actions': [
+            [{'action_type': 'lead', 'value': '3'}, {'action_type': 'link_click', 'value': '12', '1d_click': '10'}],
+            [{'action_type': 'link_click', 'value': '4'}],
+            None,
+        ],
+        'results': [
+            [{'indicator': 'actions:lead', 'values': [{'value': '3', 'attribution_windows': ['7d_click']}]}],
+            [{'indicator': 'actions:lead', 'values': [{'value': '1'}]}],
+            None,
+        ],
+    })
+
+
+def mixed_frame() -> pd.DataFrame:
+    # Arrow can't type these - stored as JSON strings
+    return pd.DataFrame({
+        'ad_id': ['1', '2', '3'],
+        'unique_link_clicks_ctr': ['2.5', [{'action_type': 'link_click', 'value': '2.5'}], None],
+        'targeting': [{'age_min': 18}, 'all', 7],
+    })
+
+
+def assert_frame_round_trip(loaded: pd.DataFrame, original: pd.DataFrame) -> None:
+    assert list(loaded.columns) == list(original.columns)
+    assert loaded.to_dict('records') == original.to_dict('records')
+
+
+def test_save_load_round_trip():
+    backend = ParquetCacheBackend()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = os.path.join(cache_dir, 'ads.parquet')
+        df = sample_frame()
+        backend.save(path, df, TIMESTAMP)
+
+        timestamp, loaded = backend.load(path)
+        assert timestamp == TIMESTAMP
+        assert_frame_round_trip(loaded, df)
+        # Missing struct fields are not filled in with None
+        assert loaded.at[1, 'actions'] == [{'action_type': 'link_click', 'value': '4'}]
+        assert loaded.at[1, 'results'] == [{'indicator': 'actions:lead', 'values': [{'value': '1'}]}]
+        # dtypes preserved
+        assert isinstance(loaded['placement'].dtype, pd.CategoricalDtype)
+        assert loaded['impressions'].dtype == df['impressions'].dtype
+
+
+def test_mixed_columns_fall_back_to_json():
+    backend = ParquetCacheBackend()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = os.path.join(cache_dir, 'ads.parquet')
+        df = mixed_frame()
+        backend.save(path, df, TIMESTAMP)
+
+        _, loaded = backend.load(path)
+        assert_frame_round_trip(loaded, df)
+
+
+def test_save_batches_round_trip():
+    backend = ParquetCacheBackend()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = os.path.join(cache_dir, 'ads.parquet')
+        first = sample_frame()
+        second = pd.DataFrame({
+            'ad_id': ['4'],
+            'impressions': [2 ** 40],  # int32 in a narrower first batch would overflow
+            'spend': [1.0],
+            'placement': pd.Categorical(['reels']),  # category unknown to the first batch
+            'actions': [[{'action_type': 'lead', 'value': '1'}]],
+        })  # 'results' missing -> null
+
+        rows = backend.save_batches(path, iter([first, pd.DataFrame(), second]), TIMESTAMP)
+        assert rows == 4
+
+        timestamp, loaded = backend.load(path)
+        assert timestamp == TIMESTAMP
+        assert list(loaded.columns) == list(first.columns)
+        assert loaded['ad_id'].tolist() == ['1', '2', '3', '4']
+        assert loaded['impressions'].tolist() == [1000, 250, 0, 2 ** 40]
+        assert loaded['placement'].tolist() == ['feed', 'story', 'feed', 'reels']
+        assert loaded['actions'].tolist() == first['actions'].tolist() + second['actions'].tolist()
+        assert loaded['results'].tolist() == first['results'].tolist() + [None]
+
+
+def test_save_batches_without_rows_writes_empty_entry():
+    backend = ParquetCacheBackend()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = os.path.join(cache_dir, 'ads.parquet')
+        assert backend.save_batches(path, iter([]), TIMESTAMP) == 0
+        timestamp, loaded = backend.load(path)
+        assert timestamp == TIMESTAMP and loaded.empty
+
+
+def test_migrate_json_cache():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        df = sample_frame().astype({'placement': object})  # JSON has no categories
+        JsonCacheBackend().save(os.path.join(cache_dir, 'ads_7d.json'), df, TIMESTAMP)
+        with open(os.path.join(cache_dir, 'broken.json'), 'w') as f:
+            f.write('{"timestamp": ')
+
+        assert migrate_json_cache(cache_dir) == 1
+        assert sorted(os.listdir(cache_dir)) == ['ads_7d.parquet', 'broken.json']
+
+        timestamp, loaded = ParquetCacheBackend().load(os.path.join(cache_dir, 'ads_7d.parquet'))
+        assert timestamp == TIMESTAMP
+        assert_frame_round_trip(loaded, df)
+
+
+def test_load_legacy_entry_migrates_in_place():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        base = os.path.join(cache_dir, 'campaigns_30d')
+        df = mixed_frame()
+        JsonCacheBackend().save(base + '.json', df, TIMESTAMP)
+
+        timestamp, loaded = load_legacy_entry(base, ParquetCacheBackend())
+        assert timestamp == TIMESTAMP
+        assert_frame_round_trip(loaded, df)
+        assert not os.path.exists(base + '.json')
+
+        _, migrated = ParquetCacheBackend().load(base + '.parquet')
+        assert_frame_round_trip(migrated, df)
+
+        assert load_legacy_entry(os.path.join(cache_dir, 'missing'), ParquetCacheBackend()) is None
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 PARQUET CACHE BACKEND TEST")
+    print("=" * 80)
+
+    tests = [
+        test_save_load_round_trip,
+        test_mixed_columns_fall_back_to_json,
+        test_save_batches_round_trip,
+        test_save_batches_without_rows_writes_empty_entry,
+        test_migrate_json_cache,
+        test_load_legacy_entry_migrates_in_place,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
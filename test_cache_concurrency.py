@@ -0,0 +1,136 @@
+"""
+Test: Cache über mehrere Prozesse - atomare Schreibvorgänge (Temp-Datei +
+Rename) und Datei-Lock pro Key, damit nur ein Worker einen Key abruft
+(lokaler Fake Graph Server, kein Meta Account nötig)
+
+Usage:
+    python test_cache_concurrency.py
+    python -m pytest -q test_cache_concurrency.py
+"""
+import sys
+import os
+import glob
+import multiprocessing
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+from src.meta_ads_client import MetaAdsClient
+from src.cache_backends import JsonCacheBackend, ParquetCacheBackend
+from src.cache_manager import CacheManager
+from fake_graph_server import FakeGraphServer
+
+WORKERS = 4
+ROUNDS = 30
+
+
+def write_and_read(cache_dir: str, backend_name: str, worker: int, barrier) -> int:
+    """Rewrite one key with frames of different sizes while reading it back; returns failed reads"""
+    import logging
+    logging.disable(logging.INFO)
+
+    backend = ParquetCacheBackend() if backend_name == 'parquet' else JsonCacheBackend()
+    cache = CacheManager(cache_dir, backend, memory_max_bytes=0)
+    path = cache._path('ads_shared')
+    barrier.wait()
+
+    failed = 0
+    for i in range(ROUNDS):
+        rows = 50 + (worker * ROUNDS + i) % 7 * 400
+        cache.put('ads_shared', pd.DataFrame({'ad_id': [str(n) for n in range(rows)], 'spend': [float(worker)] * rows}))
+        try:
+            _, df = backend.load(path)
+            # One writer's complete frame, never a mix or a truncated file
+            assert df['spend'].nunique() == 1 and len(df) % 400 == 50
+        except Exception:
+            failed += 1
+    return failed
+
+
+def open_ad_performance(cache_dir: str, graph_url: str, barrier) -> int:
+    """One Streamlit worker process opening the Ad Performance page"""
+    import logging
+    logging.disable(logging.INFO)
+
+    client = MetaAdsClient(access_token='test-token', account_id='act_123', graph_url=graph_url, cache_dir=cache_dir)
+    client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+    barrier.wait()
+    return len(client.fetch_ad_performance(days=7))
+
+
+def _worker(target, args, barrier, results) -> None:
+    results.put(target(*args, barrier))
+
+
+def run_workers(target, args_per_worker) -> list:
+    """Run target in one spawned process per args tuple, started together at a barrier"""
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(len(args_per_worker))
+    results = context.Queue()
+    processes = [context.Process(target=_worker, args=(target, args, barrier, results)) for args in args_per_worker]
+    for process in processes:
+        process.start()
+    collected = [results.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join()
+    return collected
+
+
+def test_concurrent_writers_never_expose_partial_files():
+    for backend_name in ['parquet', 'json']:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            failed = run_workers(write_and_read, [(cache_dir, backend_name, worker) for worker in range(WORKERS)])
+            assert sum(failed) == 0, f"{backend_name}: {sum(failed)} failed reads"
+            assert not glob.glob(os.path.join(cache_dir, '*.tmp'))
+
+
+def test_one_process_fetches_while_the_others_wait():
+    server = FakeGraphServer(n_ads=15, latency=0.5).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rows = run_workers(open_ad_performance, [(cache_dir, server.url)] * WORKERS)
+            assert rows == [15] * WORKERS
+            assert server.count('GET', r'/act_123/insights$') == 1
+    finally:
+        server.stop()
+
+
+def test_stale_temp_files_are_cleaned_up():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir, ParquetCacheBackend())
+        cache.put('ads_a', pd.DataFrame({'ad_id': ['1']}))
+        leftover = os.path.join(cache_dir, 'ads_b.parquet.4242.1.tmp')  # writer killed mid-write
+        recent = os.path.join(cache_dir, 'ads_c.parquet.4243.1.tmp')  # write still running
+        for path in [leftover, recent]:
+            with open(path, 'wb') as f:
+                f.write(b'PAR1')
+        os.utime(leftover, (0, 0))
+
+        cache.refresh_index()
+        assert not os.path.exists(leftover) and os.path.exists(recent)
+        assert list(cache._entries) == ['ads_a']
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 CACHE CONCURRENCY TEST (mehrere Prozesse)")
+    print("=" * 80)
+
+    tests = [
+        test_concurrent_writers_never_expose_partial_files,
+        test_one_process_fetches_while_the_others_wait,
+        test_stale_temp_files_are_cleaned_up,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
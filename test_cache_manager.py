@@ -0,0 +1,190 @@
+"""
+Test: Cache Manager (TTL pro Datentyp, LRU-Eviction, Invalidierung pro Seite,
+In-Memory-L1 vor dem Datei-Cache)
+
+Usage:
+    python test_cache_manager.py
+    python -m pytest -q test_cache_manager.py
+"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+from src.cache_backends import JsonCacheBackend, ParquetCacheBackend
+from src.cache_manager import CacheManager
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    return pd.DataFrame({'ad_id': [str(i) for i in range(n_rows)], 'spend': [10.0] * n_rows})
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir, ParquetCacheBackend())
+        cache.put('ads_a', make_frame(50))
+        entry_size = cache.stats()['bytes']
+        cache.max_bytes = entry_size * 2
+
+        cache.put('ads_b', make_frame(50))
+        time.sleep(0.01)
+        assert cache.get('ads_a') is not None  # a is now more recent than b
+
+        cache.put('ads_c', make_frame(50))
+        stats = cache.stats()
+        assert stats['evictions'] == 1
+        assert stats['entries'] == 2
+        assert stats['bytes'] <= cache.max_bytes
+        assert cache.get('ads_b') is None
+        assert sorted(os.listdir(cache_dir)) == ['ads_a.parquet', 'ads_c.parquet']
+
+        # LRU order is rebuilt from file times by a fresh manager
+        time.sleep(0.01)
+        assert cache.get('ads_a') is not None
+        reopened = CacheManager(cache_dir, ParquetCacheBackend(), max_bytes=entry_size * 2)
+        reopened.put('campaigns_x', make_frame(50))
+        assert sorted(os.listdir(cache_dir)) == ['ads_a.parquet', 'campaigns_x.parquet']
+
+
+def test_ttl_per_data_type():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backend = JsonCacheBackend()
+        cache = CacheManager(cache_dir, backend, ttl_hours={'leads': 0.25, 'breakdowns': 6})
+        two_hours_ago = datetime.now() - timedelta(hours=2)
+        backend.save(os.path.join(cache_dir, 'leads_7.json'), make_frame(3), two_hours_ago)
+        backend.save(os.path.join(cache_dir, 'breakdowns_7.json'), make_frame(3), two_hours_ago)
+        cache.refresh_index()
+
+        assert cache.get('leads_7') is None
+        assert cache.get('breakdowns_7') is not None
+        assert not os.path.exists(os.path.join(cache_dir, 'leads_7.json'))
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 1, 1)
+
+
+def test_invalidate_only_page_data_types():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir, ParquetCacheBackend())
+        for key in ['campaigns_1', 'ads_1', 'ads_2', 'breakdowns_1']:
+            cache.put(key, make_frame(5))
+
+        assert cache.invalidate(['ads']) == 2
+        assert sorted(os.listdir(cache_dir)) == ['breakdowns_1.parquet', 'campaigns_1.parquet']
+        assert cache.stats()['entries'] == 2
+
+        assert cache.clear() == 2
+        assert os.listdir(cache_dir) == []
+        assert cache.stats()['bytes'] == 0
+
+
+def count_loads(backend):
+    loads = []
+    original = backend.load
+    backend.load = lambda path: loads.append(path) or original(path)
+    return loads
+
+
+def test_memory_cache_serves_repeated_hits():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backend = JsonCacheBackend()
+        loads = count_loads(backend)
+        prepared = []
+        cache = CacheManager(cache_dir, backend, prepare=lambda df: prepared.append(1) or df)
+        cache.put('ads_1', make_frame(20))
+
+        for _ in range(3):
+            assert len(cache.get('ads_1')) == 20
+        assert len(loads) == 1 and len(prepared) == 1  # parsed and prepared once
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['memory_hits'], stats['disk_hits']) == (3, 2, 1)
+        assert stats['memory_entries'] == 1 and stats['memory_bytes'] > 0
+
+        # Callers get their own frame - writes never reach the shared one
+        df = cache.get('ads_1')
+        df['spend'] = 0.0
+        df.loc[0, 'ad_id'] = 'changed'
+        df['new'] = 1
+        again = cache.get('ads_1')
+        assert again['spend'].tolist() == [10.0] * 20
+        assert again['ad_id'].iloc[0] == '0' and 'new' not in again.columns
+
+        # put() replaces the entry
+        cache.put('ads_1', make_frame(5))
+        assert len(cache.get('ads_1')) == 5
+        assert cache.stats()['memory_entries'] == 1
+
+
+def test_memory_cache_follows_file_changes():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir, ParquetCacheBackend())
+        cache.put('ads_1', make_frame(20))
+        assert len(cache.get('ads_1')) == 20
+
+        # Rewritten by another process (other manager on the same directory)
+        time.sleep(0.01)
+        CacheManager(cache_dir, ParquetCacheBackend()).put('ads_1', make_frame(7))
+        assert len(cache.get('ads_1')) == 7
+
+        # Deleted by another process
+        os.remove(os.path.join(cache_dir, 'ads_1.parquet'))
+        assert cache.get('ads_1') is None
+
+        cache.put('ads_2', make_frame(3))
+        cache.get('ads_2')
+        cache.invalidate(['ads'])
+        assert cache.stats()['memory_entries'] == 0
+
+
+def test_memory_cache_is_bounded_by_bytes():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        entry_size = int(make_frame(100).memory_usage(index=True, deep=True).sum())
+        cache = CacheManager(cache_dir, ParquetCacheBackend(), memory_max_bytes=entry_size * 2)
+        for key in ['ads_a', 'ads_b', 'ads_c']:
+            cache.put(key, make_frame(100))
+            cache.get(key)
+
+        # ads_a (least recently used) was dropped when ads_c came in
+        stats = cache.stats()
+        assert stats['memory_entries'] == 2 and stats['memory_bytes'] <= entry_size * 2
+        before = cache.stats()['memory_hits']
+        cache.get('ads_a')  # from disk again
+        assert cache.stats()['memory_hits'] == before
+
+        # Disabled L1 -> every hit reads the file
+        plain = CacheManager(cache_dir, ParquetCacheBackend(), memory_max_bytes=0)
+        plain.get('ads_b')
+        plain.get('ads_b')
+        assert plain.stats()['memory_hits'] == 0 and plain.stats()['memory_entries'] == 0
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 CACHE MANAGER TEST")
+    print("=" * 80)
+
+    tests = [
+        test_lru_eviction_keeps_recently_used_entries,
+        test_ttl_per_data_type,
+        test_invalidate_only_page_data_types,
+        test_memory_cache_serves_repeated_hits,
+        test_memory_cache_follows_file_changes,
+        test_memory_cache_is_bounded_by_bytes,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
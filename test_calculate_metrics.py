@@ -0,0 +1,88 @@
+"""
+Test: Vektorisierte DataProcessor.calculate_metrics liefert die gleichen Werte wie die
+zeilenweise Version (Meta Listen-Format, None, ungültige Strings, Rundung)
+
+Usage:
+    python test_calculate_metrics.py
+    python -m pytest -q test_calculate_metrics.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor, extract_numeric_value, extract_numeric_values, round_like_python
+
+
+def test_extract_numeric_values_matches_scalar_version():
+    values = [
+        '412.37', '0.1', '1e3', ' 12 ', '1_000', 'n/a', '', None, np.nan, 7, 2.5, True,
+        [{'action_type': 'lead', 'value': '37'}], [{'value': 'x'}], [], ['5'], {'value': '3'},
+    ]
+    series = pd.Series(values, dtype=object)
+    expected = [extract_numeric_value(value) for value in values]
+    result = extract_numeric_values(series).tolist()
+
+    assert len(result) == len(expected)
+    for got, want in zip(result, expected):
+        assert (np.isnan(got) and np.isnan(want)) or got == want, (got, want)
+
+    # Clean string columns take the bulk path
+    strings = pd.Series(['0.1', '2.675', '1005.005'])
+    assert extract_numeric_values(strings).tolist() == [0.1, 2.675, 1005.005]
+
+
+def test_round_like_python_on_ties():
+    values = np.array([2.675, 1.005, 0.285, 5.015, 0.125, 0.375, 1234567.125, -2.675, np.nan, np.inf])
+    rounded = round_like_python(values, 2)
+    for got, value in zip(rounded, values):
+        want = round(float(value), 2)
+        assert (np.isnan(got) and np.isnan(want)) or got == want, (value, got, want)
+
+
+def test_calculate_metrics_values():
+    df = pd.DataFrame({
+        'spend': ['100.00', [{'value': '50'}], None, '30'],
+        'leads': ['3', '0', '2', 'n/a'],
+        'impressions': [1000, 0, 500, 400],
+        'video_plays_3s': [300, 10, 0, 100],
+        'thru_plays': [90, 5, 0, 33],
+        'clicks': [20, 5, 10, 1],
+    })
+    result = DataProcessor.calculate_metrics(df)
+
+    assert result['spend'].tolist() == [100.0, 50.0, 0.0, 30.0]
+    assert result['cpl'].tolist() == [33.33, 0, 0.0, 0]
+    assert result['hook_rate'].tolist() == [30.0, 0, 0.0, 25.0]
+    assert result['hold_rate'].tolist() == [30.0, 50.0, 0, 33.0]
+    assert result['ctr'].tolist() == [2.0, 0, 2.0, 0.25]
+
+    # No positive denominator at all -> int 0 column like the row-wise version
+    no_leads = DataProcessor.calculate_metrics(pd.DataFrame({'spend': [10.0], 'leads': [0]}))
+    assert no_leads['cpl'].dtype == np.int64
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 CALCULATE METRICS TEST")
+    print("=" * 80)
+
+    tests = [
+        test_extract_numeric_values_matches_scalar_version,
+        test_round_like_python_on_ties,
+        test_calculate_metrics_values,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
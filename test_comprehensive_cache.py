@@ -0,0 +1,110 @@
+"""
+Test: Cache pro Breakdown für fetch_comprehensive_insights gegen lokalen Fake Graph Server
+(kein Meta Account nötig)
+
+Usage:
+    python test_comprehensive_cache.py
+    python -m pytest -q test_comprehensive_cache.py
+"""
+import sys
+import glob
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient, COMPREHENSIVE_BREAKDOWNS, DERIVED_BREAKDOWNS
+from src.cache_backends import ParquetCacheBackend
+from src.cache_manager import CacheManager
+from fake_graph_server import FakeGraphServer
+
+# Passes with their own cache entry (age-only / gender-only are derived by default)
+FETCHED_PASSES = len(COMPREHENSIVE_BREAKDOWNS) - len(DERIVED_BREAKDOWNS)
+
+
+def make_client(server, cache_dir):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+    client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+    return client
+
+
+def insights_requests(server):
+    return server.count(None, r'/insights$')
+
+
+def test_second_call_is_served_from_cache():
+    server = FakeGraphServer(n_ads=4).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            first = client.fetch_comprehensive_insights(days=7)
+            requests_after_first = insights_requests(server)
+            assert requests_after_first > 0
+            assert len(glob.glob(os.path.join(cache_dir, "*.parquet"))) == FETCHED_PASSES
+
+            second = client.fetch_comprehensive_insights(days=7)
+            assert insights_requests(server) == requests_after_first
+            assert second['demographics_age_gender']['spend'].tolist() == first['demographics_age_gender']['spend'].tolist()
+            assert second['base']['spend'].dtype.kind == 'f'
+
+            # Other level -> separate entries
+            client.fetch_comprehensive_insights(days=7, level='campaign')
+            assert insights_requests(server) > requests_after_first
+
+            # force_refresh bypasses the cache
+            before_refresh = insights_requests(server)
+            client.fetch_comprehensive_insights(days=7, force_refresh=True)
+            assert insights_requests(server) > before_refresh
+    finally:
+        server.stop()
+
+
+def test_failed_breakdown_does_not_invalidate_others():
+    server = FakeGraphServer(n_ads=4).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            fetch_pass = client._fetch_breakdown_pass
+
+            def failing_country_pass(level, time_range, breakdowns, fields, get_objects=None):
+                if breakdowns == ['country']:
+                    raise RuntimeError('country breakdown unavailable')
+                return fetch_pass(level, time_range, breakdowns, fields, get_objects)
+
+            client._fetch_breakdown_pass = failing_country_pass
+            results = client.fetch_comprehensive_insights(days=7)
+            assert results['geographic_country'].empty
+            assert not results['demographics_age'].empty
+            assert len(glob.glob(os.path.join(cache_dir, "*.parquet"))) == FETCHED_PASSES - 1
+
+            # Next call only re-runs the failed pass
+            calls = []
+            client._fetch_breakdown_pass = lambda level, time_range, breakdowns, *args: calls.append(breakdowns) or fetch_pass(level, time_range, breakdowns, *args)
+            results = client.fetch_comprehensive_insights(days=7)
+            assert calls == [['country']]
+            assert not results['geographic_country'].empty
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 COMPREHENSIVE INSIGHTS CACHE TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_second_call_is_served_from_cache,
+        test_failed_breakdown_does_not_invalidate_others,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
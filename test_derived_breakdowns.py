@@ -0,0 +1,145 @@
+"""
+Test: Age- und Gender-Breakdowns lokal aus dem Age×Gender-Pass ableiten
+(Summen, Ratios, Reach-Markierung, reach-only Pässe) gegen lokalen Fake Graph Server
+
+Usage:
+    python test_derived_breakdowns.py
+    python -m pytest -q test_derived_breakdowns.py
+"""
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+import pytest
+from src.meta_ads_client import MetaAdsClient, COMPREHENSIVE_BREAKDOWNS, DERIVED_BREAKDOWNS
+from src.data_processor import DataProcessor
+from src.cache_backends import ParquetCacheBackend
+from src.cache_manager import CacheManager
+from src.schema import apply_schema
+from fake_graph_server import FakeGraphServer, BREAKDOWN_VALUES
+
+
+def make_age_gender() -> pd.DataFrame:
+    rows = []
+    for age, gender, spend, impressions, reach, clicks, leads in [
+        ('18-24', 'male', '10.00', '1000', '400', '10', '1'),
+        ('18-24', 'female', '30.00', '3000', '1000', '50', '3'),
+        ('25-34', 'male', '20.00', '2000', '900', '20', '0'),
+    ]:
+        rows.append({
+            'ad_id': '1', 'ad_name': 'Ad 1', 'date_start': '2025-01-01', 'date_stop': '2025-01-31',
+            'age': age, 'gender': gender, 'spend': spend, 'impressions': impressions,
+            'reach': reach, 'clicks': clicks, 'frequency': '2.5', 'unique_link_clicks_ctr': '1.0',
+            'actions': [{'action_type': 'lead', 'value': leads}],
+        })
+    return DataProcessor.add_action_columns(apply_schema(pd.DataFrame(rows)))
+
+
+def test_derive_age_from_age_gender():
+    age = DataProcessor.derive_breakdown(make_age_gender(), ['age'], 'ad_id').set_index('age')
+
+    assert 'gender' not in age.columns
+    assert age.loc['18-24', 'ad_name'] == 'Ad 1'
+    assert age.loc['18-24', 'spend'] == 40.0
+    assert age.loc['18-24', 'impressions'] == 4000
+    assert age.loc['18-24', 'leads_extracted'] == 4
+    assert age.loc['18-24', 'actions'] == [{'action_type': 'lead', 'value': 4.0}]
+    assert age.loc['18-24', 'ctr'] == pytest.approx(60 / 4000 * 100)
+    assert age.loc['18-24', 'cpl'] == pytest.approx(10.0)
+
+    # Reach summed over disjoint gender buckets -> approximate where more than one bucket
+    assert age.loc['18-24', 'reach'] == 1400
+    assert age.loc['18-24', 'frequency'] == pytest.approx(4000 / 1400)
+    assert bool(age.loc['18-24', 'reach_approximate']) is True
+    assert bool(age.loc['25-34', 'reach_approximate']) is False
+
+    # Ratios that can't be recomputed from sums are left out
+    assert 'unique_link_clicks_ctr' not in age.columns
+
+
+def test_exact_reach_replaces_estimate():
+    reach_df = pd.DataFrame({
+        'ad_id': ['1', '1'], 'date_start': ['2025-01-01'] * 2, 'date_stop': ['2025-01-31'] * 2,
+        'age': ['18-24', '25-34'], 'reach': ['1300', '900'],
+    })
+    age = DataProcessor.derive_breakdown(make_age_gender(), ['age'], 'ad_id', reach_df).set_index('age')
+
+    assert age.loc['18-24', 'reach'] == 1300
+    assert age.loc['18-24', 'frequency'] == pytest.approx(4000 / 1300)
+    assert not age['reach_approximate'].any()
+
+
+def breakdown_passes(server):
+    return [
+        json.loads(params.get('breakdowns', '[]'))
+        for method, path, params in server.requests
+        if path.endswith('/insights')
+    ]
+
+
+def test_fetch_comprehensive_insights_derives_demographics():
+    server = FakeGraphServer(n_ads=2).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+            client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+
+            results = client.fetch_comprehensive_insights(days=7, demographics='derive')
+            passes = breakdown_passes(server)
+            assert ['age'] not in passes and ['gender'] not in passes
+            assert ['age', 'gender'] in passes
+            assert list(results) == [breakdown[0] for breakdown in COMPREHENSIVE_BREAKDOWNS]
+
+            age = results['demographics_age']
+            assert len(age) == 2 * len(BREAKDOWN_VALUES['age'])
+            assert age['spend'].tolist() == [30.0] * len(age)  # 3 genders x 10.00
+            assert age['reach_approximate'].all()
+            assert len(results['demographics_gender']) == 2 * len(BREAKDOWN_VALUES['gender'])
+
+            # Exact mode adds small reach-only passes (no full field list)
+            server.requests.clear()
+            results = client.fetch_comprehensive_insights(days=7, demographics='derive_exact')
+            reach_requests = [
+                params for method, path, params in server.requests
+                if path.endswith('/insights') and json.loads(params.get('breakdowns', '[]')) in (['age'], ['gender'])
+            ]
+            assert len(reach_requests) == 2 * len(DERIVED_BREAKDOWNS)  # one per ad and pass
+            assert all('spend' not in params['fields'] for params in reach_requests)
+            assert not results['demographics_age']['reach_approximate'].any()
+            assert results['demographics_age']['reach'].tolist() == [400] * len(results['demographics_age'])
+
+            # Legacy mode fetches every pass
+            server.requests.clear()
+            client.fetch_comprehensive_insights(days=7, demographics='fetch', force_refresh=True)
+            passes = breakdown_passes(server)
+            assert ['age'] in passes and ['gender'] in passes
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 DERIVED BREAKDOWNS TEST")
+    print("=" * 80)
+
+    tests = [
+        test_derive_age_from_age_gender,
+        test_exact_reach_replaces_estimate,
+        test_fetch_comprehensive_insights_derives_demographics,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
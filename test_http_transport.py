@@ -0,0 +1,160 @@
+"""
+Test: Raw-HTTP Graph Transport ('http') gegen lokalen Fake Graph Server -
+gleiche Ausgabe wie der SDK-Pfad, Keep-Alive, gzip, Paging, Fehler und Rate Limits
+
+Usage:
+    python test_http_transport.py
+    python -m pytest -q test_http_transport.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+import pytest
+import requests
+from facebook_business.exceptions import FacebookRequestError
+from src.graph_http import GraphHttpTransport
+from src.meta_ads_client import MetaAdsClient
+from src.rate_limiter import RateLimitScheduler
+from fake_graph_server import FakeGraphServer
+
+TIME_RANGE = {'since': '2024-10-01', 'until': '2024-10-07'}
+FIELDS = ['ad_id', 'spend', 'impressions', 'actions']
+
+
+def make_client(server, cache_dir, transport='http'):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, transport=transport, cache_dir=cache_dir)
+    client._load_from_cache = lambda *args, **kwargs: None
+    client._save_to_cache = lambda *args, **kwargs: None
+    return client
+
+
+def test_same_output_as_sdk():
+    server = FakeGraphServer(n_ads=30).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            sdk = make_client(server, cache_dir, 'sdk').fetch_ad_performance(days=7)
+            http = make_client(server, cache_dir).fetch_ad_performance(days=7)
+
+            assert len(http) == 30
+            assert http.columns.tolist() == sdk.columns.tolist()
+            assert http.dtypes.equals(sdk.dtypes)
+            assert http.equals(sdk)
+
+            # Per-object requests (breakdown pass) give the same rows too
+            sdk_rows = make_client(server, cache_dir, 'sdk')._fetch_breakdown_pass('ad', TIME_RANGE, ['gender'], FIELDS)
+            http_rows = make_client(server, cache_dir)._fetch_breakdown_pass('ad', TIME_RANGE, ['gender'], FIELDS)
+            assert http_rows == [dict(row) for row in sdk_rows]
+            assert all(type(row['actions'][0]) is dict for row in http_rows)
+    finally:
+        server.stop()
+
+
+def test_pages_share_one_connection():
+    server = FakeGraphServer(n_ads=25).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            batches = list(client.iter_ad_insights('2024-10-01', '2024-10-07', batch_size=10))
+
+            assert [len(batch) for batch in batches] == [10, 10, 5]
+            assert server.count('GET', r'/act_123/insights$') == 3
+            assert client.http.requests_sent == 3
+            assert server.connections == 1  # keep-alive, gzip responses decoded transparently
+    finally:
+        server.stop()
+
+
+def test_async_job_result_read_over_http():
+    server = FakeGraphServer(n_ads=5).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            client.async_min_days = 1
+            client.async_poll_initial = 0.01
+
+            df = client.fetch_ad_performance(days=7)
+            assert len(df) == 5
+            assert server.count('GET', r'/9000\d\d/insights$') == 1
+    finally:
+        server.stop()
+
+
+def test_errors_and_throttling():
+    server = FakeGraphServer(n_ads=10, n_campaigns=10, failing_objects=['5003'], throttle_requests=2).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            sleeps = []
+            client.http.scheduler = RateLimitScheduler(sleep=sleeps.append)
+
+            # Throttled twice, then retried with backoff
+            rows = list(client.http.iter_insights(server.account_id, {'level': 'ad'}, FIELDS))
+            assert len(rows) == 10
+            assert client.http.scheduler.throttled == 2 and len(sleeps) == 2
+
+            with pytest.raises(FacebookRequestError) as error:
+                list(client.http.iter_insights('5003', {'level': 'campaign'}, FIELDS))
+            assert error.value.http_status() == 400
+
+            # Failing campaign is skipped like with the SDK transport
+            assert len(client.fetch_campaign_data(days=7)) == 9
+    finally:
+        server.stop()
+
+
+def test_errors_do_not_leak_the_access_token():
+    server = FakeGraphServer(n_ads=30, page_size=10).start()
+    try:
+        transport = GraphHttpTransport('secret-user-token', server.url)
+
+        # First request: token in the params
+        server.failing_objects.add('999')
+        with pytest.raises(FacebookRequestError) as error:
+            transport.get_node('999', ['name'], access_token='secret-page-token')
+        assert 'secret-page-token' not in str(error.value)
+        assert error.value.request_context()['path'].endswith('/999')
+
+        # Later page: token in the query string of paging.next
+        pages = transport.iter_pages(f"{server.account_id}/insights", {'level': 'ad'})
+        assert len(next(pages)) == 10
+        server.failing_objects.add(server.account_id)
+        with pytest.raises(FacebookRequestError) as error:
+            next(pages)
+        assert 'secret-user-token' not in str(error.value)
+        assert 'after=' in error.value.request_context()['path']
+    finally:
+        server.stop()
+
+    # Connection errors quote the URL as well (nothing listens on port 9)
+    with pytest.raises(requests.ConnectionError) as error:
+        GraphHttpTransport('secret-user-token', 'http://127.0.0.1:9', session=requests.Session()).get_node('999')
+    assert 'secret-user-token' not in str(error.value)
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 HTTP TRANSPORT TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_same_output_as_sdk,
+        test_pages_share_one_connection,
+        test_async_job_result_read_over_http,
+        test_errors_and_throttling,
+        test_errors_do_not_leak_the_access_token,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,169 @@
+"""
+Test: Inkrementeller Daily-Sync der Ad Insights gegen lokalen Fake Graph Server
+(kein Meta Account nötig)
+
+Usage:
+    python test_incremental_sync.py
+    python -m pytest -q test_incremental_sync.py
+"""
+import sys
+import os
+import json
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+from src.meta_ads_client import MetaAdsClient
+from src.insights_store import DailyInsightsStore
+from src.data_processor import DataProcessor
+from fake_graph_server import FakeGraphServer
+
+
+def make_client(server, store_dir):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=store_dir)
+    client.daily_store = DailyInsightsStore(store_dir)
+    client.attribution_window_days = 3
+    return client
+
+
+def synced_ranges(server):
+    return [
+        json.loads(params['time_range'])
+        for method, path, params in server.requests
+        if path.endswith('/insights') and params.get('time_increment') == '1'
+    ]
+
+
+def test_second_sync_only_pulls_attribution_window():
+    server = FakeGraphServer(n_ads=5).start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            client = make_client(server, store_dir)
+            today = datetime.now().date()
+
+            df = client.fetch_ad_performance(days=30, incremental=True)
+            assert len(df) == 5
+            assert df['spend'].tolist() == [300.0] * 5  # 30 days x 10.00
+            assert df['leads_extracted'].tolist() == [60] * 5
+            assert len(synced_ranges(server)) == 1
+
+            # Same range again: only last 3 days + today are re-pulled
+            client.fetch_ad_performance(days=30, incremental=True)
+            ranges = synced_ranges(server)
+            assert len(ranges) == 2
+            assert ranges[-1] == {'since': str(today - timedelta(days=3)), 'until': str(today)}
+
+            # Shorter range is served from stored partitions + window
+            df_7 = client.fetch_ad_performance(days=7, incremental=True)
+            assert df_7['spend'].tolist() == [70.0] * 5
+            assert synced_ranges(server)[-1]['since'] == str(today - timedelta(days=3))
+    finally:
+        server.stop()
+
+
+def test_ratios_recomputed_from_summed_counts():
+    daily = pd.DataFrame([
+        {'ad_id': '1', 'date_start': '2024-10-01', 'date_stop': '2024-10-01', 'spend': '10', 'impressions': '100',
+         'clicks': '10', 'reach': '50', 'ctr': '10.0', 'cpm': '100.0', 'frequency': '2.0',
+         'actions': [{'action_type': 'lead', 'value': '1'}]},
+        {'ad_id': '1', 'date_start': '2024-10-02', 'date_stop': '2024-10-02', 'spend': '9', 'impressions': '900',
+         'clicks': '10', 'reach': '450', 'ctr': '1.111', 'cpm': '10.0', 'frequency': '2.0',
+         'actions': [{'action_type': 'lead', 'value': '2'}]},
+    ])
+
+    row = DataProcessor.aggregate_daily_insights(daily).iloc[0]
+
+    assert row['impressions'] == 1000
+    assert round(row['ctr'], 4) == 2.0  # not the average 5.56
+    assert round(row['cpm'], 4) == 19.0  # not the average 55.0
+    assert round(row['frequency'], 4) == 2.0
+    assert row['actions'] == [{'action_type': 'lead', 'value': 3.0}]
+    assert row['cost_per_action_type'] == [{'action_type': 'lead', 'value': 19 / 3}]
+    assert bool(row['reach_approximate'])
+    assert (row['date_start'], row['date_stop']) == ('2024-10-01', '2024-10-02')
+
+
+def indicator_values(value) -> dict:
+    """{indicator or action_type: float} of a results / action list cell"""
+    return {
+        entry.get('indicator', entry.get('action_type')): float(entry['values'][0]['value'] if 'values' in entry else entry['value'])
+        for entry in value
+    }
+
+
+def test_incremental_totals_match_full_range_fetch():
+    # Counts differ per day, the full range row carries Meta's own totals
+    server = FakeGraphServer(n_ads=3, range_totals=True).start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            client = make_client(server, store_dir)
+            incremental = client.fetch_ad_performance(days=7, incremental=True).set_index('ad_id')
+            full = client.fetch_ad_performance(days=7, incremental=False).set_index('ad_id')
+            assert sorted(incremental.index) == sorted(full.index)
+
+            for column in ['spend', 'impressions', 'clicks', 'ctr', 'cpm', 'cpc']:
+                assert (incremental[column].astype(float).round(6) == full.loc[incremental.index, column].astype(float).round(6)).all(), column
+
+            for column in ['results', 'cost_per_result', 'result_rate', 'cost_per_thruplay', 'website_ctr',
+                           'cost_per_unique_action_type', 'cost_per_action_type', 'actions']:
+                for ad_id in incremental.index:
+                    got, expected = indicator_values(incremental.at[ad_id, column]), indicator_values(full.at[ad_id, column])
+                    assert got.keys() == expected.keys(), column
+                    assert all(round(got[key], 6) == round(expected[key], 6) for key in got), f"{column}: {got} != {expected}"
+
+            # Averages of daily values can't be rebuilt - dropped instead of showing the last day
+            assert 'video_avg_time_watched_actions' not in incremental.columns
+            # Unique counts over summed reach: approximate like reach itself
+            assert incremental['reach_approximate'].all()
+            assert 'unique_link_clicks_ctr' in incremental.columns
+    finally:
+        server.stop()
+
+
+def test_results_summed_per_indicator():
+    daily = pd.DataFrame([
+        {'ad_id': '1', 'date_start': '2024-10-01', 'date_stop': '2024-10-01', 'spend': '10', 'impressions': '1000',
+         'results': [{'indicator': 'actions:lead', 'values': [{'value': '2'}]}],
+         'cost_per_result': [{'indicator': 'actions:lead', 'values': [{'value': '5'}]}],
+         'result_rate': [{'indicator': 'actions:lead', 'values': [{'value': '0.2'}]}],
+         'video_avg_time_watched_actions': [{'action_type': 'video_view', 'value': '4'}]},
+        {'ad_id': '1', 'date_start': '2024-10-02', 'date_stop': '2024-10-02', 'spend': '20', 'impressions': '2000',
+         'results': [{'indicator': 'actions:lead', 'values': [{'value': '4'}]}],
+         'cost_per_result': [{'indicator': 'actions:lead', 'values': [{'value': '5'}]}],
+         'result_rate': [{'indicator': 'actions:lead', 'values': [{'value': '0.2'}]}],
+         'video_avg_time_watched_actions': [{'action_type': 'video_view', 'value': '9'}]},
+    ])
+
+    row = DataProcessor.aggregate_daily_insights(daily).iloc[0]
+
+    assert indicator_values(row['results']) == {'actions:lead': 6.0}  # not the last day's 4
+    assert indicator_values(row['cost_per_result']) == {'actions:lead': 5.0}
+    assert indicator_values(row['result_rate']) == {'actions:lead': 0.2}
+    assert 'video_avg_time_watched_actions' not in row.index
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 INCREMENTAL DAILY SYNC TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_second_sync_only_pulls_attribution_window,
+        test_ratios_recomputed_from_summed_counts,
+        test_incremental_totals_match_full_range_fetch,
+        test_results_summed_per_indicator,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,169 @@
+"""
+Test: Lokaler Lead-Store (SQLite) - Deduplizierung auf lead_id, Watermark pro
+Formular, inkrementeller Sync und Abfrage beliebiger Zeitfenster ohne API-Calls
+
+Usage:
+    python test_lead_store.py
+    python -m pytest -q test_lead_store.py
+"""
+import sys
+import os
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
+sys.path.append(os.path.dirname(__file__))
+
+from src.meta_ads_client import MetaAdsClient
+from src.lead_store import LeadStore
+from fake_graph_server import FakeGraphServer, make_lead
+
+
+def make_store_lead(lead_id: str, created: datetime, email: str = 'a@example.com') -> dict:
+    return {
+        'lead_id': lead_id, 'created_time': created.strftime('%Y-%m-%d %H:%M:%S'),
+        'form_name': 'Probefahrt', 'page_id': '7000', 'page_name': 'Autohaus', 'fields': {'email': email},
+    }
+
+
+def test_store_dedupes_and_tracks_watermark():
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = LeadStore(os.path.join(store_dir, 'leads.sqlite3'))
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        week_ago = int((now - timedelta(days=7)).timestamp())
+
+        # Never synced -> the whole requested window
+        assert store.sync_window('f1', week_ago) == week_ago
+
+        leads = [make_store_lead('1', now - timedelta(days=2)), make_store_lead('2', now - timedelta(hours=1))]
+        assert store.add_form_leads('f1', leads, week_ago) == 2
+        assert store.add_form_leads('f1', leads, week_ago) == 0  # deduplicated on lead_id
+        assert store.count() == 2
+
+        # Synced -> only newer than the newest lead, unless an older window is needed
+        assert store.sync_window('f1', week_ago) == int((now - timedelta(hours=1)).timestamp())
+        assert store.sync_window('f1', week_ago - 3600) == week_ago - 3600
+
+        # A form without leads keeps its synced start as watermark
+        store.add_form_leads('f2', [], week_ago)
+        assert store.sync_window('f2', week_ago) == week_ago
+
+        df = store.query(now - timedelta(days=1))
+        assert df['lead_id'].tolist() == ['2']
+        assert df.columns.tolist() == ['lead_id', 'created_time', 'form_name', 'page_name', 'email']
+        assert store.query(now - timedelta(days=7))['lead_id'].tolist() == ['2', '1']  # newest first
+
+
+def test_store_freshness():
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = LeadStore(os.path.join(store_dir, 'leads.sqlite3'))
+        week_ago = int((datetime.now() - timedelta(days=7)).timestamp())
+
+        assert not store.is_fresh(week_ago, 0.25)
+        store.mark_synced(week_ago)
+        assert store.is_fresh(week_ago, 0.25)
+        assert store.is_fresh(week_ago + 86400, 0.25)
+        assert not store.is_fresh(week_ago - 86400, 0.25)  # older than ever synced
+        assert not store.is_fresh(week_ago, 0)
+
+        store.mark_stale()
+        assert store.last_sync() is None and not store.is_fresh(week_ago, 0.25)
+
+
+def lead_requests(server):
+    return [params for method, path, params in server.requests if path.endswith('/leads')]
+
+
+def test_incremental_sync_against_fake_server():
+    server = FakeGraphServer(n_pages=1, forms_per_page=2, leads_per_form=10, lead_interval_hours=5).start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=store_dir)
+
+            assert len(client.fetch_leads_data(days=7)) == 20
+            assert len(lead_requests(server)) == 2
+
+            # Fresh store -> any window inside the synced range without API calls
+            server.requests.clear()
+            assert len(client.fetch_leads_data(days=1)) == 2 * 5  # 0h .. 20h
+            assert len(client.fetch_leads_data(days=7)) == 20
+            assert server.count() == 0
+
+            # New lead -> the sync only asks for leads newer than the watermark
+            newest = {form_id: leads[0]['created_time'] for form_id, leads in server.leads.items()}
+            server.leads['7000000'].insert(0, make_lead('7000000', 99, datetime.now(timezone.utc)))
+            df = client.fetch_leads_data(days=7, force_refresh=True)
+            assert len(df) == 21 and df['lead_id'].is_unique
+            assert 'Lead 99' in df['full_name'].tolist()
+
+            watermark = int(datetime.strptime(min(newest.values()), '%Y-%m-%dT%H:%M:%S%z').timestamp())
+            for params in lead_requests(server)[-2:]:
+                since = next(rule['value'] for rule in json.loads(params['filtering']) if rule['operator'] == 'GREATER_THAN')
+                assert since >= watermark - 1
+
+            # Refresh button of the leads page marks the store stale -> next read syncs
+            server.requests.clear()
+            client.invalidate_cache(['leads'])
+            client.fetch_leads_data(days=7)
+            assert len(lead_requests(server)) == 2
+    finally:
+        server.stop()
+
+
+def test_failed_form_is_retried_on_next_read():
+    server = FakeGraphServer(
+        n_pages=1, forms_per_page=2, leads_per_form=4, lead_interval_hours=5, failing_objects=['7000001']
+    ).start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=store_dir)
+
+            # Record the window fetch_leads_data asks the sync for
+            windows = []
+            sync_leads = client.sync_leads
+
+            def recording_sync(days, since=None, until=None):
+                windows.append(int(since.timestamp()))
+                return sync_leads(days, since, until)
+
+            client.sync_leads = recording_sync
+
+            # One form failed -> its leads are missing and the store is not marked fresh
+            assert len(client.fetch_leads_data(days=7)) == 4
+            assert client.lead_store.last_sync() is None
+            assert not client.lead_store.is_fresh(windows[-1], 1)
+
+            # Next read syncs again: the failed form from the start, the other one incrementally
+            server.failing_objects.clear()
+            server.requests.clear()
+            assert len(client.fetch_leads_data(days=7)) == 8
+            assert len(lead_requests(server)) == 2
+            assert len(windows) == 2
+            assert client.lead_store.is_fresh(windows[-1], 1)
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 LEAD STORE TEST")
+    print("=" * 80)
+
+    tests = [
+        test_store_dedupes_and_tracks_watermark,
+        test_store_freshness,
+        test_incremental_sync_against_fake_server,
+        test_failed_form_is_retried_on_next_read,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,147 @@
+"""
+Test: Leadgen Webhook Receiver - Subscription-Handshake, Signaturprüfung,
+Abruf des einzelnen Leads per ID und Ablage im lokalen Lead-Store
+(lokaler Fake Graph Server, kein Meta Account nötig)
+
+Usage:
+    python test_lead_webhook.py
+    python -m pytest -q test_lead_webhook.py
+"""
+import sys
+import os
+import tempfile
+from datetime import datetime, timezone
+sys.path.append(os.path.dirname(__file__))
+
+import requests
+from src.meta_ads_client import MetaAdsClient
+from src.lead_webhook import LeadWebhookReceiver
+from fake_graph_server import FakeGraphServer, make_lead
+from simulate_lead_webhook import make_notification, post_notification
+
+APP_SECRET = 'test-app-secret'
+VERIFY_TOKEN = 'test-verify-token'
+
+
+def start_receiver(server, store_dir):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=store_dir)
+    return LeadWebhookReceiver(client, APP_SECRET, VERIFY_TOKEN, port=0).start()
+
+
+def test_subscription_handshake():
+    server = FakeGraphServer().start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            receiver = start_receiver(server, store_dir)
+            try:
+                params = {'hub.mode': 'subscribe', 'hub.verify_token': VERIFY_TOKEN, 'hub.challenge': '1158201444'}
+                response = requests.get(receiver.url, params=params)
+                assert response.status_code == 200 and response.text == '1158201444'
+
+                response = requests.get(receiver.url, params={**params, 'hub.verify_token': 'wrong'})
+                assert response.status_code == 403
+            finally:
+                receiver.stop()
+    finally:
+        server.stop()
+
+
+def test_new_lead_is_fetched_by_id_and_stored():
+    server = FakeGraphServer(n_pages=1, forms_per_page=2, leads_per_form=3).start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            receiver = start_receiver(server, store_dir)
+            store = receiver.client.lead_store
+            try:
+                server.leads['7000000'].insert(0, make_lead('7000000', 99, datetime.now(timezone.utc)))
+                status, text = post_notification(receiver.url, APP_SECRET, make_notification('700000000099', '7000', '7000000'))
+                assert (status, text) == (200, 'EVENT_RECEIVED')
+
+                df = store.query(datetime(2000, 1, 1))
+                assert df['lead_id'].tolist() == ['700000000099']
+                assert df[['form_name', 'page_name', 'full_name']].iloc[0].tolist() == ['Form 7000000', 'Page 7000', 'Lead 99']
+
+                # One lookup of page token and form name, then one call per lead - no form sync
+                assert server.count('GET', r'/leads$') == 0
+                assert server.count('GET', r'/me/accounts$') == 1
+                status, _ = post_notification(receiver.url, APP_SECRET, make_notification('700000000001', '7000', '7000000'))
+                assert status == 200 and store.count() == 2
+                assert server.count('GET', r'/me/accounts$') == 1 and server.count('GET', r'/7000000$') == 1
+
+                # Redelivered notification -> deduplicated on lead_id
+                post_notification(receiver.url, APP_SECRET, make_notification('700000000099', '7000', '7000000'))
+                assert store.count() == 2
+                assert receiver.stats['leads_stored'] == 2 and receiver.stats['duplicates'] == 1
+
+                # Pushed leads leave the watermark alone - the next sync still covers the gap
+                assert store.sync_window('7000000', 12345) == 12345
+            finally:
+                receiver.stop()
+    finally:
+        server.stop()
+
+
+def test_invalid_signature_is_rejected():
+    server = FakeGraphServer(n_pages=1, forms_per_page=1, leads_per_form=1).start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            receiver = start_receiver(server, store_dir)
+            try:
+                payload = make_notification('700000000000', '7000', '7000000')
+                status, _ = post_notification(receiver.url, 'other-secret', payload)
+                assert status == 403
+                status, _ = post_notification(receiver.url, APP_SECRET, payload, signature='sha256=00')
+                assert status == 403
+
+                assert receiver.client.lead_store.count() == 0
+                assert server.count() == 0
+                assert receiver.stats['rejected'] == 2
+            finally:
+                receiver.stop()
+    finally:
+        server.stop()
+
+
+def test_failed_fetch_asks_for_redelivery():
+    server = FakeGraphServer(n_pages=1, forms_per_page=1, leads_per_form=1, failing_objects=['700000000000']).start()
+    try:
+        with tempfile.TemporaryDirectory() as store_dir:
+            receiver = start_receiver(server, store_dir)
+            try:
+                status, _ = post_notification(receiver.url, APP_SECRET, make_notification('700000000000', '7000', '7000000'))
+                assert status == 500
+                assert receiver.stats['failed'] == 1 and receiver.client.lead_store.count() == 0
+
+                # Lead of a page the token cannot access -> acknowledged, nothing stored
+                status, _ = post_notification(receiver.url, APP_SECRET, make_notification('123', '9999'))
+                assert status == 200 and receiver.client.lead_store.count() == 0
+            finally:
+                receiver.stop()
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 LEAD WEBHOOK TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_subscription_handshake,
+        test_new_lead_is_fetched_by_id_and_stored,
+        test_invalid_signature_is_rejected,
+        test_failed_fetch_asks_for_redelivery,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,146 @@
+"""
+Test: Lead-Abruf über Pages API - gemeinsame Session, Paging über alle Seiten,
+Zeitfenster-Filter auf time_created beim Server und parallele Formulare
+(lokaler Fake Graph Server, kein Meta Account nötig)
+
+Usage:
+    python test_leads_fetch.py
+    python -m pytest -q test_leads_fetch.py
+"""
+import sys
+import os
+import json
+import logging
+import tempfile
+import time
+sys.path.append(os.path.dirname(__file__))
+
+import src.meta_ads_client as meta_ads_client
+from src.meta_ads_client import MetaAdsClient
+from fake_graph_server import FakeGraphServer
+
+
+def make_client(server, cache_dir):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+    return client
+
+
+def test_all_pages_are_followed():
+    server = FakeGraphServer(n_pages=2, forms_per_page=3, leads_per_form=25, lead_interval_hours=1).start()
+    page_size = meta_ads_client.LEADS_PAGE_SIZE
+    meta_ads_client.LEADS_PAGE_SIZE = 10
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            df = make_client(server, cache_dir).fetch_leads_data(days=7)
+
+            assert len(df) == 2 * 3 * 25  # nothing truncated after the first page
+            assert df['lead_id'].is_unique
+            assert server.count('GET', r'/leads$') == 6 * 3  # 10 + 10 + 5 per form
+            assert sorted(df['page_name'].unique()) == ['Page 7000', 'Page 7001']
+            assert df['email'].iloc[0] == 'lead0@example.com'
+            assert list(df.columns[:4]) == ['lead_id', 'created_time', 'form_name', 'page_name']
+    finally:
+        meta_ads_client.LEADS_PAGE_SIZE = page_size
+        server.stop()
+
+
+def test_time_window_is_filtered_by_server():
+    server = FakeGraphServer(n_pages=1, forms_per_page=2, leads_per_form=48, lead_interval_hours=5).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            df = make_client(server, cache_dir).fetch_leads_data(days=7)
+
+            # Leads of the last 7 days only: index 0..33 (5h apart) of each form
+            assert len(df) == 2 * 34
+
+            lead_requests = [params for method, path, params in server.requests if path.endswith('/leads')]
+            assert len(lead_requests) == 2
+            for params in lead_requests:
+                rules = json.loads(params['filtering'])
+                assert {rule['operator'] for rule in rules} == {'GREATER_THAN', 'LESS_THAN'}
+                assert all(rule['field'] == 'time_created' for rule in rules)
+                assert params['access_token'].startswith('page-token-')
+    finally:
+        server.stop()
+
+
+def test_forms_are_fetched_concurrently():
+    server = FakeGraphServer(n_pages=2, forms_per_page=4, leads_per_form=2, latency=0.1).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            start = time.perf_counter()
+            df = make_client(server, cache_dir).fetch_leads_data(days=7)
+            elapsed = time.perf_counter() - start
+
+            assert len(df) == 2 * 4 * 2
+            # Sequential: 1 + 2 + 8 requests x 100ms >= 1.1s
+            assert elapsed < 0.8, f"took {elapsed:.2f}s"
+    finally:
+        server.stop()
+
+
+def test_failing_form_is_skipped():
+    server = FakeGraphServer(n_pages=1, forms_per_page=3, leads_per_form=5, failing_objects=['7000001']).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            df = make_client(server, cache_dir).fetch_leads_data(days=7)
+            assert len(df) == 2 * 5
+            assert 'Form 7000001' not in set(df['form_name'])
+    finally:
+        server.stop()
+
+
+def test_failing_later_page_does_not_log_page_token():
+    server = FakeGraphServer(n_pages=1, forms_per_page=2, leads_per_form=5, lead_interval_hours=1).start()
+    route = server._route
+
+    def fail_second_page(method, path, params):
+        # Page 2 of form 7000001 is requested via paging.next (page token in the query string)
+        if path.endswith('/7000001/leads') and 'after' in params:
+            return 400, {'error': {'message': 'Leads for 7000001 unavailable', 'type': 'OAuthException', 'code': 100}}
+        return route(method, path, params)
+
+    server._route = fail_second_page
+    page_size = meta_ads_client.LEADS_PAGE_SIZE
+    meta_ads_client.LEADS_PAGE_SIZE = 2
+
+    messages = []
+    handler = logging.Handler(logging.WARNING)
+    handler.emit = lambda record: messages.append(record.getMessage())
+    logging.getLogger('src.meta_ads_client').addHandler(handler)
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            df = make_client(server, cache_dir).fetch_leads_data(days=7)
+            assert set(df['form_name']) == {'Form 7000000'}
+            assert any('Form 7000001' in message for message in messages)
+            assert not any('page-token-' in message for message in messages)
+    finally:
+        logging.getLogger('src.meta_ads_client').removeHandler(handler)
+        meta_ads_client.LEADS_PAGE_SIZE = page_size
+        server.stop()
+
+
+if __name__ == '__main__':
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 LEADS FETCH TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_all_pages_are_followed,
+        test_time_window_is_filtered_by_server,
+        test_forms_are_fetched_concurrently,
+        test_failing_form_is_skipped,
+        test_failing_later_page_does_not_log_page_token,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,119 @@
+"""
+Test: Vektorisiertes Performance-Scoring (gleiche Scores wie die zeilenweise Version,
+Schwellenwerte pro Account)
+
+Usage:
+    python test_performance_score.py
+    python -m pytest -q test_performance_score.py
+"""
+import sys
+import os
+import json
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+from src.data_processor import DataProcessor, DEFAULT_SCORE_THRESHOLDS
+
+
+def make_frame(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'cpl': rng.choice([0, 4.99, 5, 7.5, 8, 10, 10.01, 15, 15.5, 30], n_rows) * 1.0,
+        'hook_rate': rng.choice([0, 9.9, 10, 15, 15.1, 25, 25.1, 40], n_rows) * 1.0,
+        'hold_rate': rng.choice([0, 19, 20, 30, 30.5, 50, 51], n_rows) * 1.0,
+        'frequency': rng.choice([1, 2, 5.9, 6, 6.1, 8, 8.1, 12], n_rows) * 1.0,
+    })
+    df.loc[df.index[::97], 'cpl'] = np.nan
+    df.loc[df.index[::89], 'frequency'] = np.nan
+    return df
+
+
+def test_vectorized_scores_match_row_wise():
+    df = make_frame(5000)
+    expected = df.apply(DataProcessor.calculate_performance_score, axis=1)
+    result = DataProcessor.calculate_performance_scores(df)
+    assert result.tolist() == expected.tolist()
+    assert result.between(0, 100).all()
+
+    # Missing metric columns are skipped like in the row-wise version
+    partial = df[['cpl', 'frequency']]
+    assert DataProcessor.calculate_performance_scores(partial).tolist() == \
+        partial.apply(DataProcessor.calculate_performance_score, axis=1).tolist()
+
+
+def test_thresholds_per_account():
+    strict = {'act_1': {'cpl': {'rules': [['<', 2, 20], ['>', 4, -20]]}}}
+    os.environ['META_SCORE_THRESHOLDS'] = json.dumps(strict)
+    try:
+        thresholds = DataProcessor.score_thresholds_for('act_1')
+        assert thresholds['cpl']['rules'] == [['<', 2, 20], ['>', 4, -20]]
+        assert thresholds['cpl']['only_positive'] is True
+        assert thresholds['hook_rate'] == DEFAULT_SCORE_THRESHOLDS['hook_rate']
+
+        # Other accounts keep the defaults
+        assert DataProcessor.score_thresholds_for('act_2') == DEFAULT_SCORE_THRESHOLDS
+
+        df = pd.DataFrame({'cpl': [4.5]})
+        assert DataProcessor.calculate_performance_scores(df).tolist() == [70]
+        assert DataProcessor.calculate_performance_scores(df, thresholds).tolist() == [30]
+    finally:
+        del os.environ['META_SCORE_THRESHOLDS']
+
+
+def test_malformed_thresholds_fall_back_to_defaults():
+    malformed = {
+        'cpl': {'rules': [['<', 2, 20], ['~', 4, -20]]},  # unknown operator
+        'hook_rate': {'rules': [['>', 25]]},  # not a triple
+        'hold_rate': {'rules': [['>', 'high', 10]]},  # threshold not a number
+        'ctr': {'only_positive': True},  # unknown metric without rules
+        'frequency': {'rules': [['>', 4, -20]]},  # valid
+    }
+    os.environ['META_SCORE_THRESHOLDS'] = json.dumps(malformed)
+    try:
+        thresholds = DataProcessor.score_thresholds_for('act_1')
+        for metric in ['cpl', 'hook_rate', 'hold_rate']:
+            assert thresholds[metric] == DEFAULT_SCORE_THRESHOLDS[metric], metric
+        assert 'ctr' not in thresholds
+        assert thresholds['frequency']['rules'] == [['>', 4, -20]]
+
+        # Scoring with the cleaned table doesn't raise
+        df = pd.DataFrame({'cpl': [4.5], 'hook_rate': [30.0], 'hold_rate': [60.0], 'frequency': [5.0], 'ctr': [1.0]})
+        assert DataProcessor.calculate_performance_scores(df, thresholds).tolist() == [75]
+    finally:
+        del os.environ['META_SCORE_THRESHOLDS']
+
+
+if __name__ == '__main__':
+    import logging
+    import time
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 PERFORMANCE SCORE TEST")
+    print("=" * 80)
+
+    tests = [
+        test_vectorized_scores_match_row_wise,
+        test_thresholds_per_account,
+        test_malformed_thresholds_fall_back_to_defaults,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    df = make_frame(100_000)
+    start = time.perf_counter()
+    df.apply(DataProcessor.calculate_performance_score, axis=1)
+    row_wise_s = time.perf_counter() - start
+    start = time.perf_counter()
+    DataProcessor.calculate_performance_scores(df)
+    vectorized_s = time.perf_counter() - start
+    print(f"\n⏱️  100k rows: row-wise {row_wise_s:.2f}s, vectorized {vectorized_s * 1000:.1f}ms")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,153 @@
+"""
+Test: Rate-Limit Scheduler (Usage-Header, Concurrency/Pacing, Backoff bei Code 17/80004)
+gegen lokalen Fake Graph Server (kein Meta Account nötig)
+
+Usage:
+    python test_rate_limiter.py
+    python -m pytest -q test_rate_limiter.py
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(__file__))
+
+from facebook_business.api import FacebookAdsApi
+from facebook_business.exceptions import FacebookRequestError
+from src.meta_ads_client import MetaAdsClient
+from src.rate_limiter import RateLimitScheduler
+from src.cache_backends import ParquetCacheBackend
+from src.cache_manager import CacheManager
+from fake_graph_server import FakeGraphServer
+
+
+def make_client(server, cache_dir, sleeps):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+    client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+    # Fresh scheduler per test, sleeps recorded instead of slept
+    client.rate_limiter = RateLimitScheduler(max_concurrency=4, max_retries=3, sleep=sleeps.append)
+    client.rate_limiter.install(FacebookAdsApi.get_default_api())
+    return client
+
+
+def test_usage_headers_adapt_concurrency_and_pacing():
+    scheduler = RateLimitScheduler(max_concurrency=10)
+    assert scheduler.concurrency_limit() == 10 and scheduler.pacing_delay() == 0
+
+    scheduler.update({
+        'X-Business-Use-Case-Usage': json.dumps({'1': [{'call_count': 70, 'total_cputime': 20, 'total_time': 10}]}),
+        'x-ad-account-usage': json.dumps({'acc_id_util_pct': 30.5, 'reset_time_duration': 0}),
+    })
+    assert scheduler.usage_pct == 70
+    assert 1 < scheduler.concurrency_limit() < 10
+    assert scheduler.pacing_delay() == 0
+
+    scheduler.update({'x-ad-account-usage': json.dumps({'acc_id_util_pct': 95})})
+    assert scheduler.concurrency_limit() == 1
+    assert 0 < scheduler.pacing_delay() < scheduler.max_pacing_delay
+
+    # estimated_time_to_regain_access (minutes) blocks further calls
+    scheduler.update({'x-business-use-case-usage': json.dumps({'1': [{'call_count': 100, 'estimated_time_to_regain_access': 2}]})})
+    assert 110 < scheduler.status()['blocked_seconds'] <= 120
+
+
+def test_backoff_is_exponential_with_jitter():
+    scheduler = RateLimitScheduler(backoff_base=2, backoff_max=30)
+    delays = [scheduler.backoff_delay(attempt) for attempt in range(6)]
+    for attempt, delay in enumerate(delays):
+        cap = min(30, 2 * 2 ** attempt)
+        assert cap / 2 <= delay <= cap
+    assert len({scheduler.backoff_delay(3) for _ in range(20)}) > 1
+
+
+def test_concurrency_limit_is_enforced():
+    scheduler = RateLimitScheduler(max_concurrency=2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fake_call():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    threads = [threading.Thread(target=scheduler.call, args=(fake_call,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    assert scheduler.calls == 8
+
+
+def test_throttled_requests_are_retried():
+    for code in (17, 80004):
+        server = FakeGraphServer(n_ads=3, throttle_requests=2, throttle_code=code, usage_pct=60).start()
+        try:
+            with tempfile.TemporaryDirectory() as cache_dir:
+                sleeps = []
+                client = make_client(server, cache_dir, sleeps)
+
+                df = client.fetch_ad_performance(days=7)
+                assert len(df) == 3, code
+                assert client.rate_limiter.throttled == 2
+                assert len(sleeps) == 2 and sleeps[1] > sleeps[0] / 2
+
+                status = client.rate_limit_status()
+                assert status['usage_pct'] == 60
+                assert status['usage']['x-ad-account-usage']['acc_id_util_pct'] == 60
+                assert status['concurrency_limit'] < status['max_concurrency']
+        finally:
+            server.stop()
+
+
+def test_gives_up_after_max_retries():
+    server = FakeGraphServer(n_ads=2, throttle_requests=100).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir, [])
+            try:
+                client.account.get_insights(params={'level': 'ad'}, fields=['spend'])
+                assert False, 'expected FacebookRequestError'
+            except FacebookRequestError as e:
+                assert e.api_error_code() == 17
+            assert server.count('GET', r'/insights$') == 1 + client.rate_limiter.max_retries
+
+            # No per-ad fallback loop while throttled
+            before = server.count()
+            assert client.fetch_ad_performance(days=7).empty
+            assert server.count(None, r'/ads$') == 0
+            assert server.count() - before == 1 + client.rate_limiter.max_retries
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 RATE LIMITER TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_usage_headers_adapt_concurrency_and_pacing,
+        test_backoff_is_exponential_with_jitter,
+        test_concurrency_limit_is_enforced,
+        test_throttled_requests_are_retried,
+        test_gives_up_after_max_retries,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
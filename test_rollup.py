@@ -0,0 +1,140 @@
+"""
+Test: Rollup von Ad-Level Daten auf Adset/Kampagne/Account (Summen, neu berechnete
+Ratios, Reach-Strategien) und fetch_rollups gegen lokalen Fake Graph Server
+
+Usage:
+    python test_rollup.py
+    python -m pytest -q test_rollup.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+import pytest
+from src.meta_ads_client import MetaAdsClient
+from src.data_processor import DataProcessor
+from src.cache_backends import ParquetCacheBackend
+from src.cache_manager import CacheManager
+from src.schema import apply_schema
+from fake_graph_server import FakeGraphServer
+
+
+def make_ads() -> pd.DataFrame:
+    df = pd.DataFrame({
+        'account_id': ['1', '1', '1'],
+        'campaign_id': ['c1', 'c1', 'c2'],
+        'campaign_name': ['Herbst', 'Herbst', 'Winter'],
+        'adset_id': ['s1', 's2', 's3'],
+        'ad_id': ['a1', 'a2', 'a3'],
+        'date_start': ['2025-01-01', '2025-01-03', '2025-01-02'],
+        'date_stop': ['2025-01-31', '2025-01-20', '2025-01-31'],
+        'spend': ['100.00', '50.00', '30.00'],
+        'impressions': ['10000', '5000', '0'],
+        'reach': ['4000', '3000', '0'],
+        'clicks': ['200', '50', '0'],
+        'actions': [
+            [{'action_type': 'lead', 'value': '10'}, {'action_type': 'link_click', 'value': '150'}],
+            [{'action_type': 'lead', 'value': '5'}],
+            [],
+        ],
+        'video_play_actions': [[{'action_type': 'video_view', 'value': '2000'}], [], []],
+        'video_thruplay_watched_actions': [[{'action_type': 'video_view', 'value': '500'}], [], []],
+    })
+    return apply_schema(DataProcessor.add_action_columns(df))
+
+
+def test_rollup_sums_and_ratios():
+    campaigns = DataProcessor.rollup(make_ads(), 'campaign').set_index('campaign_id')
+
+    c1 = campaigns.loc['c1']
+    assert c1['spend'] == 150.0
+    assert c1['impressions'] == 15000
+    assert c1['leads'] == 15 and c1['leads_extracted'] == 15
+    assert c1['ad_count'] == 2
+    assert c1['campaign_name'] == 'Herbst'
+    assert (c1['date_start'], c1['date_stop']) == ('2025-01-01', '2025-01-31')
+
+    # Ratios recomputed from sums, not averaged
+    assert c1['ctr'] == pytest.approx(250 / 15000 * 100)
+    assert c1['cpm'] == pytest.approx(150 / 15000 * 1000)
+    assert c1['cpl'] == pytest.approx(10.0)
+    assert c1['hook_rate'] == pytest.approx(2000 / 15000 * 100)
+    assert c1['actions'] == [{'action_type': 'lead', 'value': 15.0}, {'action_type': 'link_click', 'value': 150.0}]
+    assert c1['cost_per_action_type'][0] == {'action_type': 'lead', 'value': 10.0}
+
+    # Zero denominators -> 0 instead of inf
+    assert campaigns.loc['c2', 'ctr'] == 0
+    assert campaigns.loc['c2', 'cpl'] == 0
+
+    account = DataProcessor.rollup(make_ads(), 'account')
+    assert account['spend'].tolist() == [180.0]
+    assert len(DataProcessor.rollup(make_ads(), 'adset')) == 3
+
+
+def test_reach_strategies():
+    ads = make_ads()
+
+    upper = DataProcessor.rollup(ads, 'campaign').set_index('campaign_id')
+    assert upper.loc['c1', 'reach'] == 7000
+    assert bool(upper.loc['c1', 'reach_approximate']) is True
+    assert bool(upper.loc['c2', 'reach_approximate']) is False  # single ad -> exact
+    assert upper.loc['c1', 'frequency'] == pytest.approx(15000 / 7000)
+
+    lower = DataProcessor.rollup(ads, 'campaign', 'lower_bound').set_index('campaign_id')
+    assert lower.loc['c1', 'reach'] == 4000
+
+    exact = DataProcessor.rollup(ads, 'campaign', 'exact', {'c1': 5500}).set_index('campaign_id')
+    assert exact.loc['c1', 'reach'] == 5500
+    assert bool(exact.loc['c1', 'reach_approximate']) is False
+    assert exact.loc['c1', 'frequency'] == pytest.approx(15000 / 5500)
+
+    with pytest.raises(ValueError):
+        DataProcessor.rollup(ads, 'campaign', 'average')
+
+
+def test_fetch_rollups_uses_one_ad_fetch():
+    server = FakeGraphServer(n_ads=6, n_campaigns=2).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+            client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+
+            rollups = client.fetch_rollups(days=7, levels=['campaign', 'adset'], reach_strategy='exact')
+            assert len(rollups['ad']) == 6
+            assert sorted(rollups['campaign']['campaign_id']) == ['5000', '5001']
+            assert rollups['campaign']['spend'].tolist() == [30.0, 30.0]
+            assert rollups['campaign']['reach'].tolist() == [400, 400]  # from the reach-only query
+            assert not rollups['campaign']['reach_approximate'].any()
+
+            # One ad-level query + one reach query per level, no per-campaign requests
+            assert server.count('GET', r'/insights$') == 3
+            assert server.count(None, r'/campaigns$') == 0
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 ROLLUP TEST")
+    print("=" * 80)
+
+    tests = [
+        test_rollup_sums_and_ratios,
+        test_reach_strategies,
+        test_fetch_rollups_uses_one_ad_fetch,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
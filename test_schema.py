@@ -0,0 +1,90 @@
+"""
+Test: Schema-Registry (kompakte dtypes für Insight-Felder) und Memory-Report
+
+Usage:
+    python test_schema.py
+    python -m pytest -q test_schema.py
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+from src.schema import INSIGHT_SCHEMA, apply_schema, memory_report
+from benchmark_ad_insights import RECORDED_INSIGHT
+
+
+def make_frame() -> pd.DataFrame:
+    return pd.DataFrame([
+        RECORDED_INSIGHT,
+        {**RECORDED_INSIGHT, 'ad_id': '1', 'spend': None, 'impressions': 'n/a', 'reach': [{'value': '12'}]},
+    ])
+
+
+def test_apply_schema_dtypes_and_values():
+    df = apply_schema(make_frame())
+
+    assert isinstance(df['ad_id'].dtype, pd.CategoricalDtype)
+    assert isinstance(df['quality_ranking'].dtype, pd.CategoricalDtype)
+    assert df['impressions'].dtype == np.int32
+    assert df['frequency'].dtype == np.float32
+    assert df['spend'].dtype == np.float64
+
+    assert df['spend'].tolist() == [412.37, 0.0]
+    assert df['impressions'].tolist() == [48211, 0]
+    assert df['reach'].tolist() == [20544, 12]
+    # Nested action lists stay untouched
+    assert df['actions'][0] == RECORDED_INSIGHT['actions']
+
+
+def test_apply_schema_is_idempotent_and_safe():
+    df = apply_schema(make_frame())
+    again = apply_schema(df.copy())
+    assert again.equals(df)
+
+    # Counts that don't fit into int32 keep int64
+    big = apply_schema(pd.DataFrame({'impressions': ['3000000000', '1']}))
+    assert big['impressions'].dtype == np.int64
+    assert big['impressions'].tolist() == [3000000000, 1]
+
+    # Columns outside the schema are not touched
+    other = apply_schema(pd.DataFrame({'leads': ['3'], 'spend': ['1.5']}))
+    assert other['leads'].tolist() == ['3']
+    assert set(INSIGHT_SCHEMA.values()) == {'category', 'int32', 'float32', 'float64', 'object'}
+
+
+def test_memory_report():
+    frame = pd.concat([make_frame()] * 200, ignore_index=True)
+    report = memory_report({'ads': frame})
+
+    assert report['frame'].tolist() == ['ads']
+    assert report['rows'].tolist() == [400]
+    assert report['after_mb'][0] < report['before_mb'][0]
+    # Input frames are left unchanged
+    assert frame['impressions'].tolist()[:2] == ['48211', 'n/a']
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 SCHEMA TEST")
+    print("=" * 80)
+
+    tests = [
+        test_apply_schema_dtypes_and_values,
+        test_apply_schema_is_idempotent_and_safe,
+        test_memory_report,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,119 @@
+"""
+Test: Single-Flight - gleichzeitige identische Abrufe mehrerer Sessions laufen
+nur einmal gegen die API und teilen sich das Ergebnis
+
+Usage:
+    python test_single_flight.py
+    python -m pytest -q test_single_flight.py
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(__file__))
+
+import pytest
+from src.meta_ads_client import MetaAdsClient
+from src.single_flight import SingleFlight
+from fake_graph_server import FakeGraphServer
+
+
+def test_concurrent_calls_run_once():
+    group = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(5)
+
+    def fetch(value):
+        calls.append(value)
+        time.sleep(0.2)
+        return {'value': value}
+
+    def caller():
+        barrier.wait()
+        return group.do('ads_2024-10-01_2024-10-30', fetch, 42)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: caller(), range(5)))
+
+    assert calls == [42]
+    assert all(result == {'value': 42} and shared for result, shared in results)
+    assert group.stats() == {'executions': 1, 'coalesced': 4, 'in_flight': 0}
+
+    # Finished flights are forgotten - the next call runs again
+    assert group.do('ads_2024-10-01_2024-10-30', fetch, 7) == ({'value': 7}, False)
+    assert group.stats()['executions'] == 2
+
+
+def test_error_is_raised_in_every_caller():
+    group = SingleFlight()
+    barrier = threading.Barrier(3)
+
+    def fetch():
+        time.sleep(0.2)
+        raise RuntimeError('Graph down')
+
+    def caller():
+        barrier.wait()
+        with pytest.raises(RuntimeError):
+            group.do('campaigns_x', fetch)
+        return True
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert all(executor.map(lambda _: caller(), range(3)))
+    assert group.stats()['in_flight'] == 0
+
+
+def test_sessions_share_one_ad_fetch():
+    server = FakeGraphServer(n_ads=20, latency=0.3).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            clients = []
+            for _ in range(5):  # one client per browser session, like init_session_state
+                client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+                client._load_from_cache = lambda *args, **kwargs: None
+                client._save_to_cache = lambda *args, **kwargs: None
+                clients.append(client)
+
+            coalesced_before = clients[0].coalescing_stats()['coalesced']
+            barrier = threading.Barrier(len(clients))
+
+            def open_home_page(client):
+                barrier.wait()
+                return client.fetch_ad_performance(days=30)
+
+            with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+                frames = list(executor.map(open_home_page, clients))
+
+            assert server.count('GET', r'/act_123/insights$') == 1
+            assert all(len(df) == 20 and df.equals(frames[0]) for df in frames)
+            assert len({id(df) for df in frames}) == len(frames)  # every session gets its own copy
+            assert clients[0].coalescing_stats()['coalesced'] - coalesced_before == 4
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 SINGLE-FLIGHT TEST")
+    print("=" * 80)
+
+    tests = [
+        test_concurrent_calls_run_once,
+        test_error_is_raised_in_every_caller,
+        test_sessions_share_one_ad_fetch,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
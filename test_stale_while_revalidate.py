@@ -0,0 +1,143 @@
+"""
+Test: Stale-While-Revalidate - abgelaufene Cache-Einträge werden sofort
+ausgeliefert und im Hintergrund aktualisiert, bis zur maximalen Veraltung
+(lokaler Fake Graph Server, kein Meta Account nötig)
+
+Usage:
+    python test_stale_while_revalidate.py
+    python -m pytest -q test_stale_while_revalidate.py
+"""
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+from src.meta_ads_client import MetaAdsClient
+from src.cache_backends import ParquetCacheBackend
+from src.cache_manager import CacheManager
+from fake_graph_server import FakeGraphServer
+
+
+def age_entry(cache: CacheManager, cache_key: str, hours: float) -> datetime:
+    """Rewrite an entry as if it was cached some hours ago"""
+    path = cache._path(cache_key)
+    _, df = cache.backend.load(path)
+    cached_time = (datetime.now() - timedelta(hours=hours)).replace(microsecond=0)
+    cache.backend.save(path, df, cached_time)
+    cache.refresh_index()
+    return cached_time
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_stale_entry_within_limit():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir, ParquetCacheBackend())
+        cache.put('ads_a', pd.DataFrame({'ad_id': ['1'], 'spend': [10.0]}))
+        cached_time = age_entry(cache, 'ads_a', hours=2)  # ads TTL: 1h
+
+        df, entry_time, stale = cache.get_entry('ads_a', max_stale_hours=24)
+        assert stale and entry_time == cached_time and df['spend'].tolist() == [10.0]
+        assert cache.stats()['stale_hits'] == 1
+
+        # Plain get() keeps the hard TTL
+        assert cache.get('ads_a') is None
+        assert cache.stats()['expirations'] == 1
+
+        # Past TTL + max staleness -> expired even for stale reads
+        cache.put('ads_b', pd.DataFrame({'ad_id': ['1'], 'spend': [10.0]}))
+        age_entry(cache, 'ads_b', hours=30)
+        assert cache.get_entry('ads_b', max_stale_hours=24) is None
+        assert not os.path.exists(cache._path('ads_b'))
+
+
+def test_stale_ads_are_served_and_refreshed_in_background():
+    server = FakeGraphServer(n_ads=10, latency=0.5).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+            client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+            client.stale_while_revalidate = True
+
+            fresh = client.fetch_ad_performance(days=7)
+            assert server.count('GET', r'/act_123/insights$') == 1
+            assert client.pop_stale_data_time() is None
+
+            cache_key = next(key for key in client.cache._entries if key.startswith('ads_'))
+            cached_time = age_entry(client.cache, cache_key, hours=2)
+
+            # Served at once (the refresh takes >= 0.5s) with the cache time as marker
+            started = time.perf_counter()
+            stale = client.fetch_ad_performance(days=7)
+            assert time.perf_counter() - started < 0.4
+            assert stale.equals(fresh)
+            assert client.pop_stale_data_time() == cached_time
+            assert client.pop_stale_data_time() is None
+
+            # Other sessions reading the stale entry meanwhile don't start another refresh
+            client.fetch_ad_performance(days=7)
+            assert client.pop_stale_data_time() == cached_time
+            assert wait_for(lambda: server.count('GET', r'/act_123/insights$') == 2)
+            assert wait_for(lambda: client.cache.backend.load(client.cache._path(cache_key))[0] > cached_time)
+            time.sleep(0.1)
+            assert server.count('GET', r'/act_123/insights$') == 2
+
+            client.fetch_ad_performance(days=7)
+            assert client.pop_stale_data_time() is None
+    finally:
+        server.stop()
+
+
+def test_disabled_mode_fetches_blocking():
+    server = FakeGraphServer(n_ads=5).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+            client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+            client.stale_while_revalidate = False
+
+            client.fetch_campaign_data(days=7)
+            cache_key = next(key for key in client.cache._entries if key.startswith('campaigns_'))
+            age_entry(client.cache, cache_key, hours=2)
+
+            requests_before = server.count()
+            client.fetch_campaign_data(days=7)
+            assert server.count() > requests_before
+            assert client.pop_stale_data_time() is None
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 STALE-WHILE-REVALIDATE TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_stale_entry_within_limit,
+        test_stale_ads_are_served_and_refreshed_in_background,
+        test_disabled_mode_fetches_blocking,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,148 @@
+"""
+Test: Streaming von Ad-Insights in Record-Batches (Seite für Seite) und
+Batch-Sink direkt ins Cache-Format (JSON + Parquet) gegen lokalen Fake Graph Server
+
+Usage:
+    python test_streaming_insights.py
+    python -m pytest -q test_streaming_insights.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+import pandas as pd
+import pytest
+from src.meta_ads_client import MetaAdsClient
+from src.cache_backends import JsonCacheBackend, ParquetCacheBackend
+from src.cache_manager import CacheManager
+from fake_graph_server import FakeGraphServer
+
+
+def make_client(server, cache_dir, backend):
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+    client.cache = CacheManager(cache_dir, backend)
+    return client
+
+
+def test_iter_ad_insights_yields_page_batches():
+    server = FakeGraphServer(n_ads=25).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir, ParquetCacheBackend())
+
+            batches = client.iter_ad_insights('2024-10-01', '2024-10-30', batch_size=10)
+            assert server.count() == 0  # lazy - nothing requested before the first batch
+
+            first = next(batches)
+            assert len(first) == 10 and server.count('GET', r'/insights$') == 1
+            assert first['leads_extracted'].tolist() == [2] * 10
+            assert first['hook_rate'].tolist() == [30.0] * 10
+
+            sizes = [len(first)] + [len(batch) for batch in batches]
+            assert sizes == [10, 10, 5]
+            assert server.count('GET', r'/insights$') == 3
+    finally:
+        server.stop()
+
+
+def check_stream_matches_materialized_fetch(backend_class):
+    server = FakeGraphServer(n_ads=12).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir, backend_class())
+
+            expected = client.fetch_ad_performance(start_date='2024-10-01', end_date='2024-10-07', force_refresh=True)
+            client.cache.clear()
+
+            assert client.stream_ad_insights_to_cache('2024-10-01', '2024-10-07') == 12
+            requests = server.count()
+            cached = client.fetch_ad_performance(start_date='2024-10-01', end_date='2024-10-07')
+            assert server.count() == requests  # served from the streamed entry
+
+            for column in ['ad_id', 'spend', 'impressions', 'leads_extracted', 'cpl', 'hook_rate']:
+                assert cached[column].astype(str).tolist() == expected[column].astype(str).tolist(), column
+            assert cached['actions'].tolist() == expected['actions'].tolist()
+
+            # Daily rows land in their own entry
+            assert client.stream_ad_insights_to_cache('2024-10-01', '2024-10-07', time_increment=1) == 12 * 7
+            daily = client.cache.get('ads_daily_2024-10-01_2024-10-07')
+            assert len(daily) == 12 * 7
+            assert sorted(daily['date_start'].unique()) == [f'2024-10-0{day}' for day in range(1, 8)]
+    finally:
+        server.stop()
+
+
+def test_stream_to_json_cache():
+    check_stream_matches_materialized_fetch(JsonCacheBackend)
+
+
+def test_stream_to_parquet_cache():
+    check_stream_matches_materialized_fetch(ParquetCacheBackend)
+
+
+def test_parquet_batches_with_changing_columns():
+    backend = ParquetCacheBackend()
+    first = pd.DataFrame({
+        'ad_id': pd.Categorical(['1', '2']),
+        'impressions': pd.Series([10, 20], dtype='int32'),
+        'actions': [[{'action_type': 'lead', 'value': '1'}], None],
+    })
+    second = pd.DataFrame({
+        'ad_id': pd.Categorical(['3']),
+        'impressions': [3_000_000_000],
+        'extra': ['dropped'],
+    })
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = os.path.join(cache_dir, 'ads_test.parquet')
+        assert backend.save_batches(path, iter([first, pd.DataFrame(), second]), pd.Timestamp.now().to_pydatetime()) == 3
+
+        _, df = backend.load(path)
+        assert df.columns.tolist() == ['ad_id', 'impressions', 'actions']
+        assert df['ad_id'].tolist() == ['1', '2', '3']
+        assert df['impressions'].tolist() == [10, 20, 3_000_000_000]
+        assert df['actions'].tolist() == [[{'action_type': 'lead', 'value': '1'}], None, None]
+
+
+def test_failed_stream_keeps_old_entry():
+    def failing_batches():
+        yield pd.DataFrame({'ad_id': ['new']})
+        raise RuntimeError('connection lost')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = CacheManager(cache_dir, ParquetCacheBackend())
+        cache.put('ads_2024-10-01_2024-10-07', pd.DataFrame({'ad_id': ['old']}))
+
+        with pytest.raises(RuntimeError):
+            cache.put_batches('ads_2024-10-01_2024-10-07', failing_batches())
+
+        assert cache.get('ads_2024-10-01_2024-10-07')['ad_id'].tolist() == ['old']
+        assert sorted(os.listdir(cache_dir)) == ['ads_2024-10-01_2024-10-07.parquet']
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 STREAMING INSIGHTS TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_iter_ad_insights_yields_page_batches,
+        test_stream_to_json_cache,
+        test_stream_to_parquet_cache,
+        test_parquet_batches_with_changing_columns,
+        test_failed_stream_keeps_old_entry,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)
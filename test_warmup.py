@@ -0,0 +1,108 @@
+"""
+Test: Cache Warm-up - Zeiträume des Dashboards werden in Prioritätsreihenfolge
+vorgeladen, warme Einträge kosten keine API-Calls, hohe API-Auslastung beendet
+den Lauf (lokaler Fake Graph Server, kein Meta Account nötig)
+
+Usage:
+    python test_warmup.py
+    python -m pytest -q test_warmup.py
+"""
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(__file__))
+
+import pytest
+from src.meta_ads_client import MetaAdsClient
+from src.cache_backends import ParquetCacheBackend
+from src.cache_manager import CacheManager
+from src.warmup import WARMUP_PLAN, _parse_plan, run_scheduled, run_warmup
+from fake_graph_server import FakeGraphServer
+
+
+def make_client(server, cache_dir: str) -> MetaAdsClient:
+    client = MetaAdsClient(access_token='test-token', account_id=server.account_id, graph_url=server.url, cache_dir=cache_dir)
+    client.cache = CacheManager(cache_dir, ParquetCacheBackend())
+    return client
+
+
+def test_second_run_is_served_from_cache():
+    # Own account id: the rate limiter state is shared per account in the process
+    server = FakeGraphServer(n_ads=12, account_id='act_warm', n_pages=1, leads_per_form=4).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            plan = [('ads', 30), ('campaigns', 7), ('leads', 30)]
+
+            first = run_warmup(client, plan)
+            assert [(result['target'], result['days']) for result in first] == plan
+            assert all(result['error'] is None and result['api_calls'] > 0 for result in first)
+            assert first[0]['rows'] == 12 and first[2]['rows'] == 3 * 4
+            requests_after_first = server.count()
+
+            second = run_warmup(client, plan)
+            assert all(result['api_calls'] == 0 for result in second)
+            assert [result['rows'] for result in second] == [result['rows'] for result in first]
+            assert server.count() == requests_after_first
+    finally:
+        server.stop()
+
+
+def test_high_usage_stops_the_run():
+    server = FakeGraphServer(n_ads=5, account_id='act_busy', usage_pct=90).start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            stale_while_revalidate = client.stale_while_revalidate
+
+            results = run_warmup(client, [('ads', 7), ('ads', 30), ('campaigns', 30)], max_usage_pct=75)
+            assert [(result['target'], result['days']) for result in results] == [('ads', 7)]
+            assert client.stale_while_revalidate == stale_while_revalidate
+    finally:
+        server.stop()
+
+
+def test_scheduler_repeats_runs():
+    server = FakeGraphServer(n_ads=3, account_id='act_sched').start()
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            client = make_client(server, cache_dir)
+            assert run_scheduled(client, interval_minutes=0, plan=[('ads', 7)], runs=2) == 2
+            assert server.count('GET', r'/act_sched/insights$') == 1
+    finally:
+        server.stop()
+
+
+def test_plan_filter_keeps_priority_order():
+    plan = _parse_plan('leads, ads')
+    assert plan == [entry for entry in WARMUP_PLAN if entry[0] in ('ads', 'leads')]
+    assert plan[0] == ('ads', 30) and plan[-1] == ('leads', 60)
+    assert _parse_plan(None) == WARMUP_PLAN
+    with pytest.raises(ValueError):
+        _parse_plan('ads,reels')
+
+
+if __name__ == '__main__':
+    import logging
+    logging.disable(logging.INFO)
+
+    print("=" * 80)
+    print("🔍 CACHE WARM-UP TEST (Fake Graph Server)")
+    print("=" * 80)
+
+    tests = [
+        test_second_run_is_served_from_cache,
+        test_high_usage_stops_the_run,
+        test_scheduler_repeats_runs,
+        test_plan_filter_keeps_priority_order,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"   ✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"   ❌ {test.__name__}: {e}")
+
+    sys.exit(1 if failed else 0)